@@ -0,0 +1,116 @@
+# Parse throughput of every installed JSON codec over l2Book and webData2 payloads. The l2Book payload is the recorded
+# /info response from the test cassettes. webData2 is synthesized with the shape of a busy account, since no recording
+# of it ships with the repo.
+#
+#   python benchmarks/codec_throughput.py --seconds 2
+import argparse
+import json
+import os
+import time
+
+import yaml
+
+from hyperliquid.utils.codec import CODECS, get_codec
+from hyperliquid.utils.types import Any, Dict, List
+
+CASSETTE = os.path.join(os.path.dirname(__file__), "..", "tests", "cassettes", "info_test", "test_get_l2_snapshot.yaml")
+
+
+def recorded_l2_book() -> bytes:
+    with open(CASSETTE) as f:
+        cassette = yaml.safe_load(f)
+    for interaction in cassette["interactions"]:
+        if '"l2Book"' in interaction["request"]["body"]:
+            body = json.loads(interaction["response"]["body"]["string"])
+            return json.dumps({"channel": "l2Book", "data": body}).encode("utf-8")
+    raise ValueError("no l2Book interaction in cassette")
+
+
+def synthetic_web_data2(n_positions: int = 40, n_orders: int = 200) -> bytes:
+    positions = [
+        {
+            "type": "oneWay",
+            "position": {
+                "coin": f"COIN{i}",
+                "szi": f"{i * 1.25:.4f}",
+                "entryPx": f"{100 + i * 0.37:.5f}",
+                "positionValue": f"{1000 + i * 3.1:.6f}",
+                "unrealizedPnl": f"{i * 0.11:.6f}",
+                "returnOnEquity": f"{i * 0.001:.8f}",
+                "liquidationPx": None,
+                "leverage": {"type": "cross", "value": 10},
+                "marginUsed": f"{i * 5.5:.6f}",
+                "maxLeverage": 50,
+                "cumFunding": {"allTime": "1.2", "sinceOpen": "0.3", "sinceChange": "0.1"},
+            },
+        }
+        for i in range(n_positions)
+    ]
+    orders: List[Dict[str, Any]] = [
+        {
+            "coin": f"COIN{i % n_positions}",
+            "side": "B" if i % 2 else "A",
+            "limitPx": f"{100 + i * 0.01:.5f}",
+            "sz": f"{i * 0.5:.4f}",
+            "oid": 1_000_000 + i,
+            "timestamp": 1_700_000_000_000 + i,
+            "origSz": f"{i * 0.5:.4f}",
+            "isTrigger": False,
+            "reduceOnly": False,
+            "orderType": "Limit",
+            "tif": "Gtc",
+            "triggerCondition": "N/A",
+            "triggerPx": "0.0",
+            "isPositionTpsl": False,
+            "children": [],
+        }
+        for i in range(n_orders)
+    ]
+    data = {
+        "user": "0x5e9ee1089755c3435139848e47e6635505d5a13a",
+        "clearinghouseState": {
+            "assetPositions": positions,
+            "marginSummary": {"accountValue": "123456.7", "totalNtlPos": "5000.1", "totalRawUsd": "1.0"},
+            "withdrawable": "100.0",
+        },
+        "openOrders": orders,
+        "serverTime": 1_700_000_000_000,
+    }
+    return json.dumps({"channel": "webData2", "data": data}).encode("utf-8")
+
+
+def measure(loads, payload, seconds):
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in range(100):
+            loads(payload)
+        n += 100
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="measure json codec parse throughput")
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    payloads = {"l2Book": recorded_l2_book(), "webData2": synthetic_web_data2()}
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:8} not installed")
+            continue
+        for channel, payload in payloads.items():
+            from_bytes = measure(codec.loads, payload, args.seconds)
+            text = payload.decode("utf-8")
+            from_text = measure(codec.loads, text, args.seconds)
+            mb = len(payload) / 1e6
+            print(
+                f"{name:8} {channel:9} {len(payload):>7}B  bytes: {from_bytes:>9.0f} msg/s ({from_bytes * mb:6.1f} MB/s)"
+                f"  str: {from_text:>9.0f} msg/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Per-block processing time of the EVM block indexer on synthetic Reth115 blocks, for blocks holding raw msgpack bin
+# values and for blocks holding {"type": "Buffer", "data": [...]} objects. The baseline is the previous decoding,
+# which formatted every byte with an f-string and rebuilt dicts around fields that were already bytes. The current
+# processing also extracts the ERC-20 transfers of every block, which the baseline doesn't.
+#
+#   python benchmarks/evm_block_processing.py --blocks 200 --transactions 100
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, List
+
+from synthetic_evm_blocks import as_buffer_objects, synthetic_block
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "examples"))
+from evm_block_indexer import EthBlockIndexer  # noqa: E402
+
+EMPTY_BUFFER = {"type": "Buffer", "data": []}
+
+
+class BaselineIndexer(EthBlockIndexer):
+    def _convert_buffer(self, buffer_obj: Any) -> str:
+        if isinstance(buffer_obj, dict) and buffer_obj.get("type") == "Buffer":
+            return "0x" + "".join(f"{x:02x}" for x in buffer_obj["data"])
+        return str(buffer_obj)
+
+    def _process_nested_buffers(self, data: Any) -> Any:
+        if isinstance(data, dict):
+            if data.get("type") == "Buffer":
+                return self._convert_buffer(data)
+            return {k: self._process_nested_buffers(v) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [self._process_nested_buffers(item) for item in data]
+        elif isinstance(data, bytes):
+            return "0x" + data.hex()
+        return data
+
+    def _bytes_to_int(self, value: Any) -> int:
+        if isinstance(value, dict) and value.get("type") == "Buffer":
+            return int.from_bytes(bytes(value["data"]), byteorder="big")
+        elif isinstance(value, bytes):
+            return int.from_bytes(value, byteorder="big")
+        return 0
+
+    def _process_transaction(self, tx: Any) -> Any:
+        if not tx.get("transaction"):
+            return {}
+        tx_type = next(iter(tx["transaction"].keys()))
+        tx_content = tx["transaction"][tx_type]
+        processed = {
+            "type": tx_type,
+            "chainId": self._bytes_to_int(tx_content.get("chainId", EMPTY_BUFFER)),
+            "nonce": self._bytes_to_int(tx_content.get("nonce", EMPTY_BUFFER)),
+            "gas": self._bytes_to_int(tx_content.get("gas", EMPTY_BUFFER)),
+            "to": self._process_nested_buffers(tx_content.get("to")),
+            "value": self._bytes_to_int(tx_content.get("value", EMPTY_BUFFER)),
+            "input": self._process_nested_buffers(tx_content.get("input")),
+            "signature": [self._process_nested_buffers(sig) for sig in tx.get("signature", [])],
+        }
+        processed.update(
+            {
+                "maxFeePerGas": self._bytes_to_int(tx_content.get("maxFeePerGas", EMPTY_BUFFER)),
+                "maxPriorityFeePerGas": self._bytes_to_int(tx_content.get("maxPriorityFeePerGas", EMPTY_BUFFER)),
+                "accessList": self._process_nested_buffers(tx_content.get("accessList", [])),
+            }
+        )
+        return processed
+
+    def _process_block(self, block_data: Any) -> Any:
+        reth_block = block_data["block"]["Reth115"]
+        header = reth_block["header"]["header"]
+        block = {
+            key: self._process_nested_buffers(header.get(key))
+            for key in ("parentHash", "sha3Uncles", "miner", "stateRoot", "transactionsRoot", "receiptsRoot")
+        }
+        block["hash"] = self._process_nested_buffers(reth_block["header"].get("hash"))
+        for key in ("number", "gasLimit", "gasUsed", "timestamp", "baseFeePerGas"):
+            block[key] = self._bytes_to_int(header.get(key, EMPTY_BUFFER))
+        block["transactions"] = [self._process_transaction(tx) for tx in reth_block["body"]["transactions"]]
+        return block
+
+
+def time_per_block(process: Callable[[Any], Any], blocks: List[Any]) -> float:
+    start = time.perf_counter()
+    for block in blocks:
+        process(block)
+    return (time.perf_counter() - start) / len(blocks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="measure evm block processing time")
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--transactions", type=int, default=100, help="transactions per block")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    bin_blocks = [synthetic_block(height, args.transactions, rng) for height in range(args.blocks)]
+    layouts = (("msgpack bin", bin_blocks), ("Buffer objects", [as_buffer_objects(b) for b in bin_blocks]))
+    for layout, blocks in layouts:
+        baseline = time_per_block(BaselineIndexer()._process_block, blocks)
+        current = time_per_block(EthBlockIndexer()._process_block, blocks)
+        print(
+            f"{layout:>15}: baseline {baseline * 1e6:8.1f} us/block, "
+            f"current {current * 1e6:8.1f} us/block, {baseline / current:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Blocks per second of the EVM block indexer over a synthetic block range, streaming each .rmp.lz4 file through the
+# lz4 decompressor into a msgpack Unpacker, compared with decompressing every file to disk and loading it whole first.
+#
+#   python benchmarks/evm_block_throughput.py --blocks 2000 --transactions 50
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import lz4.frame
+import msgpack
+
+from synthetic_evm_blocks import write_block_files
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "examples"))
+from evm_block_indexer import EthBlockIndexer  # noqa: E402
+
+
+def index_decompressing_to_disk(indexer: EthBlockIndexer, filename: str) -> int:
+    mp_filename = filename[: -len(".lz4")]
+    with open(filename, "rb") as f_in, open(mp_filename, "wb") as f_out:
+        f_out.write(lz4.frame.decompress(f_in.read()))
+    with open(mp_filename, "rb") as f:
+        data = msgpack.load(f)
+    blocks = data if isinstance(data, list) else [data]
+    for block_data in blocks:
+        indexer._process_block(block_data)
+    return len(blocks)
+
+
+def index_streaming(indexer: EthBlockIndexer, filename: str) -> int:
+    return sum(1 for _ in indexer.iter_processed_blocks(filename))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="measure evm block indexing throughput")
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--transactions", type=int, default=50, help="transactions per block")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_block_files(data_dir, 1, args.blocks, args.transactions)
+        filenames = [os.path.join(data_dir, f"{height}.rmp.lz4") for height in range(1, args.blocks + 1)]
+        for name, index in (("decompress to disk", index_decompressing_to_disk), ("streaming", index_streaming)):
+            indexer = EthBlockIndexer()
+            start = time.perf_counter()
+            n_blocks = sum(index(indexer, filename) for filename in filenames)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>20}: {n_blocks / elapsed:10.1f} blocks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# Signer recovery throughput for a mix of user signed and L1 actions, recovered one at a time with
+# recover_user_from_user_signed_action and recover_agent_or_user_from_l1_action, and in batches with recover_signers
+# in this process and on a process pool. A share of the actions are exact duplicates, which recover_signers only
+# recovers once.
+#
+#   python benchmarks/signer_recovery_throughput.py --actions 2000 --duplicates 0.2 --workers 4
+import argparse
+import random
+import time
+from typing import Any, Callable, List
+
+import eth_account
+
+from hyperliquid.utils.recovery import recover_signers
+from hyperliquid.utils.signing import (
+    USER_SIGNED_ACTION_TYPES,
+    recover_agent_or_user_from_l1_action,
+    recover_user_from_user_signed_action,
+    sign_l1_action,
+    sign_usd_transfer_action,
+)
+
+DESTINATION = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+
+
+def synthetic_signed_actions(count: int, duplicates: float, rng: random.Random) -> List[Any]:
+    wallets = [eth_account.Account.from_key(rng.randbytes(32)) for _ in range(16)]
+    signed_actions: List[Any] = []
+    while len(signed_actions) < count:
+        if signed_actions and rng.random() < duplicates:
+            signed_actions.append(rng.choice(signed_actions))
+            continue
+        wallet = rng.choice(wallets)
+        nonce = 1700000000000 + len(signed_actions)
+        if rng.random() < 0.5:
+            action = {"type": "usdSend", "destination": DESTINATION, "amount": str(rng.randint(1, 1000)), "time": nonce}
+            signature = sign_usd_transfer_action(wallet, action, True)
+            signed_actions.append({"action": action, "signature": signature})
+        else:
+            order = {"a": 0, "b": True, "p": "100", "s": "1", "r": False, "t": {"limit": {"tif": "Gtc"}}}
+            action = {"type": "order", "orders": [order], "grouping": "na"}
+            signature = sign_l1_action(wallet, action, None, nonce, None, True)
+            signed_actions.append({"action": action, "signature": signature, "nonce": nonce})
+    return signed_actions
+
+
+def recover_one_at_a_time(signed_actions: List[Any]) -> List[str]:
+    signers = []
+    for signed_action in signed_actions:
+        action = signed_action["action"]
+        if action["type"] in USER_SIGNED_ACTION_TYPES:
+            payload_types, primary_type = USER_SIGNED_ACTION_TYPES[action["type"]]
+            signer = recover_user_from_user_signed_action(
+                action, signed_action["signature"], payload_types, primary_type, True
+            )
+        else:
+            signer = recover_agent_or_user_from_l1_action(
+                action, signed_action["signature"], None, signed_action["nonce"], None, True
+            )
+        signers.append(signer)
+    return signers
+
+
+def measure(name: str, recover: Callable[[List[Any]], List[str]], signed_actions: List[Any], expected: Any) -> float:
+    start = time.perf_counter()
+    signers = recover(signed_actions)
+    elapsed = time.perf_counter() - start
+    if expected is not None and signers != expected:
+        raise Exception(f"{name} recovered different signers")
+    print(f"{name:>24}: {len(signed_actions) / elapsed:10.0f} actions/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="measure signer recovery throughput")
+    parser.add_argument("--actions", type=int, default=2000)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="share of actions repeating an earlier one")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    args = parser.parse_args()
+
+    signed_actions = synthetic_signed_actions(args.actions, args.duplicates, random.Random(0))
+    expected = recover_one_at_a_time(signed_actions)
+    baseline = measure("one at a time", recover_one_at_a_time, signed_actions, expected)
+    batched = measure("batch, this process", lambda s: recover_signers(s, max_workers=1), signed_actions, expected)
+    pooled = measure(
+        f"batch, {args.workers} processes",
+        lambda s: recover_signers(s, max_workers=args.workers, chunk_size=args.chunk_size),
+        signed_actions,
+        expected,
+    )
+    print(f"speedup: {baseline / batched:.1f}x in this process, {baseline / pooled:.1f}x with the pool")
+
+
+if __name__ == "__main__":
+    main()
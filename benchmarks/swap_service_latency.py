@@ -0,0 +1,140 @@
+# Latency of the /swap handler of examples/api.py against a local stand-in for the Hyperliquid API that answers every
+# request after --rtt-ms. The baseline is the previous handler, which built a new Info and Exchange for each swap
+# (fetching spot meta, meta, user_state and spot_user_state) and fetched spot meta and mids again before trading,
+# plus mids once more for each order. The current handler shares SwapClients across swaps and only sends the two
+# orders. The on-chain transfers around the swap are left out, and the delay between the two legs is skipped.
+#
+#   python benchmarks/swap_service_latency.py --swaps 200 --rtt-ms 20 --concurrency 4
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, List
+
+import eth_account
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "examples"))
+from swap_service import (  # noqa: E402
+    SLIPPAGE,
+    SwapClients,
+    filled_status,
+    round_size,
+    swap,
+    sz_decimals_from_spot_meta,
+)
+
+FROM_COIN = "@166"
+TO_COIN = "@142"
+SPOT_META = {
+    "tokens": [
+        {"name": "USDC", "szDecimals": 8, "index": 0},
+        {"name": "USDT0", "szDecimals": 2, "index": 1},
+        {"name": "UBTC", "szDecimals": 5, "index": 2},
+    ],
+    "universe": [{"name": "@166", "tokens": [1, 0], "index": 166}, {"name": "@142", "tokens": [2, 0], "index": 142}],
+}
+INFO_RESPONSES = {
+    "spotMeta": SPOT_META,
+    "meta": {"universe": [{"name": "BTC", "szDecimals": 5}]},
+    "allMids": {"@166": "1.0", "@142": "100000.0", "BTC": "100000.0"},
+    "clearinghouseState": {"marginSummary": {"accountValue": "1000.0"}},
+    "spotClearinghouseState": {"balances": [{"coin": "USDT0", "total": "1000.0"}]},
+    "exchangeStatus": {},
+}
+
+
+def stand_in_server(rtt: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self) -> None:
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(rtt)
+            if self.path == "/info":
+                response: Any = INFO_RESPONSES[payload["type"]]
+            else:
+                order = payload["action"]["orders"][0]
+                filled = {"totalSz": order["s"], "avgPx": order["p"], "oid": 1}
+                response = {"status": "ok", "response": {"type": "order", "data": {"statuses": [{"filled": filled}]}}}
+            body = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def baseline_swap(base_url: str, wallet: Any, amount: float) -> Any:
+    # example_utils.setup, then the market data fetched by the previous swap
+    info = Info(base_url, True)
+    info.user_state(wallet.address)
+    info.spot_user_state(wallet.address)
+    exchange = Exchange(wallet, base_url, account_address=wallet.address)
+    sz_decimals = sz_decimals_from_spot_meta(info.spot_meta())
+    mids = info.all_mids()
+    initial_size = round_size(amount, sz_decimals, "USDT0")
+    filled = filled_status(exchange.market_open(FROM_COIN, False, initial_size, None, SLIPPAGE), "first")
+    output_size = float(filled["totalSz"]) * float(filled["avgPx"]) / float(mids[TO_COIN])
+    rounded_output = round_size(output_size, sz_decimals, "UBTC")
+    return filled_status(exchange.market_open(TO_COIN, True, rounded_output, None, SLIPPAGE), "second")
+
+
+def latencies(run_swap: Callable[[], Any], swaps: int, concurrency: int) -> List[float]:
+    def timed(_: int) -> float:
+        start = time.perf_counter()
+        run_swap()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed, range(swaps)))
+
+
+def report(name: str, samples: List[float]) -> float:
+    quantiles = statistics.quantiles(samples, n=100)
+    p50, p99 = quantiles[49], quantiles[98]
+    print(f"{name:>8}: p50 {p50 * 1000:7.1f} ms, p99 {p99 * 1000:7.1f} ms")
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="measure swap service latency")
+    parser.add_argument("--swaps", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=20, help="delay of the stand-in API before each response")
+    parser.add_argument("--concurrency", type=int, default=1, help="swaps in flight at once")
+    parser.add_argument("--amount", type=float, default=10)
+    args = parser.parse_args()
+
+    server = stand_in_server(args.rtt_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    wallet = eth_account.Account.create()
+    before = latencies(lambda: baseline_swap(base_url, wallet, args.amount), args.swaps, args.concurrency)
+    clients = SwapClients(wallet.address, Info(base_url, True), Exchange(wallet, base_url))
+    after = latencies(
+        lambda: swap(clients, args.amount, FROM_COIN, TO_COIN, second_trade_delay=0), args.swaps, args.concurrency
+    )
+    clients.close()
+    server.shutdown()
+    baseline = report("before", before)
+    current = report("after", after)
+    print(f"p50 speedup: {baseline / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Synthetic EVM block files with the layout of s3://hl-[testnet|mainnet]-evm-blocks, for the EVM indexer benchmarks.
+# Field values are random but every field the indexer reads is present with its real type.
+import os
+import random
+
+import lz4.frame
+import msgpack
+
+from hyperliquid.utils.types import Any, Dict
+
+TRANSFER_SELECTOR = bytes.fromhex("a9059cbb")
+# keccak("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = bytes.fromhex("ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef")
+
+
+def _uint(value: int) -> bytes:
+    return value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+
+
+def synthetic_transaction(rng: random.Random) -> Dict[str, Any]:
+    to = rng.randbytes(20)
+    data = TRANSFER_SELECTOR + bytes(12) + rng.randbytes(20) + rng.randrange(10**24).to_bytes(32, "big")
+    return {
+        "transaction": {
+            "Eip1559": {
+                "chainId": _uint(999),
+                "nonce": _uint(rng.randrange(10**6)),
+                "gas": _uint(rng.randrange(21000, 500000)),
+                "to": to,
+                "value": _uint(rng.randrange(10**18)),
+                "input": data,
+                "maxFeePerGas": _uint(rng.randrange(10**9, 10**11)),
+                "maxPriorityFeePerGas": _uint(rng.randrange(10**9)),
+                "accessList": [],
+            }
+        },
+        "signature": [rng.randbytes(32), rng.randbytes(32), _uint(rng.randrange(2))],
+    }
+
+
+def synthetic_receipt(tx: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    # a successful receipt with the Transfer log of the transaction's transfer calldata
+    content = tx["transaction"]["Eip1559"]
+    calldata = content["input"]
+    log = {
+        "address": content["to"],
+        "data": {"topics": [TRANSFER_TOPIC, bytes(12) + rng.randbytes(20), calldata[4:36]], "data": calldata[36:68]},
+    }
+    return {"tx_type": "Eip1559", "success": True, "cumulative_gas_used": rng.randrange(30_000_000), "logs": [log]}
+
+
+def synthetic_block(height: int, n_transactions: int, rng: random.Random) -> Dict[str, Any]:
+    transactions = [synthetic_transaction(rng) for _ in range(n_transactions)]
+    return {
+        "block": {
+            "Reth115": {
+                "header": {
+                    "hash": rng.randbytes(32),
+                    "header": {
+                        "parentHash": rng.randbytes(32),
+                        "sha3Uncles": rng.randbytes(32),
+                        "miner": rng.randbytes(20),
+                        "stateRoot": rng.randbytes(32),
+                        "transactionsRoot": rng.randbytes(32),
+                        "receiptsRoot": rng.randbytes(32),
+                        "number": _uint(height),
+                        "gasLimit": _uint(30_000_000),
+                        "gasUsed": _uint(rng.randrange(30_000_000)),
+                        "timestamp": _uint(1_700_000_000 + height),
+                        "extraData": b"",
+                        "baseFeePerGas": _uint(rng.randrange(10**9)),
+                    },
+                },
+                "body": {"transactions": transactions},
+            }
+        },
+        "receipts": [synthetic_receipt(tx, rng) for tx in transactions],
+        "system_txs": [],
+    }
+
+
+def write_block_files(data_dir: str, start_height: int, end_height: int, n_transactions: int, seed: int = 0) -> None:
+    # Writes {height}.rmp.lz4 for every height in the range, each holding an array with one block
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+    for height in range(start_height, end_height + 1):
+        packed = msgpack.packb([synthetic_block(height, n_transactions, rng)])
+        with open(os.path.join(data_dir, f"{height}.rmp.lz4"), "wb") as f:
+            f.write(lz4.frame.compress(packed))
+
+
+def as_buffer_objects(data):
+    # The same block with every byte string as a {"type": "Buffer", "data": [...]} object, the layout of blocks
+    # that went through a JSON serializer on the way
+    if isinstance(data, bytes):
+        return {"type": "Buffer", "data": list(data)}
+    if isinstance(data, dict):
+        return {k: as_buffer_objects(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [as_buffer_objects(item) for item in data]
+    return data
@@ -0,0 +1,82 @@
+# Soak test for the WebsocketManager subscription registry. Feeds millions of messages through on_message, most of them
+# for subscriptions that were never made, while another thread keeps subscribing and unsubscribing. Traced memory and
+# the registry size should stay flat for the whole run.
+#
+#   python benchmarks/ws_registry_soak.py --messages 5000000
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import websocket
+
+from hyperliquid.utils.types import Union
+from hyperliquid.websocket_manager import WebsocketManager
+
+
+class OfflineWebSocketApp(websocket.WebSocketApp):
+    def send(self, data: Union[bytes, str], opcode: int = websocket.ABNF.OPCODE_TEXT) -> None:
+        pass
+
+
+class OfflineWebsocketManager(WebsocketManager):
+    def __init__(self):
+        super().__init__("https://api.hyperliquid.xyz")
+        self.ws_ready = True
+        self.ws = OfflineWebSocketApp(self.ws.url)
+
+
+def churn_subscriptions(ws_manager, stop_event):
+    subscription = {"type": "l2Book", "coin": "ETH"}
+    while not stop_event.is_set():
+        subscription_id = ws_manager.subscribe(subscription, lambda _: None)
+        ws_manager.unsubscribe(subscription, subscription_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="soak test the websocket subscription registry")
+    parser.add_argument("--messages", type=int, default=2_000_000)
+    parser.add_argument("--report-every", type=int, default=250_000)
+    args = parser.parse_args()
+
+    ws_manager = OfflineWebsocketManager()
+    received = [0]
+
+    def on_trades(_ws_msg):
+        received[0] += 1
+
+    ws_manager.subscribe({"type": "trades", "coin": "BTC"}, on_trades)
+    handled = json.dumps({"channel": "trades", "data": [{"coin": "BTC", "px": "1", "sz": "1"}]})
+
+    stop_event = threading.Event()
+    churner = threading.Thread(target=churn_subscriptions, args=(ws_manager, stop_event))
+    churner.start()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    # unexpected messages are printed by on_message, which would dominate the run
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(args.messages):
+            if i % 2 == 0:
+                ws_manager.on_message(None, handled)
+            else:
+                ws_manager.on_message(None, f'{{"channel":"bbo","data":{{"coin":"UNSEEN{i}"}}}}')
+            if (i + 1) % args.report_every == 0:
+                current, peak = tracemalloc.get_traced_memory()
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{i + 1:>10} msgs  {(i + 1) / elapsed:>10.0f} msgs/s  registry={len(ws_manager.active_subscriptions)}"
+                    f"  traced={current / 1024:.0f}KiB peak={peak / 1024:.0f}KiB",
+                    file=sys.stderr,
+                )
+    stop_event.set()
+    churner.join()
+    print(f"callbacks invoked: {received[0]}, final registry keys: {sorted(ws_manager.active_subscriptions)}")
+
+
+if __name__ == "__main__":
+    main()
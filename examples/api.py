@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List, Union
@@ -11,6 +12,7 @@ from eth_account import Account
 from eth_typing import ChecksumAddress
 from hyperliquid.utils import constants
 from . import example_utils
+from .swap_service import SwapClients, SwapError, swap
 
 
 # Initialize Web3
@@ -44,8 +46,22 @@ USDT_ABI = [
 USDT_CONTRACT_ADDRESS = Web3.to_checksum_address('0xb8ce59fc3717ada4c02eadf9682a9e934f625ebb')
 USDT_DECIMALS = 6  # USDT has 6 decimals
 
+clients: Optional[SwapClients] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Info and Exchange for the lifetime of the process, with metadata and mids kept current over the websocket
+    global clients
+    address, info, exchange = example_utils.setup(constants.MAINNET_API_URL, skip_ws=False)
+    clients = SwapClients(address, info, exchange)
+    yield
+    clients.close()
+
+
 app = FastAPI(title="HyperLiquid Swap API",
-             description="API for performing token swaps on HyperLiquid")
+             description="API for performing token swaps on HyperLiquid",
+             lifespan=lifespan)
 
 class SwapRequest(BaseModel):
     from_coin: str
@@ -55,214 +71,11 @@ class SwapRequest(BaseModel):
     taker_fee: float = 0.0007
     skip_ws: bool = True
 
-def round_size(size, sz_decimals, coin):
-    if sz_decimals == 0:
-        return int(size)
-    return round(size, sz_decimals[coin])
-
-def round_price(price, sz_decimals, coin):
-    if price > 100_000:
-        return int(price)
-    return round(float(f"{price:.5g}"), 8 - sz_decimals[coin])
-
-def get_coin_name(coin_id: str) -> str:
-    """Extract coin name from coin ID"""
-    if coin_id.startswith('@'):
-        return coin_id[1:].split('/')[0].split('@')[-1]
-    return coin_id.split('/')[0]
-
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "message": "HyperLiquid Swap API is running"}
 
 
-#Hype is @107
-#Usdt0 is @166
-
-#we use @166 to get @107
-
-def round_size(size, sz_decimals, coin):
-    if sz_decimals[coin] == 0:
-        return int(size)
-    return round(size, sz_decimals[coin])
-
-def round_price(price, sz_decimals, coin):
-    if price > 100_000:
-        return int(price)
-    # If not we round px to 5 significant figures and max_decimals - szDecimals decimals
-    else:
-        return round(float(f"{price:.5g}"), 8 - sz_decimals[coin])
-
-def get_coin_name(coin_id):
-    # Map coin IDs to their names
-    coin_map = {
-        "@107": "HYPE",
-        "@160": "BUDDY",
-        "@142": "UBTC",
-        "@166": "USDT0",
-        "PURR/USDC": "PURR"
-    }
-    return coin_map.get(coin_id, coin_id)
-
-def swap(amount, from_coin, to_coin):
-    print(f"[DEBUG] Starting swap - Amount: {amount}, From: {from_coin}, To: {to_coin}")
-    try:
-        # Initialize exchange
-        print("[DEBUG] Initializing exchange...")
-        address, info, exchange = example_utils.setup(constants.MAINNET_API_URL, skip_ws=True)
-        print(f"[DEBUG] Exchange initialized. Address: {address}")
-        
-        # Get metadata and mids
-        print("[DEBUG] Fetching market data...")
-        meta = info.spot_meta()
-        mids = info.all_mids()
-        print(f"[DEBUG] Got market data. Available pairs: {len(meta.get('universe', []))}")
-        
-        # Create maps for szDecimals
-        sz_decimals = {}
-        
-        # Map token names to their szDecimals
-        for token in meta.get('tokens', []):
-            if 'name' in token and 'szDecimals' in token:
-                sz_decimals[token['name']] = token['szDecimals']
-        
-        # Add the PURR/USDC pair if it exists
-        for pair in meta.get('universe', []):
-            if pair['name'] == 'PURR/USDC':
-                sz_decimals['PURR/USDC'] = 0
-                print("[DEBUG] Added PURR/USDC to sz_decimals")
-                break
-        
-        # Get coin names
-        from_coin_name = get_coin_name(from_coin)
-        to_coin_name = get_coin_name(to_coin)
-        print(f"[DEBUG] Coin names - From: {from_coin_name}, To: {to_coin_name}")
-        
-        # Trading parameters
-        maker_fee = 0.0004
-        taker_fee = 0.0007
-        
-        # Set initial size with proper rounding
-        initial_size = round_size(amount, sz_decimals, from_coin_name)
-        print(f"[DEBUG] Rounded initial size: {initial_size} {from_coin_name}")
-        
-        # Get current prices
-        from_price = float(mids.get(from_coin, 0))
-        to_price = float(mids.get(to_coin, 0))
-        print(f"[DEBUG] Current prices - {from_coin}: {from_price}, {to_coin}: {to_price}")
-        
-        if from_price == 0 or to_price == 0:
-            error_msg = f"Could not get prices for one or both tokens. {from_coin}: {from_price}, {to_coin}: {to_price}"
-            print(f"[ERROR] {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Calculate expected output with fees
-        expected_output = (1 - maker_fee) * (1 - taker_fee) * \
-                        ((round_size(initial_size, sz_decimals, from_coin_name) * 
-                          round_price(from_price, sz_decimals, from_coin_name)) / 
-                         round_price(to_price, sz_decimals, to_coin_name))
-        
-        rounded_output = round_size(expected_output, sz_decimals, to_coin_name)
-        print(f"[DEBUG] Expected output: {expected_output}, Rounded: {rounded_output} {to_coin_name}")
-        
-        # Execute first trade (sell from_coin)
-        print(f"[DEBUG] Executing first trade: Selling {initial_size} {from_coin_name}")
-        order_result = exchange.market_open(from_coin, False, initial_size, None, 0.01)
-        print(f"[DEBUG] First trade result: {json.dumps(order_result, indent=2)}")
-        
-        if order_result["status"] != "ok":
-            error_msg = f"Error in first trade: {order_result}"
-            print(f"[ERROR] {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        filled = None
-        for status in order_result["response"]["data"]["statuses"]:
-            if "filled" in status:
-                filled = status["filled"]
-                print(f'[DEBUG] Order #{filled["oid"]} filled {filled["totalSz"]} @{filled["avgPx"]}')
-            elif "error" in status:
-                error_msg = f'First trade error: {status["error"]}'
-                print(f"[ERROR] {error_msg}")
-                raise HTTPException(status_code=400, detail=error_msg)
-        
-        if not filled:
-            error_msg = "No fills in first trade"
-            print(f"[ERROR] {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Get actual fill details
-        filled_size = float(filled["totalSz"])
-        filled_price = float(filled["avgPx"])
-        print(f"[DEBUG] First trade filled - Size: {filled_size}, Price: {filled_price}")
-        
-        # Get current final token price again in case it changed
-        current_to_price = float(mids.get(to_coin, 0))
-        print(f"[DEBUG] Current {to_coin} price: {current_to_price}")
-        
-        if current_to_price == 0:
-            error_msg = f"Could not get current price for {to_coin}"
-            print(f"[ERROR] {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Calculate output size based on filled amount and current price
-        output_size = (filled_size * filled_price) / current_to_price
-        rounded_output = round_size(output_size, sz_decimals, to_coin_name)
-        print(f"[DEBUG] Calculated output - Raw: {output_size}, Rounded: {rounded_output} {to_coin_name}")
-        
-        if rounded_output <= 0:
-            error_msg = f"Invalid output size {rounded_output}"
-            print(f"[ERROR] {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Small delay between trades
-        print("[DEBUG] Waiting before second trade...")
-        time.sleep(1)
-        
-        # Second trade (buy to_coin)
-        print(f"[DEBUG] Executing second trade: Buying {rounded_output} {to_coin_name}")
-        order_result2 = exchange.market_open(to_coin, True, rounded_output, None, 0.01)
-        print(f"[DEBUG] Second trade result: {json.dumps(order_result2, indent=2)}")
-        
-        if order_result2["status"] != "ok":
-            error_msg = f"Error in second trade: {order_result2}"
-            print(f"[ERROR] {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        filled2 = None
-        for status in order_result2["response"]["data"]["statuses"]:
-            if "filled" in status:
-                filled2 = status["filled"]
-                print(f'[DEBUG] Order #{filled2["oid"]} filled {filled2["totalSz"]} @{filled2["avgPx"]}')
-            elif "error" in status:
-                error_msg = f'Second trade error: {status["error"]}'
-                print(f"[ERROR] {error_msg}")
-                raise HTTPException(status_code=400, detail=error_msg)
-        
-        if not filled2:
-            error_msg = "No fills in second trade"
-            print(f"[ERROR] {error_msg}")
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Calculate final amounts with fees
-        final_amount = float(filled2['totalSz']) * (1 - taker_fee)
-        
-        return {
-            "status": "success",
-            "from_coin": from_coin,
-            "to_coin": to_coin,
-            "from_amount": filled["totalSz"],
-            "to_amount": final_amount,
-            "from_price": filled["avgPx"],
-            "to_price": filled2["avgPx"],
-            "fees_paid": {
-                "maker_fee": f"{maker_fee * 100}%",
-                "taker_fee": f"{taker_fee * 100}%"
-            },
-            "order_ids": [filled["oid"], filled2["oid"]]
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    
 def send_usdt_to_system(amount: float, private_key: str) -> Dict[str, Any]:
     """Send USDT to the system address using Web3"""
     try:
@@ -384,8 +197,9 @@ def send_ubtc_to_user(amount: float, to_address: str, private_key: str) -> Dict[
         print(f"[ERROR] {error_msg}")
         raise Exception(error_msg)
 
+# A plain def, FastAPI runs it in its threadpool so the blocking transfers and trades don't stall the event loop
 @app.post("/swap")
-async def execute_swap(data: dict):
+def execute_swap(data: dict):
     """
     Execute a swap by first sending USDT to the system address, then performing the swap
     
@@ -408,7 +222,10 @@ async def execute_swap(data: dict):
         from_coin = "@166"  # USDT
         to_coin = "@142"    # BTC
         
-        swap_result = swap(amount, from_coin, to_coin)
+        try:
+            swap_result = swap(clients, amount, from_coin, to_coin)
+        except SwapError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
         
         if swap_result["status"] != "success":
             raise HTTPException(status_code=400, detail=swap_result)
@@ -421,12 +238,9 @@ async def execute_swap(data: dict):
             # Get the amount of UBTC received from the swap
             ubtc_amount = float(swap_result["to_amount"])
             
-            # Initialize exchange for Hyperliquid
-            _, _, exchange = example_utils.setup(constants.MAINNET_API_URL, skip_ws=True)
-            
             # Send UBTC to the UBTC address
             # Using empty strings for SOURCE_DEX and DESTINATION_DEX as per mainnet requirements
-            send_result = exchange.spot_transfer(
+            send_result = clients.exchange.spot_transfer(
                 ubtc_amount,
                 "0x20000000000000000000000000000000000000c5",
                 "UBTC:0x8f254b963e8468305d409b33aa137c67"
@@ -462,6 +276,8 @@ async def execute_swap(data: dict):
                 "message": "Swap completed but UBTC transfer failed"
             }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
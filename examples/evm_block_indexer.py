@@ -1,22 +1,201 @@
-from typing import Any
+from typing import Any, BinaryIO, Iterator, Optional
 
 import argparse
 import json
 import os
+import sqlite3
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
 
 import lz4.frame
 import msgpack
-
-
-def decompress_lz4(input_file, output_file):
-    with open(input_file, "rb") as f_in:
-        compressed_data = f_in.read()
-
-    decompressed_data = lz4.frame.decompress(compressed_data)
-
-    with open(output_file, "wb") as f_out:
-        f_out.write(decompressed_data)
+from eth_keys import keys
+from eth_utils import keccak
+
+# first bytes of a msgpack array: fixarray, array 16 and array 32
+MSGPACK_ARRAY_PREFIXES = set(range(0x90, 0xA0)) | {0xDC, 0xDD}
+READ_SIZE = 1 << 16
+# chunks index_parallel submits per worker ahead of the one it merges
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def iter_msgpack_blocks(f: BinaryIO) -> Iterator[Any]:
+    # Yields the blocks of a msgpack stream holding either one block or an array of blocks, one at a time, so
+    # only the block being unpacked is held in memory
+    first = f.peek(1)[:1] if hasattr(f, "peek") else b""
+    unpacker = msgpack.Unpacker(f, read_size=READ_SIZE)
+    if first and first[0] in MSGPACK_ARRAY_PREFIXES:
+        for _ in range(unpacker.read_array_header()):
+            yield unpacker.unpack()
+    else:
+        yield from unpacker
+
+
+def iter_block_file(filename: str) -> Iterator[Any]:
+    # Stream the blocks of a {height}.rmp.lz4 file straight from the lz4 decompressor, or of an uncompressed .rmp file
+    opener = lz4.frame.open if filename.endswith(".lz4") else open
+    with opener(filename, "rb") as f:
+        yield from iter_msgpack_blocks(f)
+
+
+def decode_buffers(data: Any) -> Any:
+    # Hex encode byte strings, whether msgpack bin values or {"type": "Buffer", "data": [...]} objects, recursing
+    # into dicts and lists. Exact type checks come first since leaves are by far the most common values.
+    data_type = type(data)
+    if data_type is bytes:
+        return "0x" + data.hex()
+    if data_type is dict:
+        if data.get("type") == "Buffer":
+            return "0x" + bytes(data["data"]).hex()
+        return {k: decode_buffers(v) for k, v in data.items()}
+    if data_type is list:
+        return [decode_buffers(item) for item in data]
+    return data
+
+
+def buffer_to_int(value: Any) -> int:
+    # Big-endian integer from a msgpack bin value or a Buffer object, 0 when the field is missing
+    if type(value) is bytes:
+        return int.from_bytes(value, "big")
+    if isinstance(value, dict) and value.get("type") == "Buffer":
+        return int.from_bytes(bytes(value["data"]), "big")
+    return 0
+
+
+def _hex_to_bytes(value: Optional[str]) -> bytes:
+    return bytes.fromhex(value[2:]) if value else b""
+
+
+def _signature_int(value: Any) -> int:
+    if isinstance(value, str):
+        return int(value, 16) if len(value) > 2 else 0
+    return int(value)
+
+
+def _access_list(access_list: Any) -> list[Any]:
+    return [
+        [
+            _hex_to_bytes(entry["address"]),
+            [_hex_to_bytes(key) for key in entry.get("storageKeys", entry.get("storage_keys", []))],
+        ]
+        for entry in access_list or []
+    ]
+
+
+def _rlp_length_prefix(length: int, offset: int) -> bytes:
+    if length < 56:
+        return bytes((offset + length,))
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((offset + 55 + len(length_bytes),)) + length_bytes
+
+
+def _rlp_encode(item: Any) -> bytes:
+    # RLP of the ints, byte strings and lists that make up a transaction, faster than the generic rlp.encode since
+    # it needs no sedes lookups
+    if isinstance(item, int):
+        item = item.to_bytes((item.bit_length() + 7) // 8, "big")
+    if isinstance(item, bytes):
+        if len(item) == 1 and item[0] < 0x80:
+            return item
+        return _rlp_length_prefix(len(item), 0x80) + item
+    payload = b"".join(_rlp_encode(x) for x in item)
+    return _rlp_length_prefix(len(payload), 0xC0) + payload
+
+
+def _transaction_fields(tx: dict[str, Any]) -> tuple[bytes, list[Any], list[Any], int, int, int]:
+    # Splits a processed transaction into its type prefix, the fields its sender signed, the signature fields
+    # appended to them in the signed encoding, and the signature as (y parity, r, s)
+    r, s, v = (_signature_int(x) for x in tx["signature"])
+    if tx["type"] == "Eip1559":
+        fields = [tx["chainId"], tx["nonce"], tx["maxPriorityFeePerGas"], tx["maxFeePerGas"], tx["gas"]]
+        fields += [_hex_to_bytes(tx["to"]), tx["value"], _hex_to_bytes(tx["input"]), _access_list(tx.get("accessList"))]
+        y_parity = v if v in (0, 1) else (v - 35) % 2
+        return b"\x02", fields, [y_parity, r, s], y_parity, r, s
+    fields = [tx["nonce"], tx["gasPrice"], tx["gas"], _hex_to_bytes(tx["to"]), tx["value"], _hex_to_bytes(tx["input"])]
+    y_parity = v if v in (0, 1) else (v - 35) % 2 if v >= 35 else v - 27
+    # the chain id is only signed since EIP-155, whose v encodes it
+    v = tx["chainId"] * 2 + 35 + y_parity if tx["chainId"] else 27 + y_parity
+    return b"", fields, [v, r, s], y_parity, r, s
+
+
+def transaction_hash(tx: dict[str, Any]) -> str:
+    prefix, fields, signature_fields, _, _, _ = _transaction_fields(tx)
+    return "0x" + keccak(prefix + _rlp_encode(fields + signature_fields)).hex()
+
+
+def recover_sender(tx: dict[str, Any]) -> Optional[str]:
+    prefix, fields, _, y_parity, r, s = _transaction_fields(tx)
+    if not prefix and tx["chainId"]:
+        fields = fields + [tx["chainId"], 0, 0]
+    try:
+        signature = keys.Signature(vrs=(y_parity, r, s))
+        signing_hash = keccak(prefix + _rlp_encode(fields))
+        return signature.recover_public_key_from_msg_hash(signing_hash).to_checksum_address().lower()
+    except Exception:  # invalid signatures, e.g. system transactions
+        return None
+
+
+TRANSFER_SELECTOR = "0xa9059cbb"  # transfer(address,uint256)
+TRANSFER_FROM_SELECTOR = "0x23b872dd"  # transferFrom(address,address,uint256)
+TRANSFER_TOPIC = "0x" + keccak(b"Transfer(address,address,uint256)").hex()
+
+
+def _word_address(word: str) -> str:
+    return "0x" + word[24:64]
+
+
+def _log_topics_and_data(log: dict[str, Any]) -> tuple[list[Any], Any]:
+    # reth nests topics and data under "data", other encodings keep them on the log
+    data = log.get("data")
+    if isinstance(data, dict) and "topics" in data:
+        return data["topics"], data.get("data")
+    return log.get("topics", []), data
+
+
+def erc20_transfers(tx: dict[str, Any], tx_index: int, receipt: Optional[dict[str, Any]]) -> list[dict[str, Any]]:
+    # ERC-20 transfers of a processed transaction. With a receipt they come from its Transfer logs, which also catch
+    # transfers made by other contracts and skip reverted calls. Without one the transaction's own transfer or
+    # transferFrom calldata is decoded, whose sender is only known when senders are recovered.
+    transfers = []
+    if receipt is not None:
+        for log_index, log in enumerate(decode_buffers(receipt.get("logs", []))):
+            topics, data = _log_topics_and_data(log)
+            # ERC-721 Transfer has the same signature with the token id as a fourth topic instead of data
+            if len(topics) != 3 or topics[0] != TRANSFER_TOPIC or not data or len(data) != 66:
+                continue
+            transfers.append(
+                {
+                    "token": log["address"].lower(),
+                    "from": _word_address(topics[1][2:]),
+                    "to": _word_address(topics[2][2:]),
+                    "value": int(data, 16),
+                    "txIndex": tx_index,
+                    "logIndex": log_index,
+                }
+            )
+        return transfers
+    calldata = tx.get("input") or ""
+    selector, args = calldata[:10], calldata[10:]
+    if selector == TRANSFER_SELECTOR and len(args) == 128 and tx["to"]:
+        sender, recipient, value = tx.get("from"), _word_address(args), int(args[64:], 16)
+    elif selector == TRANSFER_FROM_SELECTOR and len(args) == 192 and tx["to"]:
+        sender, recipient, value = _word_address(args), _word_address(args[64:]), int(args[128:], 16)
+    else:
+        return transfers
+    transfers.append(
+        {
+            "token": tx["to"].lower(),
+            "from": sender,
+            "to": recipient,
+            "value": value,
+            "txIndex": tx_index,
+            "logIndex": None,
+        }
+    )
+    return transfers
 
 
 class BytesEncoder(json.JSONEncoder):
@@ -26,35 +205,418 @@ class BytesEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-class EthBlockIndexer:
+class JsonlBlockSink:
+    # Writes each processed block as one line of JSON, so memory use doesn't depend on the number of blocks. With
+    # append, blocks are added after the ones of an earlier run instead of replacing them.
+    def __init__(self, filename: str, append: bool = False):
+        self.file = open(filename, "a" if append else "w")
+
+    def write(self, block: dict[str, Any]) -> None:
+        self.file.write(json.dumps(block, cls=BytesEncoder, separators=(",", ":")))
+        self.file.write("\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class ColumnarTransactionSink:
+    # Writes one row per transaction to a directory holding a file per column. Numeric columns are raw little-endian
+    # uint64 arrays (readable with array.fromfile or numpy.fromfile(dtype="<u8")), string columns are newline
+    # separated text. Rows are buffered and appended to the files every row_group_size rows, and schema.json records
+    # the columns, the row count and the row count of every row group. With append, rows are added after the ones of
+    # an earlier run and its row groups are kept in schema.json.
+    NUMERIC_COLUMNS = (
+        "block_number",
+        "tx_index",
+        "timestamp",
+        "chain_id",
+        "nonce",
+        "gas",
+        "gas_price",
+        "max_fee_per_gas",
+        "max_priority_fee_per_gas",
+    )
+    # value is uint256, too wide for a numeric column, so it is stored as a decimal string
+    STRING_COLUMNS = ("type", "to", "value", "input")
+
+    def __init__(self, directory: str, row_group_size: int = 65536, append: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.row_groups: list[int] = []
+        schema_path = os.path.join(directory, "schema.json")
+        if append and os.path.exists(schema_path):
+            with open(schema_path) as f:
+                self.row_groups = json.load(f)["rowGroups"]
+        self.numeric = {name: array("Q") for name in self.NUMERIC_COLUMNS}
+        self.strings: dict[str, list[str]] = {name: [] for name in self.STRING_COLUMNS}
+        self.files = {
+            name: open(
+                os.path.join(directory, name + (".u64" if name in self.numeric else ".txt")), "ab" if append else "wb"
+            )
+            for name in self.NUMERIC_COLUMNS + self.STRING_COLUMNS
+        }
+
+    def write(self, block: dict[str, Any]) -> None:
+        for tx_index, tx in enumerate(block["transactions"]):
+            if not tx:
+                continue
+            row = (
+                block["number"],
+                tx_index,
+                block["timestamp"],
+                tx["chainId"],
+                tx["nonce"],
+                tx["gas"],
+                tx.get("gasPrice", 0),
+                tx.get("maxFeePerGas", 0),
+                tx.get("maxPriorityFeePerGas", 0),
+            )
+            for name, value in zip(self.NUMERIC_COLUMNS, row):
+                self.numeric[name].append(value)
+            self.strings["type"].append(tx["type"])
+            self.strings["to"].append(tx["to"] or "")
+            self.strings["value"].append(str(tx["value"]))
+            self.strings["input"].append(tx["input"] or "")
+            if len(self.strings["type"]) >= self.row_group_size:
+                self.flush()
+
+    def flush(self) -> None:
+        rows = len(self.strings["type"])
+        if not rows:
+            return
+        for name, column in self.numeric.items():
+            if sys.byteorder == "big":
+                column.byteswap()
+            column.tofile(self.files[name])
+            self.numeric[name] = array("Q")
+        for name, values in self.strings.items():
+            self.files[name].write(("\n".join(values) + "\n").encode())
+            self.strings[name] = []
+        self.row_groups.append(rows)
+
+    def close(self) -> None:
+        self.flush()
+        for column_file in self.files.values():
+            column_file.close()
+        with open(os.path.join(self.directory, "schema.json"), "w") as f:
+            json.dump(
+                {
+                    "numeric": {name: "<u8" for name in self.NUMERIC_COLUMNS},
+                    "strings": list(self.STRING_COLUMNS),
+                    "rows": sum(self.row_groups),
+                    "rowGroups": self.row_groups,
+                },
+                f,
+            )
+
+
+def read_numeric_column(directory: str, name: str) -> "array[int]":
+    column = array("Q")
+    with open(os.path.join(directory, f"{name}.u64"), "rb") as f:
+        column.frombytes(f.read())
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+class BlockIndex:
+    # SQLite index of blocks and transactions, queryable by block number, transaction hash and from/to address.
+    # Written as a sink: rows are buffered and committed every batch_size blocks in one transaction together with the
+    # ranges of heights committed so far, so a later run only indexes the missing_ranges of the heights it is asked
+    # for, whether they lie before, between or after the ranges already indexed.
+    # from_address is only filled for transactions whose sender was recovered, so the indexer writing to it needs
+    # recover_senders for transactions_of to find the transactions an address sent.
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS blocks (
+            number INTEGER PRIMARY KEY,
+            hash TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            gas_used INTEGER NOT NULL,
+            tx_count INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS transactions (
+            hash TEXT PRIMARY KEY,
+            block_number INTEGER NOT NULL,
+            tx_index INTEGER NOT NULL,
+            from_address TEXT,
+            to_address TEXT,
+            value TEXT NOT NULL,
+            nonce INTEGER NOT NULL,
+            gas INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS transactions_block ON transactions (block_number, tx_index);
+        CREATE INDEX IF NOT EXISTS transactions_from ON transactions (from_address, block_number);
+        CREATE INDEX IF NOT EXISTS transactions_to ON transactions (to_address, block_number);
+        CREATE TABLE IF NOT EXISTS erc20_transfers (
+            token TEXT NOT NULL,
+            block_number INTEGER NOT NULL,
+            tx_index INTEGER NOT NULL,
+            log_index INTEGER,
+            from_address TEXT,
+            to_address TEXT NOT NULL,
+            value TEXT NOT NULL
+        );
+        -- log_index is null for transfers decoded from calldata, at most one per transaction, and nulls never clash
+        CREATE UNIQUE INDEX IF NOT EXISTS erc20_transfers_log ON erc20_transfers (
+            block_number, tx_index, IFNULL(log_index, -1)
+        );
+        CREATE INDEX IF NOT EXISTS erc20_transfers_to ON erc20_transfers (to_address, token, block_number);
+        CREATE INDEX IF NOT EXISTS erc20_transfers_from ON erc20_transfers (from_address, token, block_number);
+        CREATE INDEX IF NOT EXISTS erc20_transfers_token ON erc20_transfers (token, block_number);
+        CREATE TABLE IF NOT EXISTS indexed_ranges (first INTEGER PRIMARY KEY, last INTEGER NOT NULL);
+    """
+
+    def __init__(self, filename: str, batch_size: int = 1000):
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.batch_size = batch_size
+        self.block_rows: list[tuple[Any, ...]] = []
+        self.transaction_rows: list[tuple[Any, ...]] = []
+        self.transfer_rows: list[tuple[Any, ...]] = []
+
+    def indexed_ranges(self) -> list[tuple[int, int]]:
+        # Committed heights as sorted, disjoint (first, last) ranges
+        return [(first, last) for first, last in self.connection.execute("SELECT * FROM indexed_ranges ORDER BY first")]
+
+    def missing_ranges(self, start_height: int, end_height: int) -> list[tuple[int, int]]:
+        # The (first, last) ranges of heights in [start_height, end_height] that aren't committed yet
+        missing = []
+        next_height = start_height
+        for first, last in self.indexed_ranges():
+            if last < next_height:
+                continue
+            if first > end_height:
+                break
+            if first > next_height:
+                missing.append((next_height, first - 1))
+            next_height = last + 1
+        if next_height <= end_height:
+            missing.append((next_height, end_height))
+        return missing
+
+    def write(self, block: dict[str, Any]) -> None:
+        self.block_rows.append(
+            (block["number"], block["hash"], block["timestamp"], block["gasUsed"], len(block["transactions"]))
+        )
+        for tx_index, tx in enumerate(block["transactions"]):
+            if tx.get("hash"):
+                self.transaction_rows.append(
+                    (
+                        tx["hash"],
+                        block["number"],
+                        tx_index,
+                        tx.get("from"),
+                        tx["to"].lower() if tx["to"] else None,
+                        str(tx["value"]),
+                        tx["nonce"],
+                        tx["gas"],
+                    )
+                )
+        for transfer in block.get("erc20Transfers", []):
+            self.transfer_rows.append(
+                (
+                    transfer["token"],
+                    block["number"],
+                    transfer["txIndex"],
+                    transfer["logIndex"],
+                    transfer["from"],
+                    transfer["to"],
+                    str(transfer["value"]),
+                )
+            )
+        if len(self.block_rows) >= self.batch_size:
+            self.commit()
+
+    def commit(self) -> None:
+        if not self.block_rows:
+            return
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?)", self.block_rows)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self.transaction_rows
+            )
+            # a block indexed again, e.g. by a run over heights that were already committed, keeps its transfers
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO erc20_transfers VALUES (?, ?, ?, ?, ?, ?, ?)", self.transfer_rows
+            )
+            for first, last in self._runs(sorted(row[0] for row in self.block_rows)):
+                self._add_indexed_range(first, last)
+        self.block_rows = []
+        self.transaction_rows = []
+        self.transfer_rows = []
+
+    @staticmethod
+    def _runs(numbers: list[int]) -> Iterator[tuple[int, int]]:
+        # (first, last) runs of consecutive numbers in a sorted list
+        i = 0
+        while i < len(numbers):
+            j = i
+            while j + 1 < len(numbers) and numbers[j + 1] <= numbers[j] + 1:
+                j += 1
+            yield numbers[i], numbers[j]
+            i = j + 1
+
+    def _add_indexed_range(self, first: int, last: int) -> None:
+        # Replaces the ranges overlapping or adjacent to [first, last] with their union
+        overlapping = self.connection.execute(
+            "SELECT first, last FROM indexed_ranges WHERE first <= ? AND last >= ?", (last + 1, first - 1)
+        ).fetchall()
+        for other_first, other_last in overlapping:
+            first, last = min(first, other_first), max(last, other_last)
+        self.connection.execute("DELETE FROM indexed_ranges WHERE first <= ? AND last >= ?", (last + 1, first - 1))
+        self.connection.execute("INSERT INTO indexed_ranges VALUES (?, ?)", (first, last))
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
+
+    def block(self, number: int) -> Optional[tuple[Any, ...]]:
+        row: Optional[tuple[Any, ...]] = self.connection.execute(
+            "SELECT * FROM blocks WHERE number = ?", (number,)
+        ).fetchone()
+        return row
+
+    def transaction(self, tx_hash: str) -> Optional[tuple[Any, ...]]:
+        row: Optional[tuple[Any, ...]] = self.connection.execute(
+            "SELECT * FROM transactions WHERE hash = ?", (tx_hash.lower(),)
+        ).fetchone()
+        return row
+
+    def transactions_of(self, address: str, limit: int = 100) -> list[tuple[Any, ...]]:
+        # Latest transactions sent from or to address, newest first
+        address = address.lower()
+        return self.connection.execute(
+            """
+            SELECT * FROM (
+                SELECT * FROM transactions WHERE from_address = ?
+                UNION
+                SELECT * FROM transactions WHERE to_address = ?
+            ) ORDER BY block_number DESC, tx_index DESC LIMIT ?
+            """,
+            (address, address, limit),
+        ).fetchall()
+
+    def erc20_transfers_of(
+        self, address: str, token: Optional[str] = None, direction: str = "to", limit: int = 100
+    ) -> list[tuple[Any, ...]]:
+        # Latest ERC-20 transfers to (or with direction="from", from) address, of one token or all, newest first
+        column = {"to": "to_address", "from": "from_address"}[direction]
+        query = f"SELECT * FROM erc20_transfers WHERE {column} = ?"
+        params: list[Any] = [address.lower()]
+        if token is not None:
+            query += " AND token = ?"
+            params.append(token.lower())
+        query += " ORDER BY block_number DESC, tx_index DESC LIMIT ?"
+        return self.connection.execute(query, params + [limit]).fetchall()
+
+
+class BlockStats:
+    # Running totals behind summarize_blocks, updated per block so the blocks themselves needn't be kept. Stats of
+    # consecutive height ranges combine with merge.
     def __init__(self):
-        self.blocks = []
+        self.total_blocks = 0
+        self.total_transactions = 0
+        self.total_gas_used = 0
+        # [first, last] runs of consecutive block numbers, rather than every number
+        self.block_ranges: list[list[int]] = []
+        self.first_datetime: Optional[str] = None
+        self.last_datetime: Optional[str] = None
+
+    def add(self, block: dict[str, Any]) -> None:
+        self.total_blocks += 1
+        self.total_transactions += len(block["transactions"])
+        self.total_gas_used += block["gasUsed"]
+        self._add_range(block["number"], block["number"])
+        if block["datetime"]:
+            self.first_datetime = self.first_datetime or block["datetime"]
+            self.last_datetime = block["datetime"]
+
+    def merge(self, later: "BlockStats") -> None:
+        self.total_blocks += later.total_blocks
+        self.total_transactions += later.total_transactions
+        self.total_gas_used += later.total_gas_used
+        for first, last in later.block_ranges:
+            self._add_range(first, last)
+        self.first_datetime = self.first_datetime or later.first_datetime
+        self.last_datetime = later.last_datetime or self.last_datetime
+
+    def _add_range(self, first: int, last: int) -> None:
+        if self.block_ranges and self.block_ranges[-1][1] + 1 == first:
+            self.block_ranges[-1][1] = last
+        else:
+            self.block_ranges.append([first, last])
+
+    def summary(self) -> dict[str, Any]:
+        if not self.total_blocks:
+            return {"error": "no blocks processed"}
+        return {
+            "totalBlocks": self.total_blocks,
+            "totalTransactions": self.total_transactions,
+            "averageGasUsed": self.total_gas_used / self.total_blocks,
+            "blockRanges": self.block_ranges,
+            "timeRange": {"first": self.first_datetime, "last": self.last_datetime},
+        }
+
+
+def block_filename(data_dir: str, height: int) -> str:
+    lz4_fln = f"{data_dir}/{height}.rmp.lz4"
+    if not os.path.exists(lz4_fln):
+        raise Exception(
+            f"block with height {height} not found - download missing block file(s) using 'aws s3 cp s3://hl-[testnet | mainnet]-evm-blocks/<block_object_path> --request-payer requester'"
+        )
+    return lz4_fln
+
+
+def index_height_range(
+    data_dir: str,
+    start_height: int,
+    end_height: int,
+    retain_blocks: bool,
+    sinks: Optional[list[Any]] = None,
+    recover_senders: bool = False,
+    hash_transactions: bool = False,
+) -> "EthBlockIndexer":
+    # Runs in a worker process of index_parallel, so it has to be a module level function
+    indexer = EthBlockIndexer(retain_blocks, sinks, recover_senders, hash_transactions)
+    for height in range(start_height, end_height + 1):
+        indexer.process_block_file(block_filename(data_dir, height))
+    return indexer
+
+
+class EthBlockIndexer:
+    def __init__(
+        self,
+        retain_blocks: bool = True,
+        sinks: Optional[list[Any]] = None,
+        recover_senders: bool = False,
+        hash_transactions: bool = False,
+    ):
+        # Without retain_blocks only the running stats are kept, and save_to_json has nothing to save. Every
+        # processed block is also written to each of sinks, e.g. a JsonlBlockSink, a ColumnarTransactionSink or a
+        # BlockIndex. hash_transactions adds the "hash" of each transaction, which BlockIndex needs, and
+        # recover_senders its "from" address too, at the cost of an ECDSA recovery.
+        self.retain_blocks = retain_blocks
+        self.recover_senders = recover_senders
+        self.hash_transactions = hash_transactions or recover_senders
+        self.sinks = sinks or []
+        self.blocks: list[dict[str, Any]] = []
+        self.stats = BlockStats()
 
     # convert a Buffer object to hex string
     def _convert_buffer(self, buffer_obj: dict[str, Any]) -> str:
         if isinstance(buffer_obj, dict) and buffer_obj.get("type") == "Buffer":
-            return "0x" + "".join(f"{x:02x}" for x in buffer_obj["data"])
+            return "0x" + bytes(buffer_obj["data"]).hex()
         return str(buffer_obj)
 
     # recursively process nested Buffer objects
     def _process_nested_buffers(self, data: Any) -> Any:
-        if isinstance(data, dict):
-            if data.get("type") == "Buffer":
-                return self._convert_buffer(data)
-            return {k: self._process_nested_buffers(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._process_nested_buffers(item) for item in data]
-        elif isinstance(data, bytes):
-            return "0x" + data.hex()
-        return data
+        return decode_buffers(data)
 
     def _bytes_to_int(self, value: Any) -> int:
-        if isinstance(value, dict) and value.get("type") == "Buffer":
-            raw_bytes = bytes(value["data"])
-            return int.from_bytes(raw_bytes, byteorder="big")
-        elif isinstance(value, bytes):
-            return int.from_bytes(value, byteorder="big")
-        return 0
+        return buffer_to_int(value)
 
     def _process_transaction(self, tx: dict[str, Any]) -> dict[str, Any]:
         if not tx.get("transaction"):
@@ -63,31 +625,30 @@ class EthBlockIndexer:
         tx_data = tx["transaction"]
         tx_type = next(iter(tx_data.keys()))  # Either 'Legacy' or 'Eip1559'
         tx_content = tx_data[tx_type]
+        get = tx_content.get
 
         processed = {
             "type": tx_type,
-            "chainId": self._bytes_to_int(tx_content.get("chainId", {"type": "Buffer", "data": []})),
-            "nonce": self._bytes_to_int(tx_content.get("nonce", {"type": "Buffer", "data": []})),
-            "gas": self._bytes_to_int(tx_content.get("gas", {"type": "Buffer", "data": []})),
-            "to": self._process_nested_buffers(tx_content.get("to")),
-            "value": self._bytes_to_int(tx_content.get("value", {"type": "Buffer", "data": []})),
-            "input": self._process_nested_buffers(tx_content.get("input")),
-            "signature": [self._process_nested_buffers(sig) for sig in tx.get("signature", [])],
+            "chainId": buffer_to_int(get("chainId")),
+            "nonce": buffer_to_int(get("nonce")),
+            "gas": buffer_to_int(get("gas")),
+            "to": decode_buffers(get("to")),
+            "value": buffer_to_int(get("value")),
+            "input": decode_buffers(get("input")),
+            "signature": [decode_buffers(sig) for sig in tx.get("signature", [])],
         }
 
         if tx_type == "Legacy":
-            processed["gasPrice"] = self._bytes_to_int(tx_content.get("gasPrice", {"type": "Buffer", "data": []}))
+            processed["gasPrice"] = buffer_to_int(get("gasPrice"))
         elif tx_type == "Eip1559":
-            processed.update(
-                {
-                    "maxFeePerGas": self._bytes_to_int(tx_content.get("maxFeePerGas", {"type": "Buffer", "data": []})),
-                    "maxPriorityFeePerGas": self._bytes_to_int(
-                        tx_content.get("maxPriorityFeePerGas", {"type": "Buffer", "data": []})
-                    ),
-                    "accessList": self._process_nested_buffers(tx_content.get("accessList", [])),
-                }
-            )
-
+            processed["maxFeePerGas"] = buffer_to_int(get("maxFeePerGas"))
+            processed["maxPriorityFeePerGas"] = buffer_to_int(get("maxPriorityFeePerGas"))
+            processed["accessList"] = decode_buffers(get("accessList", []))
+
+        if self.hash_transactions and len(processed["signature"]) == 3:
+            processed["hash"] = transaction_hash(processed)
+            if self.recover_senders:
+                processed["from"] = recover_sender(processed)
         return processed
 
     def _process_block(self, block_data: dict[str, Any]) -> dict[str, Any]:
@@ -98,24 +659,32 @@ class EthBlockIndexer:
         header = reth_block.get("header", {}).get("header", {})
 
         processed_block = {
-            "hash": self._process_nested_buffers(reth_block["header"].get("hash")),
-            "parentHash": self._process_nested_buffers(header.get("parentHash")),
-            "sha3Uncles": self._process_nested_buffers(header.get("sha3Uncles")),
-            "miner": self._process_nested_buffers(header.get("miner")),
-            "stateRoot": self._process_nested_buffers(header.get("stateRoot")),
-            "transactionsRoot": self._process_nested_buffers(header.get("transactionsRoot")),
-            "receiptsRoot": self._process_nested_buffers(header.get("receiptsRoot")),
-            "number": self._bytes_to_int(header.get("number", {"type": "Buffer", "data": []})),
-            "gasLimit": self._bytes_to_int(header.get("gasLimit", {"type": "Buffer", "data": []})),
-            "gasUsed": self._bytes_to_int(header.get("gasUsed", {"type": "Buffer", "data": []})),
-            "timestamp": self._bytes_to_int(header.get("timestamp", {"type": "Buffer", "data": []})),
-            "extraData": self._process_nested_buffers(header.get("extraData")),
-            "baseFeePerGas": self._bytes_to_int(header.get("baseFeePerGas", {"type": "Buffer", "data": []})),
+            "hash": decode_buffers(reth_block["header"].get("hash")),
+            "parentHash": decode_buffers(header.get("parentHash")),
+            "sha3Uncles": decode_buffers(header.get("sha3Uncles")),
+            "miner": decode_buffers(header.get("miner")),
+            "stateRoot": decode_buffers(header.get("stateRoot")),
+            "transactionsRoot": decode_buffers(header.get("transactionsRoot")),
+            "receiptsRoot": decode_buffers(header.get("receiptsRoot")),
+            "number": buffer_to_int(header.get("number")),
+            "gasLimit": buffer_to_int(header.get("gasLimit")),
+            "gasUsed": buffer_to_int(header.get("gasUsed")),
+            "timestamp": buffer_to_int(header.get("timestamp")),
+            "extraData": decode_buffers(header.get("extraData")),
+            "baseFeePerGas": buffer_to_int(header.get("baseFeePerGas")),
             "transactions": [
                 self._process_transaction(tx) for tx in reth_block.get("body", {}).get("transactions", [])
             ],
         }
 
+        receipts = block_data.get("receipts") or []
+        processed_block["erc20Transfers"] = [
+            transfer
+            for tx_index, tx in enumerate(processed_block["transactions"])
+            if tx
+            for transfer in erc20_transfers(tx, tx_index, receipts[tx_index] if tx_index < len(receipts) else None)
+        ]
+
         if processed_block["timestamp"]:
             processed_block["datetime"] = datetime.fromtimestamp(processed_block["timestamp"]).isoformat()
         else:
@@ -123,24 +692,85 @@ class EthBlockIndexer:
 
         return processed_block
 
-    def process_msgpack_file(self, filename: str) -> None:
-        with open(filename, "rb") as f:
-            data = msgpack.load(f)
-            if isinstance(data, list):
-                for block_data in data:
-                    processed_block = self._process_block(block_data)
-                    self.blocks.append(processed_block)
-            else:
-                processed_block = self._process_block(data)
-                self.blocks.append(processed_block)
+    def iter_processed_blocks(self, filename: str) -> Iterator[dict[str, Any]]:
+        for block_data in iter_block_file(filename):
+            yield self._process_block(block_data)
+
+    def add_block(self, processed_block: dict[str, Any]) -> None:
+        self.stats.add(processed_block)
+        for sink in self.sinks:
+            sink.write(processed_block)
+        if self.retain_blocks:
+            self.blocks.append(processed_block)
+
+    def process_block_file(self, filename: str) -> None:
+        for processed_block in self.iter_processed_blocks(filename):
+            self.add_block(processed_block)
+
+    def merge(self, later: "EthBlockIndexer") -> None:
+        self.stats.merge(later.stats)
+        for block in later.blocks:
+            for sink in self.sinks:
+                sink.write(block)
+        if self.retain_blocks:
+            self.blocks.extend(later.blocks)
+
+    @classmethod
+    def index_parallel(
+        cls,
+        data_dir: str,
+        start_height: int,
+        end_height: int,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        retain_blocks: bool = True,
+        sinks: Optional[list[Any]] = None,
+        recover_senders: bool = False,
+        hash_transactions: bool = False,
+    ) -> "EthBlockIndexer":
+        # Index the height range in chunks of chunk_size heights on a pool of worker processes. Chunks are merged in
+        # height order, so the result is the same as indexing serially, and written to sinks as they are merged.
+        # Blocks are sent back from the workers when they are retained or written to sinks, which costs more than
+        # indexing them, so leave both off when only the summary is needed.
+        # At most CHUNKS_IN_FLIGHT_PER_WORKER chunks per worker are submitted ahead of the one being merged, so
+        # finished chunks waiting for an earlier one don't pile up in memory.
+        indexer = cls(retain_blocks, sinks, recover_senders, hash_transactions)
+        chunks = (
+            (start, min(start + chunk_size - 1, end_height))
+            for start in range(start_height, end_height + 1, chunk_size)
+        )
+        max_in_flight = (workers or os.cpu_count() or 1) * CHUNKS_IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight: "deque[Future[EthBlockIndexer]]" = deque()
+            for start, end in chunks:
+                in_flight.append(
+                    executor.submit(
+                        index_height_range,
+                        data_dir,
+                        start,
+                        end,
+                        retain_blocks or bool(sinks),
+                        None,
+                        recover_senders,
+                        hash_transactions,
+                    )
+                )
+                if len(in_flight) >= max_in_flight:
+                    indexer.merge(in_flight.popleft().result())
+            while in_flight:
+                indexer.merge(in_flight.popleft().result())
+        return indexer
+
+    # kept for callers of the old name, also accepts .rmp.lz4 files now
+    process_msgpack_file = process_block_file
 
     def save_to_json(self, output_filename: str) -> None:
         with open(output_filename, "w") as f:
             json.dump(
                 {
                     "blocks": self.blocks,
-                    "totalBlocks": len(self.blocks),
-                    "totalTransactions": sum(len(block["transactions"]) for block in self.blocks),
+                    "totalBlocks": self.stats.total_blocks,
+                    "totalTransactions": self.stats.total_transactions,
                 },
                 f,
                 indent=2,
@@ -148,22 +778,7 @@ class EthBlockIndexer:
             )
 
     def summarize_blocks(self) -> dict[str, Any]:
-        if not self.blocks:
-            return {"error": "no blocks processed"}
-
-        total_gas_used = sum(block["gasUsed"] for block in self.blocks)
-        total_txs = sum(len(block["transactions"]) for block in self.blocks)
-
-        return {
-            "totalBlocks": len(self.blocks),
-            "totalTransactions": total_txs,
-            "averageGasUsed": total_gas_used / len(self.blocks) if self.blocks else 0,
-            "blockNumbers": [block["number"] for block in self.blocks],
-            "timeRange": {
-                "first": next((b["datetime"] for b in self.blocks if b["datetime"]), None),
-                "last": next((b["datetime"] for b in reversed(self.blocks) if b["datetime"]), None),
-            },
-        }
+        return self.stats.summary()
 
 
 if __name__ == "__main__":
@@ -173,24 +788,69 @@ if __name__ == "__main__":
     parser.add_argument("--data-dir", type=str, required=True)
     parser.add_argument("--start-height", type=int, required=True)
     parser.add_argument("--end-height", type=int, required=True)
+    parser.add_argument("--workers", type=int, default=1, help="index chunks of heights on this many processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="heights per chunk with --workers")
+    parser.add_argument("--summary-only", action="store_true", help="don't keep blocks or write processed_blocks.json")
+    parser.add_argument("--jsonl", type=str, help="stream blocks to this newline delimited JSON file")
+    parser.add_argument("--columnar", type=str, help="stream transactions to column files in this directory")
+    parser.add_argument(
+        "--index",
+        type=str,
+        help="add blocks to this SQLite index, skipping the heights it already has and appending to --jsonl. "
+        "Implies --recover-senders, so transactions can be looked up by sender",
+    )
+    parser.add_argument(
+        "--recover-senders", action="store_true", help="recover the from address of transactions, implied by --index"
+    )
     args = parser.parse_args()
 
     data_dir = args.data_dir
     start_height = args.start_height
     end_height = args.end_height
-    mp_flns = []
-    for height in range(start_height, end_height + 1):
-        lz4_fln = f"{data_dir}/{height}.rmp.lz4"
-        if not os.path.exists(lz4_fln):
-            raise Exception(
-                f"block with height {height} not found - download missing block file(s) using 'aws s3 cp s3://hl-[testnet | mainnet]-evm-blocks/<block_object_path> --request-payer requester'"
-            )
-        mp_fln = f"{data_dir}/{height}.rmp"
-        decompress_lz4(lz4_fln, mp_fln)
-        mp_flns.append(mp_fln)
-
-    indexer = EthBlockIndexer()
-    for mp_fln in mp_flns:
-        indexer.process_msgpack_file(mp_fln)
+    sinks: list[Any] = []
+    height_ranges = [(start_height, end_height)]
+    resuming = False
+    # without senders the index would only find transactions by their recipient
+    recover_senders = args.recover_senders or bool(args.index)
+    if args.index:
+        index = BlockIndex(args.index)
+        resuming = bool(index.indexed_ranges())
+        height_ranges = index.missing_ranges(start_height, end_height)
+        if height_ranges != [(start_height, end_height)]:
+            print(f"{args.index} already has heights {index.indexed_ranges()}, indexing {height_ranges}")
+        sinks.append(index)
+    if args.jsonl:
+        # keep the blocks written by the runs that filled the index
+        sinks.append(JsonlBlockSink(args.jsonl, append=resuming))
+    if args.columnar:
+        sinks.append(ColumnarTransactionSink(args.columnar, append=resuming))
+    # processed_blocks.json needs every block in memory, only write it when no streaming output was asked for
+    retain_blocks = not args.summary_only and not sinks
+
+    indexer = EthBlockIndexer(retain_blocks)
+    try:
+        for first, last in height_ranges:
+            if args.workers > 1:
+                range_indexer = EthBlockIndexer.index_parallel(
+                    data_dir,
+                    first,
+                    last,
+                    args.workers,
+                    args.chunk_size,
+                    retain_blocks,
+                    sinks,
+                    recover_senders,
+                    bool(args.index),
+                )
+            else:
+                range_indexer = index_height_range(
+                    data_dir, first, last, retain_blocks, sinks, recover_senders, bool(args.index)
+                )
+            # already written to the sinks, the indexer without sinks only collects stats and retained blocks
+            indexer.merge(range_indexer)
+    finally:
+        for sink in sinks:
+            sink.close()
     print(indexer.summarize_blocks())
-    indexer.save_to_json(f"{data_dir}/processed_blocks.json")
+    if retain_blocks:
+        indexer.save_to_json(f"{data_dir}/processed_blocks.json")
@@ -0,0 +1,56 @@
+import argparse
+
+from replica_cmds import ActionIndexer, IndexedAction, batch_filenames, scan_parallel
+
+# user to action type to number of actions, plus the usdc each user sent with usdSend
+ActionCounts = dict[str, dict[str, int]]
+Summary = tuple[ActionCounts, dict[str, float]]
+
+
+def scan_actions(filename: str) -> Summary:
+    counts: ActionCounts = {}
+    usd_sent: dict[str, float] = {}
+
+    def count(indexed: IndexedAction) -> None:
+        type_to_count = counts.setdefault(indexed.signer, {})
+        type_to_count[indexed.action["type"]] = type_to_count.get(indexed.action["type"], 0) + 1
+
+    def on_usd_send(indexed: IndexedAction) -> None:
+        usd_sent[indexed.signer] = usd_sent.get(indexed.signer, 0) + float(indexed.action["amount"])
+
+    indexer = ActionIndexer()
+    for action_type in ["order", "cancel", "cancelByCloid", "usdSend", "spotSend", "withdraw3"]:
+        indexer.register(action_type, count)
+    # the signer is recovered once and shared by both handlers
+    indexer.register("usdSend", on_usd_send)
+    indexer.index_file(filename)
+    return counts, usd_sent
+
+
+def merge_summaries(total: Summary, part: Summary) -> Summary:
+    for user, type_to_count in part[0].items():
+        total_type_to_count = total[0].setdefault(user, {})
+        for action_type, count in type_to_count.items():
+            total_type_to_count[action_type] = total_type_to_count.get(action_type, 0) + count
+    for user, amount in part[1].items():
+        total[1][user] = total[1].get(user, 0) + amount
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="count orders, cancels and transfers per signer in replica cmds")
+    parser.add_argument("--data-dir", type=str, required=True)
+    parser.add_argument("--start-height", type=int, required=True)
+    parser.add_argument("--end-height", type=int, required=True)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the number of CPUs")
+    args = parser.parse_args()
+
+    flns = batch_filenames(args.data_dir, args.start_height, args.end_height)
+    counts, usd_sent = scan_parallel(flns, scan_actions, merge_summaries, lambda: ({}, {}), args.workers)
+
+    print("signer to action type to count", counts)
+    print("user to usdc sent", usd_sent)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,35 @@
 import argparse
-import json
-import os
-from collections import defaultdict
 
-import lz4.frame
+from replica_cmds import ActionIndexer, IndexedAction, batch_filenames, scan_parallel
 
-from hyperliquid.utils.signing import TOKEN_DELEGATE_TYPES, recover_user_from_user_signed_action
+UserToValidatorToAmount = dict[str, dict[str, float]]
 
-REPLICA_CMD_BATCH_SIZE = 10000
 
+def scan_token_delegates(filename: str) -> UserToValidatorToAmount:
+    user_to_validator_to_amount: UserToValidatorToAmount = {}
 
-def decompress_lz4(input_file, output_file):
-    with open(input_file, "rb") as f_in:
-        compressed_data = f_in.read()
+    def on_token_delegate(indexed: IndexedAction) -> None:
+        action = indexed.action
+        validator = action["validator"]
+        wei = action["wei"]
+        if action["isUndelegate"]:
+            wei = -wei
+        validator_to_amount = user_to_validator_to_amount.setdefault(indexed.signer, {})
+        # native token wei decimals
+        validator_to_amount[validator] = validator_to_amount.get(validator, 0) + wei / 100_000_000
 
-    decompressed_data = lz4.frame.decompress(compressed_data)
+    indexer = ActionIndexer()
+    indexer.register("tokenDelegate", on_token_delegate)
+    indexer.index_file(filename)
+    return user_to_validator_to_amount
 
-    with open(output_file, "wb") as f_out:
-        f_out.write(decompressed_data)
+
+def merge_amounts(total: UserToValidatorToAmount, part: UserToValidatorToAmount) -> UserToValidatorToAmount:
+    for user, validator_to_amount in part.items():
+        total_validator_to_amount = total.setdefault(user, {})
+        for validator, amount in validator_to_amount.items():
+            total_validator_to_amount[validator] = total_validator_to_amount.get(validator, 0) + amount
+    return total
 
 
 def main():
@@ -25,56 +37,11 @@ def main():
     parser.add_argument("--data-dir", type=str, required=True)
     parser.add_argument("--start-height", type=int, required=True)
     parser.add_argument("--end-height", type=int, required=True)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the number of CPUs")
     args = parser.parse_args()
 
-    data_dir = args.data_dir
-    start_height = args.start_height
-    end_height = args.end_height
-
-    if start_height % REPLICA_CMD_BATCH_SIZE == 0:
-        raise Exception("start height is not aligned with replica cmd batch size")
-    if end_height % REPLICA_CMD_BATCH_SIZE == 0:
-        raise Exception("end height is not aligned with replica cmd batch size")
-
-    flns = []
-    for height in range(start_height, end_height, REPLICA_CMD_BATCH_SIZE):
-        lz4_fln = f"{data_dir}/{height}.lz4"
-        if not os.path.exists(lz4_fln):
-            raise Exception(
-                f"replica cmds file at {height} not found - download missing block files(s) using 'aws s3 cp s3://hl-[testnet | mainnet]-replica-cmds/<block_object_path> --request-payer requester'"
-            )
-        fln = f"{data_dir}/{height}"
-        decompress_lz4(lz4_fln, fln)
-        flns.append(fln)
-
-    user_to_validator_to_amount: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-
-    for fln in flns:
-        f = open(fln)
-        lines = f.readlines()
-        for line in lines:
-            if "tokenDelegate" not in line:
-                continue
-            data = json.loads(line)
-            bundles = data["abci_block"]["signed_action_bundles"]
-            for bundle in bundles:
-                for signed_action in bundle[1]["signed_actions"]:
-                    action = signed_action["action"]
-                    if action["type"] != "tokenDelegate":
-                        continue
-                    validator = action["validator"]
-                    wei = action["wei"]
-                    is_delegate = not action["isUndelegate"]
-                    user = recover_user_from_user_signed_action(
-                        action,
-                        signed_action["signature"],
-                        TOKEN_DELEGATE_TYPES,
-                        "HyperliquidTransaction:TokenDelegate",
-                        True,
-                    )
-                    if not is_delegate:
-                        wei = -wei
-                    user_to_validator_to_amount[user][validator] += wei / 100_000_000  # native token wei decimals
+    flns = batch_filenames(args.data_dir, args.start_height, args.end_height)
+    user_to_validator_to_amount = scan_parallel(flns, scan_token_delegates, merge_amounts, dict, args.workers)
 
     print("user to validator to wei amount delegated", user_to_validator_to_amount)
 
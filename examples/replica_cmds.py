@@ -0,0 +1,140 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import lz4.frame
+
+from hyperliquid.utils.recovery import SignerCache, recover_signers
+
+REPLICA_CMD_BATCH_SIZE = 10000
+
+T = TypeVar("T")
+
+
+def batch_filenames(data_dir: str, start_height: int, end_height: int) -> list[str]:
+    # The replica cmds files of the heights in [start_height, end_height), one per batch of REPLICA_CMD_BATCH_SIZE
+    if start_height % REPLICA_CMD_BATCH_SIZE == 0:
+        raise Exception("start height is not aligned with replica cmd batch size")
+    if end_height % REPLICA_CMD_BATCH_SIZE == 0:
+        raise Exception("end height is not aligned with replica cmd batch size")
+
+    filenames = []
+    for height in range(start_height, end_height, REPLICA_CMD_BATCH_SIZE):
+        lz4_fln = f"{data_dir}/{height}.lz4"
+        if not os.path.exists(lz4_fln):
+            raise Exception(
+                f"replica cmds file at {height} not found - download missing block files(s) using 'aws s3 cp s3://hl-[testnet | mainnet]-replica-cmds/<block_object_path> --request-payer requester'"
+            )
+        filenames.append(lz4_fln)
+    return filenames
+
+
+def iter_lines(filename: str) -> Iterator[bytes]:
+    # Stream the lines of a replica cmds file straight from the lz4 decompressor, one block per line, so only the
+    # line being read is held in memory
+    opener = lz4.frame.open if filename.endswith(".lz4") else open
+    with opener(filename, "rb") as f:
+        yield from f
+
+
+def iter_blocks(filename: str, needles: Optional[Iterable[bytes]] = None) -> Iterator[Any]:
+    # Parse the blocks of a replica cmds file. With needles, only lines containing one of them are parsed: json.loads
+    # dominates the cost of a scan and most blocks don't contain the actions being looked for.
+    needles = tuple(needles) if needles is not None else None
+    for line in iter_lines(filename):
+        if needles is not None and not any(needle in line for needle in needles):
+            continue
+        yield json.loads(line)
+
+
+def iter_signed_actions(block: Any) -> Iterator[Any]:
+    for bundle in block["abci_block"]["signed_action_bundles"]:
+        yield from bundle[1]["signed_actions"]
+
+
+def scan_parallel(
+    filenames: list[str],
+    scan_file: Callable[[str], T],
+    merge: Callable[[T, T], T],
+    empty: Callable[[], T],
+    workers: Optional[int] = None,
+) -> T:
+    # Run scan_file over every file on a pool of worker processes and fold the per-file results with merge, in file
+    # order, starting from empty(). scan_file has to be a module level function so the workers can unpickle it.
+    result = empty()
+    if workers == 1:
+        for filename in filenames:
+            result = merge(result, scan_file(filename))
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_result in executor.map(scan_file, filenames):
+            result = merge(result, file_result)
+    return result
+
+
+# signers recovered by this process, replayed actions are common in replica cmds
+SIGNER_CACHE = SignerCache()
+
+
+def recover_signer(signed_action: Any, is_mainnet: bool = True) -> str:
+    # The user for user signed actions, the user or its agent wallet for L1 actions
+    return recover_signers([signed_action], is_mainnet, cache=SIGNER_CACHE)[0]
+
+
+class IndexedAction:
+    """A signed action of a block, as passed to the handlers of an ActionIndexer.
+
+    The signer is only recovered when a handler first asks for it, and then shared by every handler of the action.
+    """
+
+    __slots__ = ("block", "signed_action", "action", "is_mainnet", "_signer")
+
+    def __init__(self, block: Any, signed_action: Any, is_mainnet: bool):
+        self.block = block
+        self.signed_action = signed_action
+        self.action = signed_action["action"]
+        self.is_mainnet = is_mainnet
+        self._signer: Optional[str] = None
+
+    @property
+    def signer(self) -> str:
+        if self._signer is None:
+            self._signer = recover_signer(self.signed_action, self.is_mainnet)
+        return self._signer
+
+
+Handler = Callable[[IndexedAction], None]
+
+
+class ActionIndexer:
+    """Dispatches the signed actions of replica cmds blocks to handlers registered by action type.
+
+    A file is read and each block parsed once however many action types are indexed, and only lines mentioning one of
+    the registered types are parsed at all. To index in parallel, build the indexer and its handlers inside the
+    scan_file function passed to scan_parallel and return their results.
+    """
+
+    def __init__(self, is_mainnet: bool = True):
+        self.is_mainnet = is_mainnet
+        self.handlers: Dict[str, List[Handler]] = {}
+
+    def register(self, action_type: str, handler: Handler) -> None:
+        self.handlers.setdefault(action_type, []).append(handler)
+
+    def needles(self) -> List[bytes]:
+        return [f'"{action_type}"'.encode() for action_type in self.handlers]
+
+    def index_block(self, block: Any) -> None:
+        for signed_action in iter_signed_actions(block):
+            handlers = self.handlers.get(signed_action["action"]["type"])
+            if handlers is None:
+                continue
+            indexed = IndexedAction(block, signed_action, self.is_mainnet)
+            for handler in handlers:
+                handler(indexed)
+
+    def index_file(self, filename: str) -> None:
+        for block in iter_blocks(filename, self.needles()):
+            self.index_block(block)
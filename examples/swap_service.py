@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Set
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.info import Info
+
+# Seconds to wait between the two legs of a swap, for the proceeds of the first one to settle
+SECOND_TRADE_DELAY = 1.0
+SLIPPAGE = 0.01
+MAKER_FEE = 0.0004
+TAKER_FEE = 0.0007
+
+COIN_NAMES = {
+    "@107": "HYPE",
+    "@160": "BUDDY",
+    "@142": "UBTC",
+    "@166": "USDT0",
+    "PURR/USDC": "PURR",
+}
+
+
+class SwapError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def round_size(size, sz_decimals, coin):
+    if sz_decimals[coin] == 0:
+        return int(size)
+    return round(size, sz_decimals[coin])
+
+
+def round_price(price, sz_decimals, coin):
+    if price > 100_000:
+        return int(price)
+    # If not we round px to 5 significant figures and max_decimals - szDecimals decimals
+    else:
+        return round(float(f"{price:.5g}"), 8 - sz_decimals[coin])
+
+
+def get_coin_name(coin_id):
+    return COIN_NAMES.get(coin_id, coin_id)
+
+
+def sz_decimals_from_spot_meta(spot_meta: Any) -> Dict[str, int]:
+    sz_decimals = {token["name"]: token["szDecimals"] for token in spot_meta["tokens"]}
+    if any(pair["name"] == "PURR/USDC" for pair in spot_meta["universe"]):
+        sz_decimals["PURR/USDC"] = 0
+    return sz_decimals
+
+
+class SpotPairs(NamedTuple):
+    # the listed spot pairs and the szDecimals of their tokens, from the same spot meta
+    names: Set[str]
+    sz_decimals: Dict[str, int]
+
+
+def spot_pairs_from_spot_meta(spot_meta: Any) -> SpotPairs:
+    return SpotPairs({pair["name"] for pair in spot_meta["universe"]}, sz_decimals_from_spot_meta(spot_meta))
+
+
+class SwapClients:
+    """The Info and Exchange of the swap service, created once and shared by every request.
+
+    Spot metadata is fetched at startup and mids are kept up to date by the allMids websocket subscription, so a swap
+    only sends its two orders. The metadata is fetched again in the background, once at a time, when mids show a pair
+    that wasn't listed yet and hasn't already been looked for. Swaps are run one at a time: they trade the balances of
+    the same account and nonces are timestamps, which concurrent orders could reuse.
+    """
+
+    def __init__(self, address: str, info: Info, exchange: Exchange):
+        self.address = address
+        self.info = info
+        self.exchange = exchange
+        self.swap_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_in_flight = False
+        # unlisted pairs seen in mids that a refresh already looked for, so they don't trigger one on every update
+        self._looked_for: Set[str] = set()
+        self.refresh_meta()
+        self.mids: Dict[str, str] = self.info.all_mids()
+        if self.info.ws_manager is not None:
+            self.info.subscribe({"type": "allMids"}, self._on_mids)
+        # open the connection used to send orders now rather than on the first swap, and keep it from idling out
+        self.exchange.warmup()
+        self.exchange.start_keepalive(30)
+
+    def refresh_meta(self) -> None:
+        spot_meta = self.info.spot_meta()
+        # exchange.market_open looks coins up in the maps its own Info built at startup, so newly listed pairs are
+        # added to them before swaps can validate against the pairs
+        self.info.set_spot_meta(spot_meta)
+        if self.exchange.info is not self.info:
+            self.exchange.info.set_spot_meta(spot_meta)
+        # a single assignment, a swap reading self.spot_pairs never sees pairs and szDecimals of different metas
+        self.spot_pairs = spot_pairs_from_spot_meta(spot_meta)
+
+    def _on_mids(self, ws_msg: Any) -> None:
+        mids = ws_msg["data"]["mids"]
+        # replaced rather than updated, a swap reading self.mids never sees a half applied update
+        self.mids = mids
+        listed = self.spot_pairs.names
+        if not any(coin.startswith("@") and coin not in listed and coin not in self._looked_for for coin in mids):
+            return
+        with self._refresh_lock:
+            if self._refresh_in_flight:
+                return
+            self._refresh_in_flight = True
+            self._looked_for.update(coin for coin in mids if coin.startswith("@") and coin not in listed)
+        threading.Thread(target=self._refresh_meta_in_background, daemon=True).start()
+
+    def _refresh_meta_in_background(self) -> None:
+        try:
+            self.refresh_meta()
+        except Exception:
+            logging.exception("Failed to refresh spot meta")
+        finally:
+            with self._refresh_lock:
+                self._refresh_in_flight = False
+
+    def close(self) -> None:
+        self.exchange.stop_keepalive()
+        if self.info.ws_manager is not None:
+            self.info.disconnect_websocket()
+
+
+def filled_status(order_result: Any, leg: str) -> Any:
+    if order_result["status"] != "ok":
+        raise SwapError(400, f"Error in {leg} trade: {order_result}")
+    filled = None
+    for status in order_result["response"]["data"]["statuses"]:
+        if "filled" in status:
+            filled = status["filled"]
+            logging.debug("Order #%s filled %s @%s", filled["oid"], filled["totalSz"], filled["avgPx"])
+        elif "error" in status:
+            raise SwapError(400, f'{leg.capitalize()} trade error: {status["error"]}')
+    if not filled:
+        raise SwapError(400, f"No fills in {leg} trade")
+    return filled
+
+
+def swap(
+    clients: SwapClients,
+    amount: float,
+    from_coin: str,
+    to_coin: str,
+    second_trade_delay: float = SECOND_TRADE_DELAY,
+) -> Dict[str, Any]:
+    logging.debug("Starting swap - Amount: %s, From: %s, To: %s", amount, from_coin, to_coin)
+    with clients.swap_lock:
+        sz_decimals = clients.spot_pairs.sz_decimals
+        from_coin_name = get_coin_name(from_coin)
+        to_coin_name = get_coin_name(to_coin)
+
+        initial_size = round_size(amount, sz_decimals, from_coin_name)
+        mids = clients.mids
+        from_price = float(mids.get(from_coin, 0))
+        to_price = float(mids.get(to_coin, 0))
+        if from_price == 0 or to_price == 0:
+            raise SwapError(
+                400, f"Could not get prices for one or both tokens. {from_coin}: {from_price}, {to_coin}: {to_price}"
+            )
+
+        # Execute first trade (sell from_coin), at the cached mid instead of fetching all mids again
+        order_result = clients.exchange.market_open(from_coin, False, initial_size, from_price, SLIPPAGE)
+        filled = filled_status(order_result, "first")
+        filled_size = float(filled["totalSz"])
+        filled_price = float(filled["avgPx"])
+
+        # The websocket has kept the mids current while the first trade was sent
+        current_to_price = float(clients.mids.get(to_coin, 0))
+        if current_to_price == 0:
+            raise SwapError(400, f"Could not get current price for {to_coin}")
+
+        output_size = (filled_size * filled_price) / current_to_price
+        rounded_output = round_size(output_size, sz_decimals, to_coin_name)
+        if rounded_output <= 0:
+            raise SwapError(400, f"Invalid output size {rounded_output}")
+
+        if second_trade_delay:
+            time.sleep(second_trade_delay)
+
+        # Second trade (buy to_coin)
+        order_result2 = clients.exchange.market_open(to_coin, True, rounded_output, current_to_price, SLIPPAGE)
+        filled2 = filled_status(order_result2, "second")
+
+    final_amount = float(filled2["totalSz"]) * (1 - TAKER_FEE)
+    return {
+        "status": "success",
+        "from_coin": from_coin,
+        "to_coin": to_coin,
+        "from_amount": filled["totalSz"],
+        "to_amount": final_amount,
+        "from_price": filled["avgPx"],
+        "to_price": filled2["avgPx"],
+        "fees_paid": {"maker_fee": f"{MAKER_FEE * 100}%", "taker_fee": f"{TAKER_FEE * 100}%"},
+        "order_ids": [filled["oid"], filled2["oid"]],
+    }
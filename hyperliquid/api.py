@@ -1,31 +1,198 @@
 import json
 import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from json import JSONDecodeError
 
 import requests
 
+from hyperliquid.utils.codec import DEFAULT_CODEC, Codec
 from hyperliquid.utils.constants import MAINNET_API_URL
-from hyperliquid.utils.error import ClientError, ServerError
-from hyperliquid.utils.types import Any
+from hyperliquid.utils.endpoints import EndpointPool
+from hyperliquid.utils.error import CircuitOpenError, ClientError, ServerError
+from hyperliquid.utils.http import ConnectionPolicy
+from hyperliquid.utils.rate_limit import RateLimiter, request_priority, request_weight
+from hyperliquid.utils.retry import CircuitBreaker, RetryPolicy, is_idempotent
+from hyperliquid.utils.types import Any, Dict, Optional, Tuple, Union
+
+# Cheap request used to open and keep connections alive
+KEEPALIVE_PAYLOAD = {"type": "exchangeStatus"}
+
+# Failures that say nothing about the request itself and may succeed when retried
+RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, ServerError)
 
 
 class API:
-    def __init__(self, base_url=None):
-        self.base_url = base_url or MAINNET_API_URL
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        codec: Optional[Codec] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        # seconds, or a (connect, read) tuple. None waits forever.
+        timeout: Optional[Union[float, Tuple[float, float]]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        # With an endpoint_pool, each endpoint gets a breaker of its own with the same settings
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        # Routes each request to the best endpoint of the pool instead of base_url
+        endpoint_pool: Optional[EndpointPool] = None,
+        # Connection pool size, socket options, warmup and keep-alive pings of the session
+        connection_policy: Optional[ConnectionPolicy] = None,
+    ):
+        self.endpoint_pool = endpoint_pool
+        self.base_url = base_url or (endpoint_pool.best() if endpoint_pool is not None else MAINNET_API_URL)
+        self.codec = codec or DEFAULT_CODEC
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.endpoint_circuit_breakers: Dict[str, CircuitBreaker] = {}
+        if circuit_breaker is not None and endpoint_pool is not None:
+            self.endpoint_circuit_breakers = {
+                endpoint.url: CircuitBreaker(circuit_breaker.failure_threshold, circuit_breaker.reset_timeout)
+                for endpoint in endpoint_pool.endpoints
+            }
         self.session = requests.Session()
         self.session.headers.update({"Content-Type": "application/json"})
         self._logger = logging.getLogger(__name__)
+        self.connection_policy = connection_policy
+        self._last_request = time.monotonic()
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread: Optional[threading.Thread] = None
+        if connection_policy is not None:
+            connection_policy.mount(self.session)
+            if connection_policy.warmup_connections:
+                self.warmup(connection_policy.warmup_connections)
+            if connection_policy.keepalive_interval:
+                self.start_keepalive(connection_policy.keepalive_interval)
+
+    def _ping(self) -> bool:
+        base_url = self.base_url if self.endpoint_pool is None else self.endpoint_pool.best()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(request_weight("/info", KEEPALIVE_PAYLOAD))
+        self._last_request = time.monotonic()
+        try:
+            response = self.session.post(
+                base_url + "/info", data=self.codec.dumps(KEEPALIVE_PAYLOAD), timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            self._logger.debug(f"Keep-alive request to {base_url} failed: {e!r}")
+            return False
+        return response.status_code < 400
+
+    def warmup(self, connections: int = 1) -> int:
+        """Open up to connections pooled connections ahead of time by sending concurrent cheap requests.
+
+        Returns how many of the requests succeeded. At most connection_policy.pool_maxsize connections stay pooled.
+        """
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(lambda _: self._ping(), range(connections)))
+
+    def start_keepalive(self, interval: float) -> None:
+        """Send a cheap request from a background thread whenever no request was sent for interval seconds.
+
+        The thread runs until stop_keepalive() is called or, since it only holds a weak reference to this API, until
+        the API is garbage collected, which it notices within interval seconds.
+        """
+        if self._keepalive_thread is not None:
+            return
+        self._keepalive_stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=_keepalive_forever, args=(weakref.ref(self), self._keepalive_stop, interval), daemon=True
+        )
+        self._keepalive_thread.start()
+
+    def stop_keepalive(self) -> None:
+        self._keepalive_stop.set()
+        if self._keepalive_thread is not None:
+            self._keepalive_thread.join()
+            self._keepalive_thread = None
 
     def post(self, url_path: str, payload: Any = None) -> Any:
+        """POST payload to url_path and return the decoded JSON response.
+
+        payload may also be bytes that were already encoded as JSON, which are sent as is.
+
+        With a retry_policy, /info requests and exchange actions that are idempotent by cloid are retried after
+        connection errors, timeouts and 5xx responses. With an endpoint_pool the failed endpoint is marked unhealthy,
+        so the next attempt or request fails over to another one, and idempotent requests get at least one attempt
+        per endpoint.
+        """
         payload = payload or {}
-        url = self.base_url + url_path
-        response = self.session.post(url, json=payload)
+        data = payload if isinstance(payload, (bytes, bytearray)) else self.codec.dumps(payload)
+        attempts = 1
+        if is_idempotent(url_path, payload):
+            if self.retry_policy is not None:
+                attempts = self.retry_policy.max_attempts
+            if self.endpoint_pool is not None:
+                attempts = max(attempts, len(self.endpoint_pool))
+        for attempt in range(attempts):
+            try:
+                return self._post_once(url_path, payload, data)
+            except RETRYABLE_EXCEPTIONS as e:
+                if attempt + 1 == attempts:
+                    raise
+                backoff = 0.0 if self.retry_policy is None else self.retry_policy.backoff(attempt)
+                self._logger.debug(f"Retrying {url_path} in {backoff:.3f}s after {e!r}")
+                time.sleep(backoff)
+
+    def _post_once(self, url_path: str, payload: Any, data: Union[bytes, bytearray]) -> Any:
+        # Acquired first, so a fail-fast limiter can't raise while the circuit breaker's trial request is pending
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(request_weight(url_path, payload), request_priority(url_path, payload))
+        base_url, breaker = self._choose_endpoint()
+        self._last_request = time.monotonic()
+        try:
+            response = self.session.post(base_url + url_path, data=data, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            self._record_failure(base_url, breaker)
+            raise
+        except BaseException:
+            # Not a sign of an unhealthy endpoint, but a pending trial must not hold the circuit open for good
+            if breaker is not None:
+                breaker.release_trial()
+            raise
+        if response.status_code >= 500:
+            self._record_failure(base_url, breaker)
+        elif breaker is not None:
+            breaker.record_success()
         self._handle_exception(response)
         try:
-            return response.json()
+            return self.codec.loads(response.content)
         except ValueError:
             return {"error": f"Could not parse JSON: {response.text}"}
 
+    def _choose_endpoint(self) -> Tuple[str, Optional[CircuitBreaker]]:
+        # The base url to send a request to and its circuit breaker, whose before_request has let the request through.
+        # With an endpoint pool, endpoints whose circuit is open are skipped, and CircuitOpenError is only raised once
+        # every circuit is open.
+        if self.endpoint_pool is None:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            return self.base_url, self.circuit_breaker
+        candidates = self.endpoint_pool.candidates()
+        if not self.endpoint_circuit_breakers:
+            return candidates[0], None
+        error: Optional[CircuitOpenError] = None
+        for base_url in candidates:
+            breaker = self.endpoint_circuit_breakers[base_url]
+            try:
+                breaker.before_request()
+            except CircuitOpenError as e:
+                if error is None or e.retry_after < error.retry_after:
+                    error = e
+                continue
+            return base_url, breaker
+        assert error is not None
+        raise error
+
+    def _record_failure(self, base_url: str, breaker: Optional[CircuitBreaker]) -> None:
+        if breaker is not None:
+            breaker.record_failure()
+        if self.endpoint_pool is not None:
+            self.endpoint_pool.record_failure(base_url)
+
     def _handle_exception(self, response):
         status_code = response.status_code
         if status_code < 400:
@@ -40,3 +207,18 @@ class API:
             error_data = err.get("data")
             raise ClientError(status_code, err["code"], err["msg"], response.headers, error_data)
         raise ServerError(status_code, response.text)
+
+
+def _keepalive_forever(api_ref: "weakref.ref[API]", stop: threading.Event, interval: float) -> None:
+    while True:
+        api = api_ref()
+        if api is None:
+            return
+        wait = api._last_request + interval - time.monotonic()
+        if wait <= 0:
+            api._ping()
+            wait = interval
+        # not held while waiting, so the API can be collected
+        del api
+        if stop.wait(wait):
+            return
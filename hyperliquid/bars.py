@@ -0,0 +1,185 @@
+from array import array
+
+from hyperliquid.utils.messages import Trades
+from hyperliquid.utils.types import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Tuple
+
+BarKind = Literal["time", "volume", "tick"]
+
+
+class BarSpec(NamedTuple):
+    # "time" bars span size milliseconds, "volume" bars hold size of traded base volume and "tick" bars size trades
+    kind: BarKind
+    size: float
+
+
+class Bar(NamedTuple):
+    # open time of the bar, the time of its first trade for volume and tick bars
+    t: int
+    o: float
+    h: float
+    l: float  # noqa: E741
+    c: float
+    v: float
+    n: int
+
+
+class BarRing:
+    """The last capacity closed bars of one coin and spec in preallocated arrays, plus the bar being built.
+
+    Bars are stored column-wise in a ring: index -1 is the last closed bar, -len(ring) the oldest one kept.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.t = array("q", bytes(8 * capacity))
+        self.o = array("d", bytes(8 * capacity))
+        self.h = array("d", bytes(8 * capacity))
+        self.l = array("d", bytes(8 * capacity))  # noqa: E741
+        self.c = array("d", bytes(8 * capacity))
+        self.v = array("d", bytes(8 * capacity))
+        self.n = array("q", bytes(8 * capacity))
+        # total number of bars closed so far
+        self.closed = 0
+        self.is_open = False
+        self.open_t = 0
+        self.open_o = self.open_h = self.open_l = self.open_c = self.open_v = 0.0
+        self.open_n = 0
+        # time bar trades dropped because the bar of their period had already been opened or closed, see BarBuilder
+        self.late_dropped = 0
+
+    def __len__(self) -> int:
+        return min(self.closed, self.capacity)
+
+    def __getitem__(self, index: int) -> Bar:
+        if not -len(self) <= index < len(self):
+            raise IndexError("bar index out of range")
+        i = (self.closed + index if index < 0 else self.closed - len(self) + index) % self.capacity
+        return Bar(self.t[i], self.o[i], self.h[i], self.l[i], self.c[i], self.v[i], self.n[i])
+
+    def bars(self) -> List[Bar]:
+        return [self[i] for i in range(len(self))]
+
+    def current(self) -> Optional[Bar]:
+        """The bar being built, if it has any trades."""
+        if not self.is_open:
+            return None
+        return Bar(self.open_t, self.open_o, self.open_h, self.open_l, self.open_c, self.open_v, self.open_n)
+
+    def add(self, t: int, px: float, sz: float, n: int = 1) -> None:
+        if not self.is_open:
+            self.is_open = True
+            self.open_t = t
+            self.open_o = self.open_h = self.open_l = px
+            self.open_v = 0.0
+            self.open_n = 0
+        elif px > self.open_h:
+            self.open_h = px
+        elif px < self.open_l:
+            self.open_l = px
+        self.open_c = px
+        self.open_v += sz
+        self.open_n += n
+
+    def close(self) -> Bar:
+        i = self.closed % self.capacity
+        self.t[i] = self.open_t
+        self.o[i] = self.open_o
+        self.h[i] = self.open_h
+        self.l[i] = self.open_l
+        self.c[i] = self.open_c
+        self.v[i] = self.open_v
+        self.n[i] = self.open_n
+        self.closed += 1
+        self.is_open = False
+        return self[-1]
+
+
+BarCallback = Callable[[str, BarSpec, Bar], None]
+
+
+class BarBuilder:
+    """Builds OHLCV bars of several specs for many coins from the trades channel.
+
+    Pass on_trades as the callback of trades subscriptions, for any number of coins. It accepts raw messages as well
+    as the Trades objects of Info(decode_ws_msgs=True). on_bar is called from the websocket thread whenever a bar
+    closes. Closed bars are kept in a BarRing per coin and spec of history bars, allocated when a coin trades for
+    the first time, and trades are folded into the open bar without allocating.
+
+    Time bars close when the first trade after their end arrives, or when flush is called with a later time. Periods
+    without trades produce no bars. A trade arriving after a later time bar was opened belongs to a period whose bar is
+    already closed (or was never built), so it is dropped and counted in late_dropped of the BarRing rather than
+    opening an earlier bar or changing a later one. A trade that overflows a volume bar is split across as many bars as
+    it fills, and is only counted in n of the first one.
+    """
+
+    def __init__(self, specs: List[BarSpec], on_bar: Optional[BarCallback] = None, history: int = 1024):
+        for spec in specs:
+            if spec.size <= 0:
+                raise ValueError(f"Bar size must be positive, got {spec}")
+        self.specs = specs
+        self.on_bar = on_bar
+        self.history = history
+        self.rings: Dict[str, List[Tuple[BarSpec, BarRing]]] = {}
+
+    def bars(self, coin: str, spec: BarSpec) -> BarRing:
+        for ring_spec, ring in self._rings(coin):
+            if ring_spec == spec:
+                return ring
+        raise KeyError(f"{spec} is not built by this BarBuilder")
+
+    def _rings(self, coin: str) -> List[Tuple[BarSpec, BarRing]]:
+        rings = self.rings.get(coin)
+        if rings is None:
+            rings = self.rings[coin] = [(spec, BarRing(self.history)) for spec in self.specs]
+        return rings
+
+    def on_trades(self, ws_msg: Any) -> None:
+        if isinstance(ws_msg, Trades):
+            for trade in ws_msg.trades:
+                self.add_trade(trade.coin, trade.px, trade.sz, trade.time)
+        else:
+            for trade in ws_msg["data"]:
+                self.add_trade(trade["coin"], float(trade["px"]), float(trade["sz"]), trade["time"])
+
+    def add_trade(self, coin: str, px: float, sz: float, time: int) -> None:
+        for spec, ring in self._rings(coin):
+            kind, size = spec
+            if kind == "time":
+                start = time - time % int(size)
+                if ring.is_open:
+                    late = start < ring.open_t
+                else:
+                    late = ring.closed != 0 and start <= ring[-1].t
+                if late:
+                    ring.late_dropped += 1
+                    continue
+                if ring.is_open and start != ring.open_t:
+                    self._close(coin, spec, ring)
+                ring.add(start, px, sz)
+            elif kind == "tick":
+                ring.add(time, px, sz)
+                if ring.open_n >= size:
+                    self._close(coin, spec, ring)
+            else:
+                room = size - ring.open_v if ring.is_open else size
+                n = 1
+                while sz >= room:
+                    ring.add(time, px, room, n)
+                    self._close(coin, spec, ring)
+                    sz -= room
+                    room = size
+                    n = 0
+                if sz > 0:
+                    ring.add(time, px, sz, n)
+
+    def flush(self, now: int) -> None:
+        """Close the open time bars that ended before now, a time in milliseconds."""
+        for coin, rings in self.rings.items():
+            for spec, ring in rings:
+                if spec.kind == "time" and ring.is_open and now >= ring.open_t + spec.size:
+                    self._close(coin, spec, ring)
+
+    def _close(self, coin: str, spec: BarSpec, ring: BarRing) -> None:
+        bar = ring.close()
+        if self.on_bar is not None:
+            self.on_bar(coin, spec, bar)
@@ -0,0 +1,280 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import quote
+
+from hyperliquid.info import Info
+from hyperliquid.utils.pagination import CANDLES_PAGE_LIMIT
+from hyperliquid.utils.types import Any, Dict, List, Optional, Subscription, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "hyperliquid.candle_store requires numpy, install it with pip install hyperliquid-python-sdk[candles]"
+    ) from e
+
+MINUTE_MS = 60 * 1000
+INTERVAL_MS: Dict[str, int] = {
+    "1m": MINUTE_MS,
+    "3m": 3 * MINUTE_MS,
+    "5m": 5 * MINUTE_MS,
+    "15m": 15 * MINUTE_MS,
+    "30m": 30 * MINUTE_MS,
+    "1h": 60 * MINUTE_MS,
+    "2h": 2 * 60 * MINUTE_MS,
+    "4h": 4 * 60 * MINUTE_MS,
+    "8h": 8 * 60 * MINUTE_MS,
+    "12h": 12 * 60 * MINUTE_MS,
+    "1d": 24 * 60 * MINUTE_MS,
+    "3d": 3 * 24 * 60 * MINUTE_MS,
+    "1w": 7 * 24 * 60 * MINUTE_MS,
+    # months vary in length, only used to tell whether the last candle can still change
+    "1M": 31 * 24 * 60 * MINUTE_MS,
+}
+COLUMNS: Dict[str, Any] = {
+    "t": np.int64,
+    "o": np.float64,
+    "h": np.float64,
+    "l": np.float64,
+    "c": np.float64,
+    "v": np.float64,
+    "n": np.int64,
+}
+INITIAL_CAPACITY = 1024
+
+Range = Tuple[int, int]
+
+
+def _merge_ranges(ranges: List[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _missing_ranges(covered: List[Range], start: int, end: int) -> List[Range]:
+    missing: List[Range] = []
+    for covered_start, covered_end in covered:
+        if covered_end < start:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > start:
+            missing.append((start, covered_start - 1))
+        start = max(start, covered_end + 1)
+    if start <= end:
+        missing.append((start, end))
+    return missing
+
+
+class CandleSeries:
+    """Candles of one coin and interval, stored as one memory-mapped .npy file per column plus an index.json.
+
+    Rows are sorted by open time t and unique. The files are allocated with spare capacity and reallocated at double
+    the size when they fill up. index.json records the number of rows and the time ranges that were synced.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        index_path = os.path.join(path, "index.json")
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                index = json.load(f)
+            self.length: int = index["length"]
+            self.synced: List[Range] = [(start, end) for start, end in index["synced"]]
+            self.columns = self._open()
+        else:
+            self.length = 0
+            self.synced = []
+            self.columns = self._allocate(INITIAL_CAPACITY)
+            self.write_index()
+
+    @property
+    def capacity(self) -> int:
+        return len(self.columns["t"])
+
+    def _open(self) -> Dict[str, Any]:
+        return {name: np.lib.format.open_memmap(os.path.join(self.path, f"{name}.npy"), mode="r+") for name in COLUMNS}
+
+    def _allocate(self, capacity: int, suffix: str = "") -> Dict[str, Any]:
+        return {
+            name: np.lib.format.open_memmap(
+                os.path.join(self.path, f"{name}.npy{suffix}"), mode="w+", dtype=dtype, shape=(capacity,)
+            )
+            for name, dtype in COLUMNS.items()
+        }
+
+    def write_index(self) -> None:
+        for column in self.columns.values():
+            column.flush()
+        tmp_path = os.path.join(self.path, "index.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"length": self.length, "synced": self.synced}, f)
+        os.replace(tmp_path, os.path.join(self.path, "index.json"))
+
+    def _reserve(self, length: int) -> None:
+        if length <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < length:
+            capacity *= 2
+        columns = self._allocate(capacity, ".tmp")
+        for name, column in columns.items():
+            column[: self.length] = self.columns[name][: self.length]
+            column.flush()
+        # Windows can't replace a file that is still mapped, and np.memmap is only unmapped when its last reference
+        # is dropped, so both the old and the new mappings are released before the files are moved. Views handed out
+        # earlier keep the old mappings alive: that is fine on POSIX, on Windows they have to be released first.
+        del column
+        self.columns = {}
+        columns.clear()
+        for name in COLUMNS:
+            os.replace(os.path.join(self.path, f"{name}.npy.tmp"), os.path.join(self.path, f"{name}.npy"))
+        self.columns = self._open()
+
+    def write(self, rows: Dict[str, Any]) -> None:
+        """Insert rows, given as a dict of equal length column arrays sorted by t, replacing rows with the same t."""
+        if len(rows["t"]) == 0:
+            return
+        t = self.columns["t"][: self.length]
+        if self.length and len(rows["t"]) == 1 and rows["t"][0] == t[-1]:
+            # update of the latest candle, as sent by the candle channel until it closes
+            for name, column in self.columns.items():
+                column[self.length - 1] = rows[name][0]
+            return
+        if self.length == 0 or rows["t"][0] > t[-1]:
+            self._reserve(self.length + len(rows["t"]))
+            for name, column in self.columns.items():
+                column[self.length : self.length + len(rows["t"])] = rows[name]
+            self.length += len(rows["t"])
+            return
+        # Rows overlapping the stored ones: merge both, keeping the new row for duplicate open times
+        merged_t = np.concatenate([rows["t"], t])
+        unique_t, first = np.unique(merged_t, return_index=True)
+        self._reserve(len(unique_t))
+        merged = {
+            name: np.concatenate([rows[name], column[: self.length]])[first] for name, column in self.columns.items()
+        }
+        for name, column in self.columns.items():
+            column[: len(unique_t)] = merged[name]
+        self.length = len(unique_t)
+
+    def slice(self, start: int, end: int) -> Dict[str, Any]:
+        t = self.columns["t"][: self.length]
+        lo, hi = np.searchsorted(t, start, side="left"), np.searchsorted(t, end, side="right")
+        return {name: column[lo:hi] for name, column in self.columns.items()}
+
+
+class CandleStore:
+    """Local store of candles under root, synced incrementally from Info.candles_snapshot.
+
+    Each coin and interval gets its own CandleSeries. sync only downloads the parts of the requested range that
+    weren't synced before, and candles returns read-only views into the memory-mapped columns without copying.
+    Requires numpy.
+    """
+
+    def __init__(self, root: str, info: Optional[Info] = None):
+        self.root = root
+        self.info = info
+        self._series: Dict[Tuple[str, str], CandleSeries] = {}
+        self._lock = threading.Lock()
+        self._subscriptions: List[Tuple[Subscription, int]] = []
+
+    def series(self, coin: str, interval: str) -> CandleSeries:
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unknown candle interval {interval}")
+        with self._lock:
+            key = (coin, interval)
+            if key not in self._series:
+                self._series[key] = CandleSeries(os.path.join(self.root, quote(coin, safe=""), interval))
+            return self._series[key]
+
+    def sync(self, coin: str, interval: str, start: int, end: Optional[int] = None) -> int:
+        """Download the candles of coin between start and end (defaults to now) that aren't stored yet.
+
+        Returns the number of candles fetched. Candles that may still change, the ones opened less than an interval
+        before the time of the sync, are fetched again by the next sync.
+        """
+        if self.info is None:
+            raise RuntimeError("Cannot sync a CandleStore created without info")
+        series = self.series(coin, interval)
+        now = int(time.time() * 1000)
+        end = now if end is None else end
+        # Don't mark candles that haven't closed yet as synced
+        final_end = min(end, now - INTERVAL_MS[interval])
+        fetched = 0
+        with series.lock:
+            missing_ranges = _missing_ranges(series.synced, start, end)
+        # The requests are made without holding series.lock, which the websocket thread takes for live candles
+        for missing_start, missing_end in missing_ranges:
+            page: List[Any] = []
+            for candle in self.info.iter_candles(coin, interval, missing_start, missing_end):
+                page.append(candle)
+                if len(page) == CANDLES_PAGE_LIMIT:
+                    self._write_page(series, page)
+                    fetched += len(page)
+                    page = []
+            self._write_page(series, page)
+            fetched += len(page)
+            if missing_start <= final_end:
+                with series.lock:
+                    series.synced = _merge_ranges(series.synced + [(missing_start, min(missing_end, final_end))])
+        with series.lock:
+            series.write_index()
+        return fetched
+
+    def _write_page(self, series: CandleSeries, candles: List[Any]) -> None:
+        columns = self.to_columns(candles)
+        with series.lock:
+            series.write(columns)
+
+    def candles(self, coin: str, interval: str, start: int, end: int) -> Dict[str, Any]:
+        """Columns t, o, h, l, c, v and n of the stored candles opened between start and end, as array views."""
+        series = self.series(coin, interval)
+        with series.lock:
+            columns = series.slice(start, end)
+        for column in columns.values():
+            column.flags.writeable = False
+        return columns
+
+    @staticmethod
+    def to_columns(candles: List[Any]) -> Dict[str, Any]:
+        """Parse candles as returned by candles_snapshot or the candle channel into numpy columns sorted by t."""
+        candles = sorted(candles, key=lambda candle: candle["t"])
+        return {name: np.array([candle[name] for candle in candles], dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def follow(self, coin: str, interval: str) -> int:
+        """Append live updates of the candle websocket channel to the store. Returns the subscription id."""
+        if self.info is None:
+            raise RuntimeError("Cannot follow candles with a CandleStore created without info")
+        series = self.series(coin, interval)
+        subscription: Subscription = {"type": "candle", "coin": coin, "interval": interval}
+        subscription_id = self.info.subscribe(subscription, lambda ws_msg: self._on_candle(series, ws_msg["data"]))
+        self._subscriptions.append((subscription, subscription_id))
+        return subscription_id
+
+    @staticmethod
+    def _on_candle(series: CandleSeries, candle: Any) -> None:
+        with series.lock:
+            length = series.length
+            series.write(CandleStore.to_columns([candle]))
+            if series.length != length:
+                series.write_index()
+
+    def close(self) -> None:
+        """Stop following live candles and flush every series to disk."""
+        if self.info is not None:
+            for subscription, subscription_id in self._subscriptions:
+                self.info.unsubscribe(subscription, subscription_id)
+        self._subscriptions = []
+        with self._lock:
+            for series in self._series.values():
+                with series.lock:
+                    series.write_index()
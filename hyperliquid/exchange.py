@@ -8,6 +8,10 @@ from eth_account.signers.local import LocalAccount
 from hyperliquid.api import API
 from hyperliquid.info import Info
 from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.endpoints import EndpointPool
+from hyperliquid.utils.http import ConnectionPolicy
+from hyperliquid.utils.rate_limit import RateLimiter
+from hyperliquid.utils.retry import CircuitBreaker, RetryPolicy
 from hyperliquid.utils.signing import (
     CancelByCloidRequest,
     CancelRequest,
@@ -44,6 +48,7 @@ from hyperliquid.utils.types import (
     PerpDexSchemaInput,
     SpotMeta,
     Tuple,
+    Union,
 )
 
 
@@ -60,12 +65,46 @@ class Exchange(API):
         account_address: Optional[str] = None,
         spot_meta: Optional[SpotMeta] = None,
         perp_dexs: Optional[List[str]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        timeout: Optional[Union[float, Tuple[float, float]]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        endpoint_pool: Optional[EndpointPool] = None,
+        connection_policy: Optional[ConnectionPolicy] = None,
     ):
-        super().__init__(base_url)
+        # base_url picks the chain actions are signed for, the pool only picks where they are sent
+        if endpoint_pool is not None and base_url is None:
+            raise ValueError("Exchange needs a base_url with an endpoint_pool, it decides which chain to sign for")
+        super().__init__(
+            base_url,
+            rate_limiter=rate_limiter,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            endpoint_pool=endpoint_pool,
+            connection_policy=connection_policy,
+        )
+        self.is_mainnet = self.base_url == MAINNET_API_URL
         self.wallet = wallet
         self.vault_address = vault_address
         self.account_address = account_address
-        self.info = Info(base_url, True, meta, spot_meta, perp_dexs)
+        self.info = Info(
+            base_url,
+            True,
+            meta,
+            spot_meta,
+            perp_dexs,
+            rate_limiter=rate_limiter,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            endpoint_pool=endpoint_pool,
+        )
+        # connection_policy only applies to the session of this Exchange, whose pool info shares, so there is a single
+        # warmup and keep-alive thread
+        if connection_policy is not None:
+            self.info.session.close()
+            self.info.session = self.session
         self.expires_after: Optional[int] = None
 
     def _post_action(self, action, signature, nonce):
@@ -145,7 +184,7 @@ class Exchange(API):
             self.vault_address,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
 
         return self._post_action(
@@ -200,7 +239,7 @@ class Exchange(API):
             self.vault_address,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
 
         return self._post_action(
@@ -287,7 +326,7 @@ class Exchange(API):
             self.vault_address,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
 
         return self._post_action(
@@ -315,7 +354,7 @@ class Exchange(API):
             self.vault_address,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
 
         return self._post_action(
@@ -344,7 +383,7 @@ class Exchange(API):
             self.vault_address,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             schedule_cancel_action,
@@ -366,7 +405,7 @@ class Exchange(API):
             self.vault_address,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             update_leverage_action,
@@ -389,7 +428,7 @@ class Exchange(API):
             self.vault_address,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             update_isolated_margin_action,
@@ -409,7 +448,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             set_referrer_action,
@@ -429,7 +468,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             create_sub_account_action,
@@ -449,7 +488,7 @@ class Exchange(API):
             "toPerp": to_perp,
             "nonce": timestamp,
         }
-        signature = sign_usd_class_transfer_action(self.wallet, action, self.base_url == MAINNET_API_URL)
+        signature = sign_usd_class_transfer_action(self.wallet, action, self.is_mainnet)
         return self._post_action(
             action,
             signature,
@@ -474,7 +513,7 @@ class Exchange(API):
             "fromSubAccount": self.vault_address if self.vault_address else "",
             "nonce": timestamp,
         }
-        signature = sign_send_asset_action(self.wallet, action, self.base_url == MAINNET_API_URL)
+        signature = sign_send_asset_action(self.wallet, action, self.is_mainnet)
         return self._post_action(
             action,
             signature,
@@ -495,7 +534,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             sub_account_transfer_action,
@@ -518,7 +557,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             sub_account_transfer_action,
@@ -534,7 +573,7 @@ class Exchange(API):
             "isDeposit": is_deposit,
             "usd": usd,
         }
-        is_mainnet = self.base_url == MAINNET_API_URL
+        is_mainnet = self.is_mainnet
         signature = sign_l1_action(self.wallet, vault_transfer_action, None, timestamp, self.expires_after, is_mainnet)
         return self._post_action(
             vault_transfer_action,
@@ -545,7 +584,7 @@ class Exchange(API):
     def usd_transfer(self, amount: float, destination: str) -> Any:
         timestamp = get_timestamp_ms()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "usdSend"}
-        is_mainnet = self.base_url == MAINNET_API_URL
+        is_mainnet = self.is_mainnet
         signature = sign_usd_transfer_action(self.wallet, action, is_mainnet)
         return self._post_action(
             action,
@@ -562,7 +601,7 @@ class Exchange(API):
             "time": timestamp,
             "type": "spotSend",
         }
-        is_mainnet = self.base_url == MAINNET_API_URL
+        is_mainnet = self.is_mainnet
         signature = sign_spot_transfer_action(self.wallet, action, is_mainnet)
         return self._post_action(
             action,
@@ -579,7 +618,7 @@ class Exchange(API):
             "nonce": timestamp,
             "type": "tokenDelegate",
         }
-        is_mainnet = self.base_url == MAINNET_API_URL
+        is_mainnet = self.is_mainnet
         signature = sign_token_delegate_action(self.wallet, action, is_mainnet)
         return self._post_action(
             action,
@@ -590,7 +629,7 @@ class Exchange(API):
     def withdraw_from_bridge(self, amount: float, destination: str) -> Any:
         timestamp = get_timestamp_ms()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "withdraw3"}
-        is_mainnet = self.base_url == MAINNET_API_URL
+        is_mainnet = self.is_mainnet
         signature = sign_withdraw_from_bridge_action(self.wallet, action, is_mainnet)
         return self._post_action(
             action,
@@ -602,7 +641,7 @@ class Exchange(API):
         agent_key = "0x" + secrets.token_hex(32)
         account = eth_account.Account.from_key(agent_key)
         timestamp = get_timestamp_ms()
-        is_mainnet = self.base_url == MAINNET_API_URL
+        is_mainnet = self.is_mainnet
         action = {
             "type": "approveAgent",
             "agentAddress": account.address,
@@ -626,7 +665,7 @@ class Exchange(API):
         timestamp = get_timestamp_ms()
 
         action = {"maxFeeRate": max_fee_rate, "builder": builder, "nonce": timestamp, "type": "approveBuilderFee"}
-        signature = sign_approve_builder_fee(self.wallet, action, self.base_url == MAINNET_API_URL)
+        signature = sign_approve_builder_fee(self.wallet, action, self.is_mainnet)
         return self._post_action(action, signature, timestamp)
 
     def convert_to_multi_sig_user(self, authorized_users: List[str], threshold: int) -> Any:
@@ -641,7 +680,7 @@ class Exchange(API):
             "signers": json.dumps(signers),
             "nonce": timestamp,
         }
-        signature = sign_convert_to_multi_sig_user_action(self.wallet, action, self.base_url == MAINNET_API_URL)
+        signature = sign_convert_to_multi_sig_user_action(self.wallet, action, self.is_mainnet)
         return self._post_action(
             action,
             signature,
@@ -666,7 +705,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -692,7 +731,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -714,7 +753,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -738,7 +777,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -760,7 +799,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -786,7 +825,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -808,7 +847,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -838,7 +877,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -861,7 +900,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -909,7 +948,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -940,7 +979,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -966,7 +1005,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -1007,7 +1046,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -1044,7 +1083,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -1064,7 +1103,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -1084,7 +1123,7 @@ class Exchange(API):
                 "action": inner_action,
             },
         }
-        is_mainnet = self.base_url == MAINNET_API_URL
+        is_mainnet = self.is_mainnet
         signature = sign_multi_sig_action(
             self.wallet,
             multi_sig_action,
@@ -1111,7 +1150,7 @@ class Exchange(API):
             None,
             timestamp,
             self.expires_after,
-            self.base_url == MAINNET_API_URL,
+            self.is_mainnet,
         )
         return self._post_action(
             action,
@@ -1,17 +1,42 @@
+import functools
+import threading
+
 from hyperliquid.api import API
+from hyperliquid.stream import Stream
+from hyperliquid.utils.cache import InfoCache
+from hyperliquid.utils.endpoints import EndpointPool
+from hyperliquid.utils.fanout import DEFAULT_MAX_WORKERS, FanOutResult, fan_out
+from hyperliquid.utils.http import ConnectionPolicy
+from hyperliquid.utils.pagination import (
+    CANDLES_PAGE_LIMIT,
+    DAY_MS,
+    FUNDING_HISTORY_PAGE_LIMIT,
+    USER_FILLS_PAGE_LIMIT,
+    candle_key,
+    fill_key,
+    funding_key,
+    paginate,
+    user_funding_key,
+)
+from hyperliquid.utils.rate_limit import RateLimiter
+from hyperliquid.utils.retry import CircuitBreaker, RetryPolicy
 from hyperliquid.utils.types import (
     Any,
     Callable,
     Cloid,
+    Dict,
+    Iterator,
     List,
     Meta,
     Optional,
     SpotMeta,
     SpotMetaAndAssetCtxs,
     Subscription,
+    Tuple,
+    Union,
     cast,
 )
-from hyperliquid.websocket_manager import WebsocketManager
+from hyperliquid.websocket_manager import USER_CHANNEL_IDENTIFIERS, WebsocketManager, subscription_to_identifier
 
 
 class Info(API):
@@ -24,32 +49,47 @@ class Info(API):
         # Note that when perp_dexs is None, then "" is used as the perp dex. "" represents
         # the original dex.
         perp_dexs: Optional[List[str]] = None,
+        # When True, l2Book, bbo, trades, allMids and userFills callbacks receive the objects from
+        # hyperliquid.utils.messages with prices and sizes already parsed instead of raw message dicts.
+        decode_ws_msgs: bool = False,
+        # Caches responses of the request types in cache.ttls and coalesces concurrent identical requests
+        cache: Optional[InfoCache] = None,
+        # Spends request weight before each request, see RateLimiter.shared to share one across instances
+        rate_limiter: Optional[RateLimiter] = None,
+        timeout: Optional[Union[float, Tuple[float, float]]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        endpoint_pool: Optional[EndpointPool] = None,
+        connection_policy: Optional[ConnectionPolicy] = None,
     ):  # pylint: disable=too-many-locals
-        super().__init__(base_url)
+        super().__init__(
+            base_url,
+            rate_limiter=rate_limiter,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            endpoint_pool=endpoint_pool,
+            connection_policy=connection_policy,
+        )
+        self.cache = cache
+        self.decode_ws_msgs = decode_ws_msgs
         self.ws_manager: Optional[WebsocketManager] = None
+        # Dedicated connections for users whose userEvents/orderUpdates can't share ws_manager, keyed by user
+        self.user_ws_managers: Dict[str, WebsocketManager] = {}
+        # held while routing a user channel (un)subscription, so a user never gets two connections and a connection
+        # isn't stopped while a subscription is being added to it
+        self.user_ws_managers_lock = threading.Lock()
         if not skip_ws:
-            self.ws_manager = WebsocketManager(self.base_url)
+            self.ws_manager = WebsocketManager(self._ws_base_url(), decode_ws_msgs, self.codec)
             self.ws_manager.start()
 
         if spot_meta is None:
             spot_meta = self.spot_meta()
 
-        self.coin_to_asset = {}
-        self.name_to_coin = {}
-        self.asset_to_sz_decimals = {}
-
-        # spot assets start at 10000
-        for spot_info in spot_meta["universe"]:
-            asset = spot_info["index"] + 10000
-            self.coin_to_asset[spot_info["name"]] = asset
-            self.name_to_coin[spot_info["name"]] = spot_info["name"]
-            base, quote = spot_info["tokens"]
-            base_info = spot_meta["tokens"][base]
-            quote_info = spot_meta["tokens"][quote]
-            self.asset_to_sz_decimals[asset] = base_info["szDecimals"]
-            name = f'{base_info["name"]}/{quote_info["name"]}'
-            if name not in self.name_to_coin:
-                self.name_to_coin[name] = spot_info["name"]
+        self.coin_to_asset: Dict[str, int] = {}
+        self.name_to_coin: Dict[str, str] = {}
+        self.asset_to_sz_decimals: Dict[int, int] = {}
+        self.set_spot_meta(spot_meta)
 
         perp_dex_to_offset = {"": 0}
         if perp_dexs is None:
@@ -67,6 +107,25 @@ class Info(API):
                 fresh_meta = self.meta(dex=perp_dex)
                 self.set_perp_meta(fresh_meta, offset)
 
+    def post(self, url_path: str, payload: Any = None) -> Any:
+        if self.cache is None or url_path != "/info":
+            return super().post(url_path, payload)
+        return self.cache.get_or_load(payload, lambda: super(Info, self).post(url_path, payload))
+
+    def set_spot_meta(self, spot_meta: SpotMeta) -> None:
+        # Also called with a newer spot_meta to add the pairs listed since, spot assets start at 10000
+        for spot_info in spot_meta["universe"]:
+            asset = spot_info["index"] + 10000
+            self.coin_to_asset[spot_info["name"]] = asset
+            self.name_to_coin[spot_info["name"]] = spot_info["name"]
+            base, quote = spot_info["tokens"]
+            base_info = spot_meta["tokens"][base]
+            quote_info = spot_meta["tokens"][quote]
+            self.asset_to_sz_decimals[asset] = base_info["szDecimals"]
+            name = f'{base_info["name"]}/{quote_info["name"]}'
+            if name not in self.name_to_coin:
+                self.name_to_coin[name] = spot_info["name"]
+
     def set_perp_meta(self, meta: Meta, offset: int) -> Any:
         for asset, asset_info in enumerate(meta["universe"]):
             asset += offset
@@ -79,6 +138,11 @@ class Info(API):
             raise RuntimeError("Cannot call disconnect_websocket since skip_ws was used")
         else:
             self.ws_manager.stop()
+            with self.user_ws_managers_lock:
+                user_ws_managers = list(self.user_ws_managers.values())
+                self.user_ws_managers.clear()
+            for ws_manager in user_ws_managers:
+                ws_manager.stop()
 
     def user_state(self, address: str, dex: str = "") -> Any:
         """Retrieve trading details about a user.
@@ -257,6 +321,29 @@ class Info(API):
             "/info", {"type": "userFillsByTime", "user": address, "startTime": start_time, "endTime": end_time}
         )
 
+    def iter_user_fills_by_time(
+        self,
+        address: str,
+        start_time: int,
+        end_time: Optional[int] = None,
+        window_ms: int = DAY_MS,
+        max_workers: int = 4,
+    ) -> Iterator[Any]:
+        """Yield all of a user's fills between start_time and end_time (defaults to now) in time order.
+
+        The range is fetched in windows of window_ms, up to max_workers windows concurrently, and windows with more
+        fills than fit in one response are paged through. Fills are de-duplicated on tid.
+        """
+        return paginate(
+            lambda start, end: self.user_fills_by_time(address, start, end),
+            start_time,
+            end_time,
+            window_ms,
+            USER_FILLS_PAGE_LIMIT,
+            fill_key,
+            max_workers=max_workers,
+        )
+
     def meta(self, dex: str = "") -> Meta:
         """Retrieve exchange perp metadata
 
@@ -432,6 +519,50 @@ class Info(API):
             return self.post("/info", {"type": "userFunding", "user": user, "startTime": startTime, "endTime": endTime})
         return self.post("/info", {"type": "userFunding", "user": user, "startTime": startTime})
 
+    def iter_funding_history(
+        self,
+        name: str,
+        startTime: int,
+        endTime: Optional[int] = None,
+        window_ms: int = 20 * DAY_MS,
+        max_workers: int = 4,
+    ) -> Iterator[Any]:
+        """Yield the funding history of a coin between startTime and endTime (defaults to now) in time order.
+
+        See iter_user_fills_by_time for how the range is fetched.
+        """
+        return paginate(
+            lambda start, end: self.funding_history(name, start, end),
+            startTime,
+            endTime,
+            window_ms,
+            FUNDING_HISTORY_PAGE_LIMIT,
+            funding_key,
+            max_workers=max_workers,
+        )
+
+    def iter_user_funding_history(
+        self,
+        user: str,
+        startTime: int,
+        endTime: Optional[int] = None,
+        window_ms: int = 7 * DAY_MS,
+        max_workers: int = 4,
+    ) -> Iterator[Any]:
+        """Yield a user's funding payments between startTime and endTime (defaults to now) in time order.
+
+        See iter_user_fills_by_time for how the range is fetched.
+        """
+        return paginate(
+            lambda start, end: self.user_funding_history(user, start, end),
+            startTime,
+            endTime,
+            window_ms,
+            FUNDING_HISTORY_PAGE_LIMIT,
+            user_funding_key,
+            max_workers=max_workers,
+        )
+
     def l2_snapshot(self, name: str) -> Any:
         """Retrieve L2 snapshot for a given coin
 
@@ -490,6 +621,30 @@ class Info(API):
         req = {"coin": self.name_to_coin[name], "interval": interval, "startTime": startTime, "endTime": endTime}
         return self.post("/info", {"type": "candleSnapshot", "req": req})
 
+    def iter_candles(
+        self,
+        name: str,
+        interval: str,
+        startTime: int,
+        endTime: Optional[int] = None,
+        window_ms: int = 30 * DAY_MS,
+        max_workers: int = 4,
+    ) -> Iterator[Any]:
+        """Yield the candles of a coin between startTime and endTime (defaults to now) in time order.
+
+        See iter_user_fills_by_time for how the range is fetched. Candles are de-duplicated on their open time t.
+        """
+        return paginate(
+            lambda start, end: self.candles_snapshot(name, interval, start, end),
+            startTime,
+            endTime,
+            window_ms,
+            CANDLES_PAGE_LIMIT,
+            candle_key,
+            time_key="t",
+            max_workers=max_workers,
+        )
+
     def user_fees(self, address: str) -> Any:
         """Retrieve the volume of trading activity associated with a user.
         POST /info
@@ -611,19 +766,111 @@ class Info(API):
         ):
             subscription["coin"] = self.name_to_coin[subscription["coin"]]
 
+    def _ws_base_url(self) -> str:
+        # A websocket connection stays on the endpoint that was best when it was created, it doesn't fail over
+        return self.base_url if self.endpoint_pool is None else self.endpoint_pool.best()
+
+    def _ws_manager_for(self, subscription: Subscription, create: bool) -> WebsocketManager:
+        # userEvents and orderUpdates messages can't be attributed to a user, so every user after the first one gets
+        # its own connection. A user is either always routed to its dedicated connection or always to ws_manager.
+        # Dedicated connections are stopped once their last subscription is removed. Called with
+        # user_ws_managers_lock held.
+        assert self.ws_manager is not None
+        if subscription_to_identifier(subscription) not in USER_CHANNEL_IDENTIFIERS:
+            return self.ws_manager
+        user = subscription["user"].lower()  # type: ignore
+        if user in self.user_ws_managers:
+            return self.user_ws_managers[user]
+        if not create or self.ws_manager.user_channel_owner in (None, user):
+            return self.ws_manager
+        ws_manager = WebsocketManager(self._ws_base_url(), self.decode_ws_msgs, self.codec)
+        ws_manager.start()
+        self.user_ws_managers[user] = ws_manager
+        return ws_manager
+
     def subscribe(self, subscription: Subscription, callback: Callable[[Any], None]) -> int:
         self._remap_coin_subscription(subscription)
         if self.ws_manager is None:
             raise RuntimeError("Cannot call subscribe since skip_ws was used")
         else:
-            return self.ws_manager.subscribe(subscription, callback)
+            with self.user_ws_managers_lock:
+                return self._ws_manager_for(subscription, True).subscribe(subscription, callback)
 
     def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
         self._remap_coin_subscription(subscription)
         if self.ws_manager is None:
             raise RuntimeError("Cannot call unsubscribe since skip_ws was used")
         else:
-            return self.ws_manager.unsubscribe(subscription, subscription_id)
+            with self.user_ws_managers_lock:
+                ws_manager = self._ws_manager_for(subscription, False)
+                unsubscribed = ws_manager.unsubscribe(subscription, subscription_id)
+                idle = ws_manager is not self.ws_manager and not ws_manager.has_subscriptions()
+                if idle:
+                    del self.user_ws_managers[subscription["user"].lower()]  # type: ignore
+            if idle:
+                ws_manager.stop()
+            return unsubscribed
+
+    def stream(self, *subscriptions: Subscription, maxsize: int = 1024, conflate: bool = False) -> Stream:
+        """Subscribe to one or more subscriptions and consume their messages from a single Stream.
+
+        Messages from all subscriptions are interleaved in arrival order. Use the stream as an iterator, an async
+        iterator or through Stream.next_batch, and close it (or use it as a context manager) to unsubscribe.
+
+        Args:
+            maxsize (int): Maximum number of buffered messages, the oldest ones are dropped beyond it.
+            conflate (bool): Only keep the latest undelivered message of each subscription.
+        """
+        stream = Stream(maxsize, conflate)
+        for key, subscription in enumerate(subscriptions):
+            subscription_id = self.subscribe(subscription, functools.partial(stream.put, key))
+            stream.add_close_callback(functools.partial(self.unsubscribe, subscription, subscription_id))
+        return stream
+
+    def user_states(
+        self, addresses: List[str], dexes: Optional[List[str]] = None, max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Iterator[FanOutResult]:
+        """Query user_state of every address on every dex concurrently.
+
+        Yields a FanOutResult keyed by (address, dex) as each query completes, in completion order. A failed query
+        sets the error of its result and doesn't stop the others. Requests still go through the rate limiter and
+        cache of this Info, and the session should pool at least max_workers connections, see ConnectionPolicy.
+
+        Args:
+            addresses (List[str]): Onchain addresses in 42-character hexadecimal format.
+            dexes (Optional[List[str]]): Perp dexes to query, defaults to [""], the original dex.
+            max_workers (int): Maximum number of requests in flight.
+        """
+        return self._fan_out_per_dex(self.user_state, addresses, dexes, max_workers)
+
+    def spot_user_states(self, addresses: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[FanOutResult]:
+        """Query spot_user_state of every address concurrently, see user_states. Results are keyed by address."""
+        return fan_out(
+            ((address, functools.partial(self.spot_user_state, address)) for address in addresses), max_workers
+        )
+
+    def open_orders_of(
+        self, addresses: List[str], dexes: Optional[List[str]] = None, max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Iterator[FanOutResult]:
+        """Query open_orders of every address on every dex concurrently, see user_states."""
+        return self._fan_out_per_dex(self.open_orders, addresses, dexes, max_workers)
+
+    def frontend_open_orders_of(
+        self, addresses: List[str], dexes: Optional[List[str]] = None, max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Iterator[FanOutResult]:
+        """Query frontend_open_orders of every address on every dex concurrently, see user_states."""
+        return self._fan_out_per_dex(self.frontend_open_orders, addresses, dexes, max_workers)
+
+    def _fan_out_per_dex(
+        self,
+        query: Callable[[str, str], Any],
+        addresses: List[str],
+        dexes: Optional[List[str]],
+        max_workers: int,
+    ) -> Iterator[FanOutResult]:
+        dexes = [""] if dexes is None else dexes
+        calls = (((address, dex), functools.partial(query, address, dex)) for address in addresses for dex in dexes)
+        return fan_out(calls, max_workers)
 
     def name_to_asset(self, name: str) -> int:
         return self.coin_to_asset[self.name_to_coin[name]]
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+from collections import deque
+
+from hyperliquid.info import Info
+from hyperliquid.utils.messages import FillEvent, UserFills
+from hyperliquid.utils.types import Any, Deque, Dict, Optional, Set, Tuple
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class Position:
+    """Running aggregates of the fills of one coin."""
+
+    __slots__ = ("coin", "size", "entry_px", "realized_pnl", "fees", "volume", "fills", "last_time")
+
+    def __init__(self, coin: str):
+        self.coin = coin
+        # signed, positive when long
+        self.size = 0.0
+        # average entry price of the open size, 0 when flat
+        self.entry_px = 0.0
+        # sum of the closedPnl reported with each fill, before fees
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+        # traded notional
+        self.volume = 0.0
+        self.fills = 0
+        self.last_time = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"Position(coin={self.coin}, size={self.size}, entry_px={self.entry_px}, "
+            f"realized_pnl={self.realized_pnl}, fees={self.fees})"
+        )
+
+    def apply(self, side: str, px: float, sz: float, closed_pnl: float, fee: float, time: int) -> None:
+        if sz == 0:
+            return
+        delta = sz if side == "B" else -sz
+        # sizes have at most 8 decimals, rounding keeps float error from leaving dust when flat
+        new_size = round(self.size + delta, 10)
+        if self.size == 0 or (self.size > 0) == (delta > 0):
+            self.entry_px = (self.entry_px * abs(self.size) + px * sz) / abs(new_size)
+        elif new_size == 0:
+            self.entry_px = 0.0
+        elif (new_size > 0) != (self.size > 0):
+            # flipped sides, the remainder was opened at this fill's price
+            self.entry_px = px
+        self.size = new_size
+        self.realized_pnl += closed_pnl
+        self.fees += fee
+        self.volume += px * sz
+        self.fills += 1
+        self.last_time = max(self.last_time, time)
+
+    def unrealized_pnl(self, mark_px: float) -> float:
+        return (mark_px - self.entry_px) * self.size
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Position":
+        position = cls(data["coin"])
+        for name in cls.__slots__:
+            setattr(position, name, data[name])
+        return position
+
+
+class Portfolio:
+    """Per-coin position, average entry, realized PnL and fees of one user, updated incrementally from fills.
+
+    Seed it with seed, which pulls the fill history through Info.iter_user_fills_by_time, then pass on_message as
+    the callback of the userFills or userEvents subscription of the same user. Each fill updates the aggregates of
+    its coin in constant time. Fills are de-duplicated by tid, so the overlap between the seeded history and the
+    snapshot sent when subscribing to userFills is only counted once.
+
+    Only the tids of the last dedup_window_ms of fills are remembered: a fill older than that is assumed to have been
+    applied already. snapshot and restore persist the aggregates and remembered tids, after a restore seed again from
+    last_time to catch up on the fills missed while stopped.
+    """
+
+    def __init__(self, user: str, dedup_window_ms: int = 7 * DAY_MS):
+        self.user = user
+        self.dedup_window_ms = dedup_window_ms
+        self.positions: Dict[str, Position] = {}
+        self.last_time = 0
+        self._seen: Set[int] = set()
+        self._seen_order: Deque[Tuple[int, int]] = deque()
+        self._lock = threading.Lock()
+
+    def position(self, coin: str) -> Position:
+        position = self.positions.get(coin)
+        if position is None:
+            position = self.positions[coin] = Position(coin)
+        return position
+
+    def apply_fill(
+        self, coin: str, side: str, px: float, sz: float, closed_pnl: float, fee: float, time: int, tid: int
+    ) -> bool:
+        """Apply one fill. Returns False when it was skipped as a duplicate."""
+        with self._lock:
+            if tid in self._seen or time < self.last_time - self.dedup_window_ms:
+                return False
+            self._seen.add(tid)
+            self._seen_order.append((time, tid))
+            self.last_time = max(self.last_time, time)
+            horizon = self.last_time - self.dedup_window_ms
+            while self._seen_order and self._seen_order[0][0] < horizon:
+                self._seen.discard(self._seen_order.popleft()[1])
+            self.position(coin).apply(side, px, sz, closed_pnl, fee, time)
+            return True
+
+    def apply_raw_fill(self, fill: Any) -> bool:
+        return self.apply_fill(
+            fill["coin"],
+            fill["side"],
+            float(fill["px"]),
+            float(fill["sz"]),
+            float(fill["closedPnl"]),
+            float(fill.get("fee", 0)),
+            fill["time"],
+            fill["tid"],
+        )
+
+    def apply_fill_event(self, fill: FillEvent) -> bool:
+        return self.apply_fill(fill.coin, fill.side, fill.px, fill.sz, fill.closed_pnl, fill.fee, fill.time, fill.tid)
+
+    def on_message(self, ws_msg: Any) -> None:
+        """Callback for userFills and userEvents subscriptions, raw or decoded with decode_ws_msgs."""
+        if isinstance(ws_msg, UserFills):
+            for fill in ws_msg.fills:
+                self.apply_fill_event(fill)
+            return
+        data = ws_msg.get("data")
+        if not isinstance(data, dict) or "fills" not in data:
+            # userEvents also carries funding, liquidation and non user cancel events
+            return
+        if "user" in data and data["user"].lower() != self.user.lower():
+            return
+        for fill in data["fills"]:
+            self.apply_raw_fill(fill)
+
+    def seed(self, info: Info, start_time: int, end_time: Optional[int] = None) -> int:
+        """Apply the user's fills between start_time and end_time (defaults to now). Returns how many were new."""
+        return sum(self.apply_raw_fill(fill) for fill in info.iter_user_fills_by_time(self.user, start_time, end_time))
+
+    def snapshot(self, path: str) -> None:
+        """Write the portfolio to path as JSON, replacing the file atomically."""
+        with self._lock:
+            state = {
+                "user": self.user,
+                "dedup_window_ms": self.dedup_window_ms,
+                "last_time": self.last_time,
+                "positions": [position.to_dict() for position in self.positions.values()],
+                "seen": list(self._seen_order),
+            }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def restore(cls, path: str) -> "Portfolio":
+        with open(path) as f:
+            state = json.load(f)
+        portfolio = cls(state["user"], state["dedup_window_ms"])
+        portfolio.last_time = state["last_time"]
+        for data in state["positions"]:
+            portfolio.positions[data["coin"]] = Position.from_dict(data)
+        for time, tid in state["seen"]:
+            portfolio._seen_order.append((time, tid))
+            portfolio._seen.add(tid)
+        return portfolio
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+
+from hyperliquid.utils.types import Any, Callable, Deque, Hashable, List, Optional, Tuple
+
+
+class Stream:
+    """Buffer between websocket callbacks and a consumer that pulls messages.
+
+    Created by Info.stream, which puts every message of the streamed subscriptions into it from the websocket thread.
+    Consume it with a for loop, async for, or next_batch.
+
+    put never blocks, since the websocket thread also serves the other subscriptions and the pongs of its connection.
+    Without conflation the buffer holds at most maxsize messages, and when it is full the oldest message is dropped
+    and counted in dropped. With conflation only the latest undelivered message of each subscription is kept, which
+    suits snapshot channels like l2Book, bbo or allMids.
+    """
+
+    def __init__(self, maxsize: int = 1024, conflate: bool = False):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.conflate = conflate
+        self.closed = False
+        # messages dropped because the buffer was full
+        self.dropped = 0
+        self._buffer: Deque[Any] = deque()
+        self._latest: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+        self._close_callbacks: List[Callable[[], Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._latest) if self.conflate else len(self._buffer)
+
+    def put(self, key: Hashable, msg: Any) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            if self.conflate:
+                self._latest[key] = msg
+            else:
+                if len(self._buffer) >= self.maxsize:
+                    self._buffer.popleft()
+                    self.dropped += 1
+                self._buffer.append(msg)
+            self._not_empty.notify()
+            self._wake_async_waiters()
+
+    def next_batch(self, max_n: int, timeout: Optional[float] = None) -> List[Any]:
+        """Wait up to timeout seconds for a message and return up to max_n buffered messages.
+
+        Returns an empty list if the timeout expires or the stream is closed and drained. A timeout of None waits
+        indefinitely and 0 never waits.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while len(self) == 0 and not self.closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                self._not_empty.wait(remaining)
+            batch: List[Any] = []
+            if self.conflate:
+                while self._latest and len(batch) < max_n:
+                    batch.append(self._latest.popitem(last=False)[1])
+            else:
+                while self._buffer and len(batch) < max_n:
+                    batch.append(self._buffer.popleft())
+            return batch
+
+    async def next_batch_async(self, max_n: int, timeout: Optional[float] = None) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - loop.time()
+            with self._lock:
+                if len(self) != 0 or self.closed:
+                    waiter = None
+                elif remaining is not None and remaining <= 0:
+                    return []
+                else:
+                    waiter = loop.create_future()
+                    self._async_waiters.append((loop, waiter))
+            if waiter is None:
+                batch = self.next_batch(max_n, 0)
+                if batch or self.closed:
+                    return batch
+                continue
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                return []
+            finally:
+                # after a timeout or cancellation nothing awaits the waiter anymore
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def _wake_async_waiters(self) -> None:
+        for loop, waiter in self._async_waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+        self._async_waiters = []
+
+    def add_close_callback(self, callback: Callable[[], Any]) -> None:
+        self._close_callbacks.append(callback)
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._not_empty.notify_all()
+            self._wake_async_waiters()
+        for callback in self._close_callbacks:
+            callback()
+
+    def __enter__(self) -> "Stream":
+        return self
+
+    def __exit__(self, *_args: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> "Stream":
+        return self
+
+    def __next__(self) -> Any:
+        batch = self.next_batch(1)
+        if not batch:
+            raise StopIteration
+        return batch[0]
+
+    def __aiter__(self) -> "Stream":
+        return self
+
+    async def __anext__(self) -> Any:
+        batch = await self.next_batch_async(1)
+        if not batch:
+            raise StopAsyncIteration
+        return batch[0]
+
+
+def _resolve(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,99 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from hyperliquid.utils.types import Any, Callable, Dict, Optional, Tuple
+
+# Seconds that responses of each /info request type stay fresh. Types that aren't listed are never cached.
+DEFAULT_INFO_CACHE_TTLS: Dict[str, float] = {
+    "allMids": 1.0,
+    "metaAndAssetCtxs": 1.0,
+    "spotMetaAndAssetCtxs": 1.0,
+    "meta": 60.0,
+    "spotMeta": 60.0,
+    "perpDexs": 60.0,
+}
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class InfoCache:
+    """TTL cache for /info responses with single-flight loading.
+
+    Concurrent requests for the same payload share one HTTP call: the first caller loads it and the others wait for
+    its result (or its exception). Entries are evicted least recently used first once max_entries is exceeded.
+    Cached responses are shared between callers and must not be mutated.
+
+    An InfoCache can be shared by several Info instances, as long as they talk to the same API.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024):
+        self.ttls = DEFAULT_INFO_CACHE_TTLS if ttls is None else ttls
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_load(self, payload: Any, load: Callable[[], Any]) -> Any:
+        ttl = self.ttls.get(payload.get("type", "")) if isinstance(payload, dict) else None
+        if not ttl:
+            return load()
+        key = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            flight = self._in_flight.get(key)
+            is_leader = flight is None
+            if flight is None:
+                flight = _Flight()
+                self._in_flight[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = load()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = (time.monotonic() + ttl, flight.result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "entries": len(self._entries)}
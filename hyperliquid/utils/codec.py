@@ -0,0 +1,60 @@
+import json
+
+from hyperliquid.utils.types import Any, Callable, Dict, NamedTuple, Optional, Union
+
+# loads accepts str or bytes and raises ValueError on invalid JSON. dumps always returns bytes.
+Codec = NamedTuple(
+    "Codec",
+    [("name", str), ("loads", Callable[[Union[str, bytes]], Any]), ("dumps", Callable[[Any], bytes])],
+)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _stdlib_codec() -> Codec:
+    return Codec("json", json.loads, _stdlib_dumps)
+
+
+def _orjson_codec() -> Codec:
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects integers outside of 64 bits, which the stdlib encodes fine
+            return _stdlib_dumps(obj)
+
+    return Codec("orjson", orjson.loads, dumps)
+
+
+def _msgspec_codec() -> Codec:
+    import msgspec  # pylint: disable=import-outside-toplevel
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+    return Codec("msgspec", decoder.decode, encoder.encode)
+
+
+CODECS: Dict[str, Callable[[], Codec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Return the named codec, or the fastest installed one in the order of CODECS if name is None."""
+    if name is not None:
+        return CODECS[name]()
+    for make_codec in CODECS.values():
+        try:
+            return make_codec()
+        except ImportError:
+            continue
+    return _stdlib_codec()
+
+
+DEFAULT_CODEC = get_codec()
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+
+import requests
+
+from hyperliquid.utils.types import Any, List, Optional
+
+
+class Endpoint:
+    __slots__ = ("url", "rtt", "healthy", "failed_at")
+
+    def __init__(self, url: str):
+        self.url = url
+        # exponentially weighted moving average of probe round trips in seconds, None until the first probe
+        self.rtt: Optional[float] = None
+        self.healthy = True
+        self.failed_at = 0.0
+
+    def __repr__(self) -> str:
+        return f"Endpoint(url={self.url}, rtt={self.rtt}, healthy={self.healthy})"
+
+
+class EndpointPool:
+    """Set of interchangeable API base urls, e.g. several regional gateways or local non-validating nodes.
+
+    Requests go to the healthy endpoint with the lowest measured round trip time. An endpoint that fails a request is
+    skipped until a probe succeeds or cooldown seconds have passed. Round trips are measured by probe, either on demand
+    or every probe_interval seconds from a background thread after start. Websocket connections are bound to the best
+    endpoint when they are created and don't fail over.
+    """
+
+    def __init__(
+        self,
+        base_urls: List[str],
+        probe_payload: Any = None,
+        probe_interval: float = 10.0,
+        probe_timeout: float = 2.0,
+        cooldown: float = 30.0,
+        ewma_alpha: float = 0.3,
+    ):
+        if not base_urls:
+            raise ValueError("EndpointPool needs at least one base url")
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.probe_payload = probe_payload or {"type": "exchangeStatus"}
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.cooldown = cooldown
+        self.ewma_alpha = ewma_alpha
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def candidates(self) -> List[str]:
+        """All urls, best first: healthy before unhealthy, then by round trip time, then in configured order."""
+        now = time.monotonic()
+        with self._lock:
+            for endpoint in self.endpoints:
+                if not endpoint.healthy and now - endpoint.failed_at >= self.cooldown:
+                    endpoint.healthy = True
+            ranked = sorted(
+                enumerate(self.endpoints),
+                key=lambda x: (not x[1].healthy, x[1].rtt if x[1].rtt is not None else float("inf"), x[0]),
+            )
+        return [endpoint.url for _, endpoint in ranked]
+
+    def best(self) -> str:
+        return self.candidates()[0]
+
+    def _endpoint(self, url: str) -> Optional[Endpoint]:
+        return next((endpoint for endpoint in self.endpoints if endpoint.url == url), None)
+
+    def record_rtt(self, url: str, rtt: float) -> None:
+        with self._lock:
+            endpoint = self._endpoint(url)
+            if endpoint is None:
+                return
+            endpoint.healthy = True
+            if endpoint.rtt is None:
+                endpoint.rtt = rtt
+            else:
+                endpoint.rtt += self.ewma_alpha * (rtt - endpoint.rtt)
+
+    def record_failure(self, url: str) -> None:
+        with self._lock:
+            endpoint = self._endpoint(url)
+            if endpoint is not None:
+                endpoint.healthy = False
+                endpoint.failed_at = time.monotonic()
+
+    def probe(self) -> None:
+        for endpoint in list(self.endpoints):
+            start = time.perf_counter()
+            try:
+                response = self.session.post(
+                    endpoint.url + "/info", json=self.probe_payload, timeout=self.probe_timeout
+                )
+            except requests.RequestException as e:
+                logging.debug(f"Probe of {endpoint.url} failed: {e!r}")
+                self.record_failure(endpoint.url)
+                continue
+            if response.status_code >= 500:
+                self.record_failure(endpoint.url)
+            else:
+                self.record_rtt(endpoint.url, time.perf_counter() - start)
+
+    def _probe_forever(self) -> None:
+        while not self._stop_event.is_set():
+            self.probe()
+            self._stop_event.wait(self.probe_interval)
+
+    def start(self) -> None:
+        if self._prober is not None:
+            return
+        self._stop_event.clear()
+        self._prober = threading.Thread(target=self._probe_forever, daemon=True)
+        self._prober.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._prober is not None:
+            self._prober.join()
+            self._prober = None
@@ -15,3 +15,14 @@ class ServerError(Error):
     def __init__(self, status_code, message):
         self.status_code = status_code
         self.message = message
+
+
+class RateLimitExceeded(Error):
+    def __init__(self, weight, retry_after):
+        self.weight = weight
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Error):
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
@@ -0,0 +1,51 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from hyperliquid.utils.types import Any, Callable, Dict, Hashable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+DEFAULT_MAX_WORKERS = 16
+
+
+class FanOutResult(NamedTuple):
+    key: Hashable
+    result: Any
+    # Set instead of result when the call raised
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def fan_out(
+    calls: Iterable[Tuple[Hashable, Callable[[], Any]]], max_workers: int = DEFAULT_MAX_WORKERS
+) -> Iterator[FanOutResult]:
+    """Run (key, call) pairs on a pool of max_workers threads and yield their results as they complete.
+
+    At most max_workers calls are in flight, calls are only taken from the iterable as workers free up, and an
+    exception raised by one call is reported in its result instead of stopping the others. Closing the iterator
+    early cancels the calls that haven't started.
+    """
+    calls = iter(calls)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: "Dict[Future[Any], Hashable]" = {}
+
+    def submit_next() -> bool:
+        for key, call in calls:
+            pending[executor.submit(call)] = key
+            return True
+        return False
+
+    try:
+        while len(pending) < max_workers and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                error = future.exception()
+                yield FanOutResult(key, None if error is not None else future.result(), error)
+                submit_next()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
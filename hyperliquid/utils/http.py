@@ -0,0 +1,77 @@
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from hyperliquid.utils.types import Any, List, Optional, Tuple
+
+SocketOption = Tuple[int, int, int]
+
+
+class ConnectionPolicy:
+    """How an API session holds its HTTP connections.
+
+    requests keeps at most 10 idle connections per host by default, so a thread pool wider than that keeps opening
+    new connections and paying TCP and TLS handshakes. pool_maxsize should be at least the number of threads sharing
+    the API object; with pool_block the extra threads wait for a free connection instead of opening a throwaway one.
+
+    tcp_nodelay disables Nagle's algorithm so small request bodies are sent right away, and tcp_keepalive lets the
+    OS detect dead connections after keepalive_idle seconds of silence. warmup_connections connections are opened
+    when the API is created, and with keepalive_interval a background thread sends a cheap request whenever the
+    session has been idle that long, so the first order after a quiet period reuses a hot connection.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        tcp_nodelay: bool = True,
+        tcp_keepalive: bool = True,
+        keepalive_idle: int = 30,
+        warmup_connections: int = 0,
+        keepalive_interval: Optional[float] = None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.tcp_nodelay = tcp_nodelay
+        self.tcp_keepalive = tcp_keepalive
+        self.keepalive_idle = keepalive_idle
+        self.warmup_connections = warmup_connections
+        self.keepalive_interval = keepalive_interval
+
+    def socket_options(self) -> List[SocketOption]:
+        options: List[SocketOption] = []
+        if self.tcp_nodelay:
+            options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+        if self.tcp_keepalive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            # TCP_KEEPIDLE is Linux only, macOS calls it TCP_KEEPALIVE
+            idle_option = getattr(socket, "TCP_KEEPIDLE", None) or getattr(socket, "TCP_KEEPALIVE", None)
+            if idle_option is not None:
+                options.append((socket.IPPROTO_TCP, idle_option, self.keepalive_idle))
+        return options
+
+    def mount(self, session: requests.Session) -> None:
+        adapter = SocketOptionsAdapter(
+            self.socket_options(),
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+
+class SocketOptionsAdapter(HTTPAdapter):
+    """HTTPAdapter that sets socket_options on every connection it opens, replacing urllib3's defaults."""
+
+    def __init__(self, socket_options: List[SocketOption], **kwargs: Any):
+        # HTTPAdapter.__init__ creates the pool manager, so the options have to be set first
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
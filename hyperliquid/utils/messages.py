@@ -0,0 +1,227 @@
+"""Compact decoded forms of the high volume websocket channels.
+
+WebsocketManager(decode_msgs=True) passes these objects to callbacks instead of the raw message dicts. Prices and sizes
+are parsed to floats once per message, and every object uses __slots__ so a book update doesn't allocate a dict per
+level. Channels without a decoder are still delivered as the raw message.
+"""
+
+from hyperliquid.utils.types import Any, Callable, Dict, List, Optional, WsMsg
+
+
+class Level:
+    __slots__ = ("px", "sz", "n")
+
+    def __init__(self, px: float, sz: float, n: int):
+        self.px = px
+        self.sz = sz
+        self.n = n
+
+    def __repr__(self) -> str:
+        return f"Level(px={self.px}, sz={self.sz}, n={self.n})"
+
+
+class L2Book:
+    __slots__ = ("coin", "time", "bids", "asks")
+    channel = "l2Book"
+
+    def __init__(self, coin: str, time: int, bids: List[Level], asks: List[Level]):
+        self.coin = coin
+        self.time = time
+        self.bids = bids
+        self.asks = asks
+
+    def __repr__(self) -> str:
+        return f"L2Book(coin={self.coin}, time={self.time}, bids={self.bids}, asks={self.asks})"
+
+
+class Bbo:
+    __slots__ = ("coin", "time", "bid", "ask")
+    channel = "bbo"
+
+    def __init__(self, coin: str, time: int, bid: Optional[Level], ask: Optional[Level]):
+        self.coin = coin
+        self.time = time
+        self.bid = bid
+        self.ask = ask
+
+    def __repr__(self) -> str:
+        return f"Bbo(coin={self.coin}, time={self.time}, bid={self.bid}, ask={self.ask})"
+
+
+class TradeEvent:
+    __slots__ = ("coin", "side", "px", "sz", "time", "hash", "tid")
+
+    def __init__(self, coin: str, side: str, px: float, sz: float, time: int, hash: str, tid: int):
+        self.coin = coin
+        self.side = side
+        self.px = px
+        self.sz = sz
+        self.time = time
+        self.hash = hash
+        self.tid = tid
+
+    def __repr__(self) -> str:
+        return f"TradeEvent(coin={self.coin}, side={self.side}, px={self.px}, sz={self.sz}, time={self.time})"
+
+
+class Trades:
+    __slots__ = ("coin", "trades")
+    channel = "trades"
+
+    def __init__(self, coin: str, trades: List[TradeEvent]):
+        self.coin = coin
+        self.trades = trades
+
+    def __repr__(self) -> str:
+        return f"Trades(coin={self.coin}, trades={self.trades})"
+
+
+class AllMids:
+    __slots__ = ("mids",)
+    channel = "allMids"
+
+    def __init__(self, mids: Dict[str, float]):
+        self.mids = mids
+
+    def __repr__(self) -> str:
+        return f"AllMids(mids={self.mids})"
+
+
+class FillEvent:
+    __slots__ = (
+        "coin",
+        "px",
+        "sz",
+        "side",
+        "time",
+        "start_position",
+        "dir",
+        "closed_pnl",
+        "hash",
+        "oid",
+        "crossed",
+        "fee",
+        "tid",
+        "fee_token",
+    )
+
+    def __init__(
+        self,
+        coin: str,
+        px: float,
+        sz: float,
+        side: str,
+        time: int,
+        start_position: float,
+        dir: str,
+        closed_pnl: float,
+        hash: str,
+        oid: int,
+        crossed: bool,
+        fee: float,
+        tid: int,
+        fee_token: str,
+    ):
+        self.coin = coin
+        self.px = px
+        self.sz = sz
+        self.side = side
+        self.time = time
+        self.start_position = start_position
+        self.dir = dir
+        self.closed_pnl = closed_pnl
+        self.hash = hash
+        self.oid = oid
+        self.crossed = crossed
+        self.fee = fee
+        self.tid = tid
+        self.fee_token = fee_token
+
+    def __repr__(self) -> str:
+        return f"FillEvent(coin={self.coin}, side={self.side}, px={self.px}, sz={self.sz}, tid={self.tid})"
+
+
+class UserFills:
+    __slots__ = ("user", "is_snapshot", "fills")
+    channel = "userFills"
+
+    def __init__(self, user: str, is_snapshot: bool, fills: List[FillEvent]):
+        self.user = user
+        self.is_snapshot = is_snapshot
+        self.fills = fills
+
+    def __repr__(self) -> str:
+        return f"UserFills(user={self.user}, is_snapshot={self.is_snapshot}, fills={self.fills})"
+
+
+def _decode_level(level: Any) -> Level:
+    return Level(float(level["px"]), float(level["sz"]), level["n"])
+
+
+def decode_l2_book(data: Any) -> L2Book:
+    bids, asks = data["levels"]
+    return L2Book(data["coin"], data["time"], [_decode_level(x) for x in bids], [_decode_level(x) for x in asks])
+
+
+def decode_bbo(data: Any) -> Bbo:
+    bid, ask = data["bbo"]
+    return Bbo(
+        data["coin"],
+        data["time"],
+        None if bid is None else _decode_level(bid),
+        None if ask is None else _decode_level(ask),
+    )
+
+
+def decode_trades(data: Any) -> Trades:
+    # an empty trades message doesn't name its coin
+    return Trades(
+        data[0]["coin"] if data else "",
+        [
+            TradeEvent(x["coin"], x["side"], float(x["px"]), float(x["sz"]), x["time"], x["hash"], x.get("tid", 0))
+            for x in data
+        ],
+    )
+
+
+def decode_all_mids(data: Any) -> AllMids:
+    return AllMids({coin: float(mid) for coin, mid in data["mids"].items()})
+
+
+def decode_fill(fill: Any) -> FillEvent:
+    return FillEvent(
+        fill["coin"],
+        float(fill["px"]),
+        float(fill["sz"]),
+        fill["side"],
+        fill["time"],
+        float(fill["startPosition"]),
+        fill["dir"],
+        float(fill["closedPnl"]),
+        fill["hash"],
+        fill["oid"],
+        fill["crossed"],
+        float(fill.get("fee", 0)),
+        fill.get("tid", 0),
+        fill.get("feeToken", ""),
+    )
+
+
+def decode_user_fills(data: Any) -> UserFills:
+    return UserFills(data["user"], data.get("isSnapshot", False), [decode_fill(x) for x in data["fills"]])
+
+
+DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "l2Book": decode_l2_book,
+    "bbo": decode_bbo,
+    "trades": decode_trades,
+    "allMids": decode_all_mids,
+    "userFills": decode_user_fills,
+}
+
+
+def decode_ws_msg(ws_msg: WsMsg) -> Any:
+    decoder = DECODERS.get(ws_msg["channel"])
+    if decoder is None:
+        return ws_msg
+    return decoder(ws_msg["data"])  # type: ignore
@@ -0,0 +1,103 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from hyperliquid.utils.types import Any, Callable, Deque, Hashable, Iterator, List, Optional, Set
+
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+
+# Most records the server returns for one request, a full page means there may be more in the window
+USER_FILLS_PAGE_LIMIT = 2000
+FUNDING_HISTORY_PAGE_LIMIT = 500
+CANDLES_PAGE_LIMIT = 5000
+
+Record = Any
+FetchWindow = Callable[[int, int], List[Record]]
+
+
+def fill_key(fill: Record) -> Hashable:
+    return fill["tid"] if "tid" in fill else (fill["hash"], fill["oid"], fill["time"])
+
+
+def funding_key(funding: Record) -> Hashable:
+    return funding["coin"], funding["time"]
+
+
+def user_funding_key(funding: Record) -> Hashable:
+    return funding["hash"], funding["time"], funding["delta"]["coin"]
+
+
+def candle_key(candle: Record) -> int:
+    return int(candle["t"])
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def fetch_window(
+    fetch: FetchWindow,
+    start: int,
+    end: int,
+    page_limit: int,
+    key: Callable[[Record], Hashable],
+    time_key: str = "time",
+) -> List[Record]:
+    """Fetch every record with a time in [start, end], requesting more pages while the server returns full ones.
+
+    The next page starts at the time of the last record, since several records can share a millisecond, and the
+    records already seen at that millisecond are dropped from it.
+    """
+    records: List[Record] = []
+    boundary_keys: Set[Hashable] = set()
+    while start <= end:
+        page = sorted(fetch(start, end), key=lambda record: record[time_key])
+        new = [record for record in page if key(record) not in boundary_keys]
+        records.extend(new)
+        if len(page) < page_limit:
+            break
+        last_time = page[-1][time_key]
+        if last_time == start:
+            # a whole page within one millisecond, there's no way to ask for the rest of it
+            logging.warning(f"More than {page_limit} records at {start}, skipping ahead to {last_time + 1}")
+            start = last_time + 1
+            boundary_keys = set()
+            continue
+        boundary_keys = {key(record) for record in page if record[time_key] == last_time}
+        start = last_time
+    return records
+
+
+def paginate(
+    fetch: FetchWindow,
+    start: int,
+    end: Optional[int],
+    window_ms: int,
+    page_limit: int,
+    key: Callable[[Record], Hashable],
+    time_key: str = "time",
+    max_workers: int = 4,
+) -> Iterator[Record]:
+    """Yield every record between start and end (inclusive, defaulting to now) in time order.
+
+    The range is split into windows of window_ms that are fetched concurrently, at most max_workers ahead of the
+    window being yielded, so memory is bounded by max_workers windows rather than the whole history.
+    """
+    end = now_ms() if end is None else end
+    windows = ((s, min(s + window_ms - 1, end)) for s in range(start, end + 1, window_ms))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight: "Deque[Future[List[Record]]]" = deque()
+        try:
+            for window_start, window_end in windows:
+                in_flight.append(
+                    executor.submit(fetch_window, fetch, window_start, window_end, page_limit, key, time_key)
+                )
+                if len(in_flight) >= max_workers:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
@@ -0,0 +1,193 @@
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+import time
+
+from hyperliquid.utils.error import RateLimitExceeded
+from hyperliquid.utils.types import Any, Dict, List, Literal, Optional
+
+# https://hyperliquid.gitbook.io/hyperliquid-docs/for-developers/api/rate-limits-and-user-limits
+# REST requests share a budget of 1200 weight per minute per IP.
+DEFAULT_CAPACITY = 1200
+DEFAULT_REFILL_PER_SECOND = DEFAULT_CAPACITY / 60
+INFO_REQUEST_WEIGHTS: Dict[str, int] = {
+    "l2Book": 2,
+    "allMids": 2,
+    "clearinghouseState": 2,
+    "orderStatus": 2,
+    "spotClearinghouseState": 2,
+    "exchangeStatus": 2,
+    "userRole": 60,
+}
+DEFAULT_INFO_REQUEST_WEIGHT = 20
+# Exchange actions weigh 1 + floor(batch_length / 40)
+EXCHANGE_BATCH_WEIGHT_DIVISOR = 40
+EXCHANGE_BATCH_KEYS = ("orders", "cancels", "modifies")
+
+# Lower values are served first when requests are waiting for budget
+PRIORITY_CANCEL = 0
+PRIORITY_EXCHANGE = 1
+PRIORITY_INFO = 2
+CANCEL_ACTION_TYPES = ("cancel", "cancelByCloid", "scheduleCancel")
+
+RateLimitMode = Literal["block", "fail_fast"]
+
+
+def _decoded(payload: Any) -> Any:
+    # API.post also accepts payloads already encoded as JSON bytes, whose weight and priority depend on their content
+    if isinstance(payload, (bytes, bytearray)):
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+    return payload
+
+
+def request_weight(url_path: str, payload: Any) -> int:
+    payload = _decoded(payload)
+    if url_path == "/exchange":
+        action = payload.get("action") if isinstance(payload, dict) else None
+        if not isinstance(action, dict):
+            return 1
+        batch_length = next((len(action[key]) for key in EXCHANGE_BATCH_KEYS if key in action), 0)
+        return 1 + batch_length // EXCHANGE_BATCH_WEIGHT_DIVISOR
+    if isinstance(payload, dict):
+        return INFO_REQUEST_WEIGHTS.get(payload.get("type", ""), DEFAULT_INFO_REQUEST_WEIGHT)
+    return DEFAULT_INFO_REQUEST_WEIGHT
+
+
+def request_priority(url_path: str, payload: Any) -> int:
+    if url_path != "/exchange":
+        return PRIORITY_INFO
+    payload = _decoded(payload)
+    action = payload.get("action") if isinstance(payload, dict) else None
+    if isinstance(action, dict) and action.get("type") in CANCEL_ACTION_TYPES:
+        return PRIORITY_CANCEL
+    return PRIORITY_EXCHANGE
+
+
+class RateLimiter:
+    """Token bucket that spends request weight before requests are sent instead of after the server returns 429.
+
+    Requests waiting for budget are served by priority, so cancels go ahead of other actions and info queries. In
+    "block" mode acquire waits for budget, in "fail_fast" mode it raises RateLimitExceeded instead. asyncio code can
+    await acquire_async, which waits without blocking the event loop.
+
+    The server limit is per IP, so every API object talking to the same endpoint from one process should use the same
+    limiter, e.g. RateLimiter.shared(base_url).
+    """
+
+    _shared: Dict[str, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        capacity: float = DEFAULT_CAPACITY,
+        refill_per_second: float = DEFAULT_REFILL_PER_SECOND,
+        mode: RateLimitMode = "block",
+    ):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.mode = mode
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._waiters: List[List[Any]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    @classmethod
+    def shared(cls, key: str, **kwargs: Any) -> "RateLimiter":
+        """Return the process-wide limiter for key, creating it with kwargs on first use.
+
+        Later calls may leave kwargs out, but raise ValueError if they pass settings the existing limiter doesn't have.
+        """
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(**kwargs)
+                return cls._shared[key]
+            limiter = cls._shared[key]
+            conflicting = {name: value for name, value in kwargs.items() if getattr(limiter, name) != value}
+            if conflicting:
+                raise ValueError(
+                    f"The shared RateLimiter for {key} already exists with other settings than {conflicting}"
+                )
+            return limiter
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def _wait_time(self, weight: float) -> float:
+        return max(0.0, (weight - self.tokens) / self.refill_per_second)
+
+    def _enqueue(self, weight: float, priority: int) -> List[Any]:
+        ticket = [priority, next(self._counter), weight]
+        heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: List[Any]) -> None:
+        self._waiters.remove(ticket)
+        heapq.heapify(self._waiters)
+        self._cond.notify_all()
+
+    def _try_take(self, ticket: List[Any]) -> Optional[float]:
+        # Returns None once ticket got its weight, otherwise how long to wait before trying again or -1 if ticket is
+        # behind other waiters
+        self._refill()
+        if self._waiters[0] is not ticket:
+            return -1.0
+        if self.tokens >= ticket[2]:
+            self.tokens -= ticket[2]
+            heapq.heappop(self._waiters)
+            self._cond.notify_all()
+            return None
+        return self._wait_time(ticket[2])
+
+    def _take_or_raise(self, weight: float) -> None:
+        self._refill()
+        if self._waiters or self.tokens < weight:
+            raise RateLimitExceeded(weight, self._wait_time(weight))
+        self.tokens -= weight
+
+    def acquire(self, weight: float, priority: int = PRIORITY_INFO) -> None:
+        weight = min(weight, self.capacity)
+        with self._lock:
+            if self.mode == "fail_fast":
+                self._take_or_raise(weight)
+                return
+            ticket = self._enqueue(weight, priority)
+            try:
+                while True:
+                    wait = self._try_take(ticket)
+                    if wait is None:
+                        return
+                    self._cond.wait(wait if wait >= 0 else None)
+            except BaseException:
+                if ticket in self._waiters:
+                    self._dequeue(ticket)
+                raise
+
+    async def acquire_async(self, weight: float, priority: int = PRIORITY_INFO) -> None:
+        weight = min(weight, self.capacity)
+        with self._lock:
+            if self.mode == "fail_fast":
+                self._take_or_raise(weight)
+                return
+            ticket = self._enqueue(weight, priority)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_take(ticket)
+                if wait is None:
+                    return
+                # waiting behind other requests, poll until this ticket is at the front
+                await asyncio.sleep(wait if wait >= 0 else 0.01)
+        except BaseException:
+            with self._lock:
+                if ticket in self._waiters:
+                    self._dequeue(ticket)
+            raise
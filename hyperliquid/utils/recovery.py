@@ -0,0 +1,225 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from eth_keys import keys
+from eth_utils import keccak
+
+from hyperliquid.utils.signing import USER_SIGNED_ACTION_TYPES, action_hash, address_to_bytes
+from hyperliquid.utils.types import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_CHUNK_SIZE = 1000
+
+EIP712_DOMAIN_TYPE_HASH = keccak(b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)")
+AGENT_TYPE_HASH = keccak(b"Agent(string source,bytes32 connectionId)")
+
+# (digest, v, r, s), enough to recover a signer
+RecoveryKey = Tuple[bytes, int, int, int]
+
+
+@lru_cache(maxsize=None)
+def domain_separator(name: str, chain_id: int) -> bytes:
+    return keccak(
+        EIP712_DOMAIN_TYPE_HASH
+        + keccak(name.encode())
+        + keccak(b"1")
+        + chain_id.to_bytes(32, "big")
+        + bytes(32)  # verifyingContract, the zero address
+    )
+
+
+L1_DOMAIN_SEPARATOR = domain_separator("Exchange", 1337)
+
+
+@lru_cache(maxsize=None)
+def _type_hash(primary_type: str, fields: Tuple[Tuple[str, str], ...]) -> bytes:
+    return keccak(f"{primary_type}({','.join(f'{type} {name}' for name, type in fields)})".encode())
+
+
+def _encode_value(type: str, value: Any) -> bytes:
+    if type == "string":
+        return keccak(value.encode())
+    if type == "address":
+        return bytes(address_to_bytes(value)).rjust(32, b"\x00")
+    if type == "bool":
+        return (1 if value else 0).to_bytes(32, "big")
+    if type == "bytes32":
+        return value if isinstance(value, bytes) else bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    if type.startswith("uint"):
+        return int(value).to_bytes(32, "big")
+    raise ValueError(f"Unsupported EIP-712 type {type}")
+
+
+def _digest(domain: bytes, struct_hash: bytes) -> bytes:
+    return keccak(b"\x19\x01" + domain + struct_hash)
+
+
+def user_signed_action_digest(action: Any, payload_types: List[Any], primary_type: str, is_mainnet: bool) -> bytes:
+    """The EIP-712 hash signed for a user signed action, as built by sign_user_signed_action.
+
+    Same result as hashing user_signed_payload with eth_account, without building the typed data document each time.
+    """
+    fields = tuple((field["name"], field["type"]) for field in payload_types)
+    encoded = [_type_hash(primary_type, fields)]
+    for name, type in fields:
+        if name == "hyperliquidChain":
+            value = "Mainnet" if is_mainnet else "Testnet"
+        elif type == "string":
+            # Exchange.approve_agent signs an unnamed agent with agentName "" and leaves the field out of the action
+            value = action.get(name, "")
+        else:
+            value = action[name]
+        encoded.append(_encode_value(type, value))
+    domain = domain_separator("HyperliquidSignTransaction", int(action["signatureChainId"], 16))
+    return _digest(domain, keccak(b"".join(encoded)))
+
+
+def l1_action_digest(
+    action: Any, active_pool: Optional[str], nonce: int, expires_after: Optional[int], is_mainnet: bool
+) -> bytes:
+    """The EIP-712 hash of the phantom agent signed for an L1 action, as built by sign_l1_action."""
+    source = b"a" if is_mainnet else b"b"
+    struct_hash = keccak(AGENT_TYPE_HASH + keccak(source) + action_hash(action, active_pool, nonce, expires_after))
+    return _digest(L1_DOMAIN_SEPARATOR, struct_hash)
+
+
+def signed_action_digest(signed_action: Any, is_mainnet: bool) -> bytes:
+    """The hash signed for a signed action in the format posted to /exchange: action, signature, nonce and the
+    optional vaultAddress and expiresAfter. User signed action types are hashed as such, others as L1 actions."""
+    action = signed_action["action"]
+    user_signed = USER_SIGNED_ACTION_TYPES.get(action["type"])
+    if user_signed is not None:
+        payload_types, primary_type = user_signed
+        return user_signed_action_digest(action, payload_types, primary_type, is_mainnet)
+    return l1_action_digest(
+        action,
+        signed_action.get("vaultAddress"),
+        signed_action["nonce"],
+        signed_action.get("expiresAfter"),
+        is_mainnet,
+    )
+
+
+def recovery_key(digest: bytes, signature: Any) -> RecoveryKey:
+    r, s = signature["r"], signature["s"]
+    return (
+        digest,
+        signature["v"],
+        int(r, 16) if isinstance(r, str) else r,
+        int(s, 16) if isinstance(s, str) else s,
+    )
+
+
+def recover_from_key(key: RecoveryKey) -> str:
+    digest, v, r, s = key
+    signature = keys.Signature(vrs=(v - 27 if v >= 27 else v, r, s))
+    return str(signature.recover_public_key_from_msg_hash(digest).to_checksum_address())
+
+
+def _recover_chunk(chunk: List[RecoveryKey]) -> List[str]:
+    return [recover_from_key(key) for key in chunk]
+
+
+class SignerCache:
+    """Signers already recovered, by digest and signature, evicted least recently used once max_entries is exceeded.
+
+    Replayed or resubmitted actions hash and sign the same, so their signer is only recovered once.
+    """
+
+    def __init__(self, max_entries: int = 1 << 20):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[RecoveryKey, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: RecoveryKey) -> Optional[str]:
+        signer = self._entries.get(key)
+        if signer is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return signer
+
+    def put(self, key: RecoveryKey, signer: str) -> None:
+        self._entries[key] = signer
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def recover_keys(
+    keys_to_recover: Sequence[RecoveryKey],
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[SignerCache] = None,
+) -> List[str]:
+    """Recover the signer of each key, in order.
+
+    Keys seen before, in cache or earlier in the batch, are only recovered once. The rest are recovered on a pool of
+    max_workers processes in chunks of chunk_size, or in this process when they fit in one chunk or max_workers is 1.
+    """
+    cache = SignerCache() if cache is None else cache
+    signers: Dict[RecoveryKey, str] = {}
+    missing: List[RecoveryKey] = []
+    for key in keys_to_recover:
+        if key in signers:
+            continue
+        signer = cache.get(key)
+        if signer is None:
+            # placeholder so duplicates within the batch are skipped, replaced below
+            signers[key] = ""
+            missing.append(key)
+        else:
+            signers[key] = signer
+    chunks = [missing[i : i + chunk_size] for i in range(0, len(missing), chunk_size)]
+    if len(chunks) <= 1 or max_workers == 1:
+        recovered = [_recover_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            recovered = list(executor.map(_recover_chunk, chunks))
+    for chunk, chunk_signers in zip(chunks, recovered):
+        for key, signer in zip(chunk, chunk_signers):
+            signers[key] = signer
+            cache.put(key, signer)
+    return [signers[key] for key in keys_to_recover]
+
+
+def recover_signers(
+    signed_actions: Iterable[Any],
+    is_mainnet: bool = True,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[SignerCache] = None,
+) -> List[str]:
+    """Batch version of recover_user_from_user_signed_action and recover_agent_or_user_from_l1_action.
+
+    Takes signed actions as posted to /exchange or found in replica cmds, dicts with action and signature plus the
+    nonce, vaultAddress and expiresAfter that L1 actions are hashed with, and returns their signers in order: the user
+    for user signed actions, the user or its agent wallet for L1 actions. Hashes are computed here, with the domain
+    separators and type hashes computed once, and the public key recovery is spread over processes.
+    """
+    keys_to_recover = [
+        recovery_key(signed_action_digest(signed_action, is_mainnet), signed_action["signature"])
+        for signed_action in signed_actions
+    ]
+    return recover_keys(keys_to_recover, max_workers, chunk_size, cache)
+
+
+def recover_users_from_user_signed_actions(
+    actions_and_signatures: Iterable[Tuple[Any, Any]],
+    is_mainnet: bool = True,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cache: Optional[SignerCache] = None,
+) -> List[str]:
+    """recover_signers for (action, signature) pairs of user signed actions, whose type selects the payload types."""
+    keys_to_recover = []
+    for action, signature in actions_and_signatures:
+        payload_types, primary_type = USER_SIGNED_ACTION_TYPES[action["type"]]
+        digest = user_signed_action_digest(action, payload_types, primary_type, is_mainnet)
+        keys_to_recover.append(recovery_key(digest, signature))
+    return recover_keys(keys_to_recover, max_workers, chunk_size, cache)
@@ -0,0 +1,92 @@
+import random
+import threading
+import time
+
+from hyperliquid.utils.error import CircuitOpenError
+from hyperliquid.utils.types import Any
+
+# Actions that can safely be sent twice because the exchange deduplicates them by cloid
+CLOID_ACTION_KEYS = {"order": "orders", "batchModify": "modifies"}
+
+
+def is_idempotent(url_path: str, payload: Any) -> bool:
+    """Whether resending payload can't cause a second effect on the exchange.
+
+    /info requests only read. Exchange actions are only idempotent when every order in them carries a cloid, or when
+    cancelling by cloid.
+    """
+    if url_path == "/info":
+        return True
+    action = payload.get("action") if isinstance(payload, dict) else None
+    if not isinstance(action, dict):
+        return False
+    if action.get("type") == "cancelByCloid":
+        return True
+    key = CLOID_ACTION_KEYS.get(action.get("type", ""))
+    if key is None or not action.get(key):
+        return False
+    return all("c" in order or "c" in order.get("order", {}) for order in action[key])
+
+
+class RetryPolicy:
+    """Retries idempotent requests that failed with a connection error, a timeout or a 5xx response.
+
+    Waits between attempts use full jitter: a random duration up to backoff_base * 2**attempt, capped at backoff_max.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.1, backoff_max: float = 2.0):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))  # nosec B311
+
+
+class CircuitBreaker:
+    """Fails requests fast with CircuitOpenError while the endpoint looks unhealthy.
+
+    The circuit opens after failure_threshold consecutive failures. Once reset_timeout seconds have passed a single
+    trial request is let through: its success closes the circuit again and its failure keeps it open for another
+    reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.failure_threshold
+
+    def before_request(self) -> None:
+        with self._lock:
+            if not self.is_open:
+                return
+            retry_after = self.opened_at + self.reset_timeout - time.monotonic()
+            if retry_after > 0 or self._trial_in_flight:
+                raise CircuitOpenError(max(retry_after, 0))
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Let another trial request through after one that failed for a reason unrelated to the endpoint."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.is_open:
+                self.opened_at = time.monotonic()
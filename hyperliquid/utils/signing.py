@@ -129,6 +129,20 @@ CONVERT_TO_MULTI_SIG_USER_SIGN_TYPES = [
     {"name": "nonce", "type": "uint64"},
 ]
 
+APPROVE_AGENT_SIGN_TYPES = [
+    {"name": "hyperliquidChain", "type": "string"},
+    {"name": "agentAddress", "type": "address"},
+    {"name": "agentName", "type": "string"},
+    {"name": "nonce", "type": "uint64"},
+]
+
+APPROVE_BUILDER_FEE_SIGN_TYPES = [
+    {"name": "hyperliquidChain", "type": "string"},
+    {"name": "maxFeeRate", "type": "string"},
+    {"name": "builder", "type": "address"},
+    {"name": "nonce", "type": "uint64"},
+]
+
 MULTI_SIG_ENVELOPE_SIGN_TYPES = [
     {"name": "hyperliquidChain", "type": "string"},
     {"name": "multiSigActionHash", "type": "bytes32"},
@@ -136,6 +150,20 @@ MULTI_SIG_ENVELOPE_SIGN_TYPES = [
 ]
 
 
+# EIP-712 payload types and primary type of each user signed action type, the other actions are signed as L1 actions
+USER_SIGNED_ACTION_TYPES = {
+    "usdSend": (USD_SEND_SIGN_TYPES, "HyperliquidTransaction:UsdSend"),
+    "spotSend": (SPOT_TRANSFER_SIGN_TYPES, "HyperliquidTransaction:SpotSend"),
+    "withdraw3": (WITHDRAW_SIGN_TYPES, "HyperliquidTransaction:Withdraw"),
+    "usdClassTransfer": (USD_CLASS_TRANSFER_SIGN_TYPES, "HyperliquidTransaction:UsdClassTransfer"),
+    "sendAsset": (SEND_ASSET_SIGN_TYPES, "HyperliquidTransaction:SendAsset"),
+    "tokenDelegate": (TOKEN_DELEGATE_TYPES, "HyperliquidTransaction:TokenDelegate"),
+    "convertToMultiSigUser": (CONVERT_TO_MULTI_SIG_USER_SIGN_TYPES, "HyperliquidTransaction:ConvertToMultiSigUser"),
+    "approveAgent": (APPROVE_AGENT_SIGN_TYPES, "HyperliquidTransaction:ApproveAgent"),
+    "approveBuilderFee": (APPROVE_BUILDER_FEE_SIGN_TYPES, "HyperliquidTransaction:ApproveBuilderFee"),
+}
+
+
 def order_type_to_wire(order_type: OrderType) -> OrderTypeWire:
     if "limit" in order_type:
         return {"limit": order_type["limit"]}
@@ -376,12 +404,7 @@ def sign_agent(wallet, action, is_mainnet):
     return sign_user_signed_action(
         wallet,
         action,
-        [
-            {"name": "hyperliquidChain", "type": "string"},
-            {"name": "agentAddress", "type": "address"},
-            {"name": "agentName", "type": "string"},
-            {"name": "nonce", "type": "uint64"},
-        ],
+        APPROVE_AGENT_SIGN_TYPES,
         "HyperliquidTransaction:ApproveAgent",
         is_mainnet,
     )
@@ -391,12 +414,7 @@ def sign_approve_builder_fee(wallet, action, is_mainnet):
     return sign_user_signed_action(
         wallet,
         action,
-        [
-            {"name": "hyperliquidChain", "type": "string"},
-            {"name": "maxFeeRate", "type": "string"},
-            {"name": "builder", "type": "address"},
-            {"name": "nonce", "type": "uint64"},
-        ],
+        APPROVE_BUILDER_FEE_SIGN_TYPES,
         "HyperliquidTransaction:ApproveBuilderFee",
         is_mainnet,
     )
@@ -1,6 +1,24 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Tuple, TypedDict, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 from typing_extensions import NotRequired
 
 Any = Any
@@ -9,6 +27,12 @@ cast = cast
 Callable = Callable
 NamedTuple = NamedTuple
 NotRequired = NotRequired
+Deque = Deque
+Hashable = Hashable
+Iterable = Iterable
+Iterator = Iterator
+Sequence = Sequence
+Set = Set
 
 AssetInfo = TypedDict("AssetInfo", {"name": str, "szDecimals": int})
 Meta = TypedDict("Meta", {"universe": List[AssetInfo]})
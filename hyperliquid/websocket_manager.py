@@ -1,12 +1,18 @@
-import json
 import logging
 import threading
-from collections import defaultdict
 
 import websocket
 
+from hyperliquid.utils.codec import DEFAULT_CODEC, Codec
+from hyperliquid.utils.messages import decode_ws_msg
 from hyperliquid.utils.types import Any, Callable, Dict, List, NamedTuple, Optional, Subscription, Tuple, WsMsg
 
+# Channels whose messages can't be attributed to a user, see WebsocketManager.user_channel_owner
+USER_CHANNEL_IDENTIFIERS = ("userEvents", "orderUpdates")
+
+PING_MSG = b'{"method":"ping"}'
+CONNECTION_ESTABLISHED_MSGS = ("Websocket connection established.", b"Websocket connection established.")
+
 ActiveSubscription = NamedTuple("ActiveSubscription", [("callback", Callable[[Any], None]), ("subscription_id", int)])
 
 
@@ -75,12 +81,21 @@ def ws_msg_to_identifier(ws_msg: WsMsg) -> Optional[str]:
 
 
 class WebsocketManager(threading.Thread):
-    def __init__(self, base_url):
+    def __init__(self, base_url: str, decode_msgs: bool = False, codec: Optional[Codec] = None):
         super().__init__()
+        self.codec = codec or DEFAULT_CODEC
+        # when set, callbacks of the channels in hyperliquid.utils.messages.DECODERS get decoded objects
+        self.decode_msgs = decode_msgs
         self.subscription_id_counter = 0
         self.ws_ready = False
         self.queued_subscriptions: List[Tuple[Subscription, ActiveSubscription]] = []
-        self.active_subscriptions: Dict[str, List[ActiveSubscription]] = defaultdict(list)
+        # on_message reads this registry from the websocket thread without locking. Writers hold subscriptions_lock and
+        # replace the callback tuples instead of mutating them, and identifiers without callbacks are removed.
+        self.active_subscriptions: Dict[str, Tuple[ActiveSubscription, ...]] = {}
+        self.subscriptions_lock = threading.Lock()
+        # userEvents and orderUpdates messages don't include the user, so a single connection can only carry
+        # those channels for one user at a time
+        self.user_channel_owner: Optional[str] = None
         ws_url = "ws" + base_url[len("http") :] + "/ws"
         self.ws = websocket.WebSocketApp(ws_url, on_message=self.on_message, on_open=self.on_open)
         self.ping_sender = threading.Thread(target=self.send_ping)
@@ -88,14 +103,16 @@ class WebsocketManager(threading.Thread):
 
     def run(self):
         self.ping_sender.start()
-        self.ws.run_forever()
+        # Messages are handed to the codec as bytes, which validates UTF-8 while parsing, so websocket-client doesn't
+        # need to decode and validate every frame first
+        self.ws.run_forever(skip_utf8_validation=True)
 
     def send_ping(self):
         while not self.stop_event.wait(50):
             if not self.ws.keep_running:
                 break
             logging.debug("Websocket sending ping")
-            self.ws.send(json.dumps({"method": "ping"}))
+            self.ws.send(PING_MSG)
         logging.debug("Websocket ping sender stopped")
 
     def stop(self):
@@ -105,11 +122,11 @@ class WebsocketManager(threading.Thread):
             self.ping_sender.join()
 
     def on_message(self, _ws, message):
-        if message == "Websocket connection established.":
+        if message in CONNECTION_ESTABLISHED_MSGS:
             logging.debug(message)
             return
-        logging.debug(f"on_message {message}")
-        ws_msg: WsMsg = json.loads(message)
+        logging.debug("on_message %s", message)
+        ws_msg: WsMsg = self.codec.loads(message)
         identifier = ws_msg_to_identifier(ws_msg)
         if identifier == "pong":
             logging.debug("Websocket received pong")
@@ -117,46 +134,75 @@ class WebsocketManager(threading.Thread):
         if identifier is None:
             logging.debug("Websocket not handling empty message")
             return
-        active_subscriptions = self.active_subscriptions[identifier]
+        active_subscriptions = self.active_subscriptions.get(identifier, ())
         if len(active_subscriptions) == 0:
             print("Websocket message from an unexpected subscription:", message, identifier)
         else:
+            msg = decode_ws_msg(ws_msg) if self.decode_msgs else ws_msg
             for active_subscription in active_subscriptions:
-                active_subscription.callback(ws_msg)
+                active_subscription.callback(msg)
 
     def on_open(self, _ws):
         logging.debug("on_open")
-        self.ws_ready = True
-        for subscription, active_subscription in self.queued_subscriptions:
+        with self.subscriptions_lock:
+            self.ws_ready = True
+            queued_subscriptions = self.queued_subscriptions
+            self.queued_subscriptions = []
+        for subscription, active_subscription in queued_subscriptions:
             self.subscribe(subscription, active_subscription.callback, active_subscription.subscription_id)
 
     def subscribe(
         self, subscription: Subscription, callback: Callable[[Any], None], subscription_id: Optional[int] = None
     ) -> int:
-        if subscription_id is None:
-            self.subscription_id_counter += 1
-            subscription_id = self.subscription_id_counter
-        if not self.ws_ready:
-            logging.debug("enqueueing subscription")
-            self.queued_subscriptions.append((subscription, ActiveSubscription(callback, subscription_id)))
-        else:
-            logging.debug("subscribing")
-            identifier = subscription_to_identifier(subscription)
-            if identifier == "userEvents" or identifier == "orderUpdates":
-                # TODO: ideally the userEvent and orderUpdates messages would include the user so that we can multiplex
-                if len(self.active_subscriptions[identifier]) != 0:
-                    raise NotImplementedError(f"Cannot subscribe to {identifier} multiple times")
-            self.active_subscriptions[identifier].append(ActiveSubscription(callback, subscription_id))
-            self.ws.send(json.dumps({"method": "subscribe", "subscription": subscription}))
+        identifier = subscription_to_identifier(subscription)
+        with self.subscriptions_lock:
+            if subscription_id is None:
+                self.subscription_id_counter += 1
+                subscription_id = self.subscription_id_counter
+            if identifier in USER_CHANNEL_IDENTIFIERS:
+                user = subscription["user"].lower()  # type: ignore
+                if self.user_channel_owner is not None and self.user_channel_owner != user:
+                    raise NotImplementedError(f"Cannot subscribe to {identifier} for multiple users on one connection")
+                self.user_channel_owner = user
+            active_subscription = ActiveSubscription(callback, subscription_id)
+            if not self.ws_ready:
+                logging.debug("enqueueing subscription")
+                self.queued_subscriptions.append((subscription, active_subscription))
+                return subscription_id
+            self.active_subscriptions[identifier] = self.active_subscriptions.get(identifier, ()) + (
+                active_subscription,
+            )
+        logging.debug("subscribing")
+        self.ws.send(self.codec.dumps({"method": "subscribe", "subscription": subscription}))
         return subscription_id
 
+    def has_subscriptions(self) -> bool:
+        with self.subscriptions_lock:
+            return bool(self.active_subscriptions or self.queued_subscriptions)
+
     def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
-        if not self.ws_ready:
-            raise NotImplementedError("Can't unsubscribe before websocket connected")
         identifier = subscription_to_identifier(subscription)
-        active_subscriptions = self.active_subscriptions[identifier]
-        new_active_subscriptions = [x for x in active_subscriptions if x.subscription_id != subscription_id]
+        with self.subscriptions_lock:
+            if not self.ws_ready:
+                # not sent yet, so it only has to leave the queue
+                queued_subscriptions = [x for x in self.queued_subscriptions if x[1].subscription_id != subscription_id]
+                removed = len(queued_subscriptions) != len(self.queued_subscriptions)
+                self.queued_subscriptions = queued_subscriptions
+                if identifier in USER_CHANNEL_IDENTIFIERS and all(
+                    subscription_to_identifier(x[0]) not in USER_CHANNEL_IDENTIFIERS for x in queued_subscriptions
+                ):
+                    self.user_channel_owner = None
+                return removed
+            active_subscriptions = self.active_subscriptions.get(identifier, ())
+            new_active_subscriptions = tuple(x for x in active_subscriptions if x.subscription_id != subscription_id)
+            if len(new_active_subscriptions) == 0:
+                self.active_subscriptions.pop(identifier, None)
+                if identifier in USER_CHANNEL_IDENTIFIERS and all(
+                    x not in self.active_subscriptions for x in USER_CHANNEL_IDENTIFIERS
+                ):
+                    self.user_channel_owner = None
+            else:
+                self.active_subscriptions[identifier] = new_active_subscriptions
         if len(new_active_subscriptions) == 0:
-            self.ws.send(json.dumps({"method": "unsubscribe", "subscription": subscription}))
-        self.active_subscriptions[identifier] = new_active_subscriptions
+            self.ws.send(self.codec.dumps({"method": "unsubscribe", "subscription": subscription}))
         return len(active_subscriptions) != len(new_active_subscriptions)
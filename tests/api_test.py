@@ -0,0 +1,99 @@
+import time
+
+import pytest
+import requests
+
+from hyperliquid.api import API
+from hyperliquid.utils.error import CircuitOpenError, ServerError
+from hyperliquid.utils.retry import CircuitBreaker, RetryPolicy, is_idempotent
+
+NO_BACKOFF = RetryPolicy(max_attempts=3, backoff_base=0)
+
+
+def test_info_requests_are_retried_after_5xx(stand_in):
+    server = stand_in([502, 503])
+    api = API(server.url, retry_policy=NO_BACKOFF)
+    assert api.post("/info", {"type": "allMids"}) == {"ok": True}
+    assert len(server.requests) == 3
+
+
+def test_retries_give_up_after_max_attempts(stand_in):
+    server = stand_in([500, 500, 500, 500])
+    api = API(server.url, retry_policy=NO_BACKOFF)
+    with pytest.raises(ServerError):
+        api.post("/info", {"type": "allMids"})
+    assert len(server.requests) == 3
+
+
+def test_exchange_actions_without_cloid_are_not_retried(stand_in):
+    server = stand_in([502])
+    api = API(server.url, retry_policy=NO_BACKOFF)
+    with pytest.raises(ServerError):
+        api.post("/exchange", {"action": {"type": "order", "orders": [{"a": 0}]}})
+    assert len(server.requests) == 1
+
+
+def test_exchange_orders_with_cloid_are_retried(stand_in):
+    server = stand_in([502])
+    api = API(server.url, retry_policy=NO_BACKOFF)
+    api.post("/exchange", {"action": {"type": "order", "orders": [{"a": 0, "c": "0x" + "0" * 32}]}})
+    assert len(server.requests) == 2
+
+
+def test_read_timeout_is_retried(stand_in):
+    server = stand_in(["hang"])
+    api = API(server.url, timeout=(1, 0.1), retry_policy=NO_BACKOFF)
+    assert api.post("/info", {"type": "allMids"}) == {"ok": True}
+
+
+def test_read_timeout_without_retry_policy_raises(stand_in):
+    server = stand_in(["hang"])
+    api = API(server.url, timeout=0.1)
+    with pytest.raises(requests.Timeout):
+        api.post("/info", {"type": "allMids"})
+
+
+def test_circuit_breaker_fails_fast_then_recovers(stand_in):
+    server = stand_in([500, 500])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    api = API(server.url, circuit_breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            api.post("/info", {"type": "allMids"})
+    with pytest.raises(CircuitOpenError):
+        api.post("/info", {"type": "allMids"})
+    assert len(server.requests) == 2
+    time.sleep(0.1)
+    assert api.post("/info", {"type": "allMids"}) == {"ok": True}
+    assert not breaker.is_open
+
+
+def test_circuit_breaker_recovers_after_unrelated_error_on_trial(stand_in, monkeypatch):
+    server = stand_in([500, 500])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    api = API(server.url, circuit_breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            api.post("/info", {"type": "allMids"})
+    time.sleep(0.1)
+    post = api.session.post
+
+    def broken_post(*args, **kwargs):
+        monkeypatch.setattr(api.session, "post", post)
+        raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    monkeypatch.setattr(api.session, "post", broken_post)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        api.post("/info", {"type": "allMids"})
+    assert api.post("/info", {"type": "allMids"}) == {"ok": True}
+    assert not breaker.is_open
+
+
+def test_is_idempotent():
+    assert is_idempotent("/info", {"type": "meta"})
+    assert is_idempotent("/exchange", {"action": {"type": "cancelByCloid", "cancels": []}})
+    assert not is_idempotent("/exchange", {"action": {"type": "cancel", "cancels": []}})
+    assert is_idempotent(
+        "/exchange", {"action": {"type": "batchModify", "modifies": [{"oid": 1, "order": {"c": "0x"}}]}}
+    )
+    assert not is_idempotent("/exchange", {"action": {"type": "order", "orders": [{"c": "0x"}, {"a": 1}]}})
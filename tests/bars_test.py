@@ -0,0 +1,71 @@
+import pytest
+
+from hyperliquid.bars import Bar, BarBuilder, BarRing, BarSpec
+from hyperliquid.utils.messages import decode_trades
+
+SECOND = BarSpec("time", 1000)
+
+
+def trades_msg(*trades):
+    return {
+        "channel": "trades",
+        "data": [
+            {"coin": coin, "side": "B", "px": str(px), "sz": str(sz), "time": t, "hash": "0x0", "tid": i}
+            for i, (coin, px, sz, t) in enumerate(trades)
+        ],
+    }
+
+
+def test_time_bars_close_on_the_next_interval():
+    closed = []
+    builder = BarBuilder([SECOND], on_bar=lambda coin, spec, bar: closed.append((coin, bar)))
+    builder.on_trades(trades_msg(("BTC", 10, 1, 1000), ("BTC", 12, 1, 1500), ("BTC", 9, 2, 1999)))
+    builder.on_trades(trades_msg(("ETH", 5, 1, 1200), ("BTC", 11, 1, 3100)))
+    assert closed == [("BTC", Bar(1000, 10, 12, 9, 9, 4, 3))]
+    builder.flush(3000)
+    assert closed[-1] == ("ETH", Bar(1000, 5, 5, 5, 5, 1, 1))
+    assert builder.bars("BTC", SECOND).current() == Bar(3000, 11, 11, 11, 11, 1, 1)
+
+
+def test_volume_bars_split_large_trades():
+    spec = BarSpec("volume", 2)
+    builder = BarBuilder([spec])
+    builder.add_trade("BTC", 10, 1.5, 1)
+    builder.add_trade("BTC", 11, 3, 2)
+    assert [(bar.v, bar.n) for bar in builder.bars("BTC", spec).bars()] == [(2, 2), (2, 0)]
+    current = builder.bars("BTC", spec).current()
+    assert current is not None and (current.v, current.n) == (0.5, 0)
+
+
+def test_late_trades_into_closed_periods_are_dropped():
+    builder = BarBuilder([SECOND])
+    builder.on_trades(trades_msg(("BTC", 10, 1, 1000), ("BTC", 11, 1, 2100), ("BTC", 13, 1, 1900)))
+    ring = builder.bars("BTC", SECOND)
+    assert ring.bars() == [Bar(1000, 10, 10, 10, 10, 1, 1)]
+    assert ring.current() == Bar(2000, 11, 11, 11, 11, 1, 1)
+    assert ring.late_dropped == 1
+    builder.flush(3000)
+    builder.add_trade("BTC", 12, 1, 2500)
+    assert ring.current() is None
+    assert [bar.t for bar in ring.bars()] == [1000, 2000]
+    assert ring.late_dropped == 2
+
+
+def test_tick_bars_and_decoded_trades():
+    spec = BarSpec("tick", 2)
+    builder = BarBuilder([spec, SECOND])
+    builder.on_trades(decode_trades(trades_msg(("BTC", 1, 1, 0), ("BTC", 3, 1, 1), ("BTC", 2, 1, 2))["data"]))
+    assert builder.bars("BTC", spec).bars() == [Bar(0, 1, 3, 1, 3, 2, 2)]
+    with pytest.raises(KeyError):
+        builder.bars("BTC", BarSpec("tick", 3))
+
+
+def test_ring_keeps_the_last_bars():
+    ring = BarRing(3)
+    for i in range(5):
+        ring.add(i, float(i), 1)
+        ring.close()
+    assert [bar.t for bar in ring.bars()] == [2, 3, 4]
+    assert ring[-1].t == 4
+    with pytest.raises(IndexError):
+        ring[3]
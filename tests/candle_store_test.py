@@ -0,0 +1,118 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import hyperliquid.info
+from hyperliquid.candle_store import INTERVAL_MS, CandleStore
+from hyperliquid.info import Info
+from hyperliquid.utils.types import Any, List, Meta, SpotMeta, Tuple
+
+TEST_META: Meta = {"universe": [{"name": "BTC", "szDecimals": 5}]}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+HOUR = INTERVAL_MS["1h"]
+
+
+def candle(t, close="100.5"):
+    return {
+        "t": t,
+        "T": t + HOUR - 1,
+        "s": "BTC",
+        "i": "1h",
+        "o": "100",
+        "h": "101",
+        "l": "99",
+        "c": close,
+        "v": "2.5",
+        "n": 7,
+    }
+
+
+class StubInfo(Info):
+    # serves the first 100 hourly candles and records the (start, end) of every request
+    def __init__(self) -> None:
+        super().__init__(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+        self.ws_manager = hyperliquid.info.WebsocketManager(self.base_url)
+        self.requests: List[Tuple[int, int]] = []
+
+    def candles_snapshot(self, name: str, interval: str, startTime: int, endTime: int) -> Any:
+        self.requests.append((startTime, endTime))
+        return [candle(t) for t in range(0, 100 * HOUR, HOUR) if startTime <= t <= endTime]
+
+
+@pytest.fixture
+def info(fake_ws_manager):
+    return StubInfo()
+
+
+def test_sync_only_fetches_missing_ranges(tmp_path, info):
+    store = CandleStore(str(tmp_path), info)
+    assert store.sync("BTC", "1h", 10 * HOUR, 20 * HOUR) == 11
+    info.requests.clear()
+    assert store.sync("BTC", "1h", 0, 30 * HOUR) == 20
+    assert info.requests == [(0, 10 * HOUR - 1), (20 * HOUR + 1, 30 * HOUR)]
+    candles = store.candles("BTC", "1h", 0, 30 * HOUR)
+    assert list(candles["t"]) == list(range(0, 31 * HOUR, HOUR))
+    assert candles["c"][0] == 100.5 and candles["n"].dtype == np.int64
+
+
+def test_sync_requests_candles_without_holding_the_series_lock(tmp_path, info, monkeypatch):
+    store = CandleStore(str(tmp_path), info)
+    series = store.series("BTC", "1h")
+    lock_held: List[bool] = []
+    candles_snapshot = info.candles_snapshot
+
+    def checking_candles_snapshot(*args):
+        lock_held.append(series.lock.locked())
+        return candles_snapshot(*args)
+
+    monkeypatch.setattr(info, "candles_snapshot", checking_candles_snapshot)
+    assert store.sync("BTC", "1h", 0, 20 * HOUR) == 21
+    assert lock_held == [False]
+
+
+def test_candles_are_read_only_views_that_survive_reopening(tmp_path, info):
+    store = CandleStore(str(tmp_path), info)
+    store.sync("BTC", "1h", 0, 99 * HOUR)
+    store.close()
+    reopened = CandleStore(str(tmp_path), info)
+    info.requests.clear()
+    assert reopened.sync("BTC", "1h", 0, 99 * HOUR) == 0
+    closes = reopened.candles("BTC", "1h", 5 * HOUR, 9 * HOUR)["c"]
+    assert len(closes) == 5 and isinstance(closes.base, np.memmap)
+    with pytest.raises(ValueError):
+        closes[0] = 0
+
+
+def test_follow_appends_and_updates_live_candles(tmp_path, info):
+    store = CandleStore(str(tmp_path), info)
+    store.sync("BTC", "1h", 0, 2 * HOUR)
+    store.follow("BTC", "1h")
+    for msg in (candle(3 * HOUR, "1"), candle(3 * HOUR, "2"), candle(4 * HOUR, "3")):
+        info.ws_manager.on_message(None, json.dumps({"channel": "candle", "data": msg}))
+    assert list(store.candles("BTC", "1h", 3 * HOUR, 4 * HOUR)["c"]) == [2.0, 3.0]
+    store.close()
+    assert info.ws_manager.active_subscriptions == {}
+
+
+def test_series_grow_past_initial_capacity(tmp_path):
+    store = CandleStore(str(tmp_path))
+    series = store.series("BTC", "1m")
+    series.write(CandleStore.to_columns([candle(t) for t in range(3000)]))
+    assert series.capacity == 4096
+    assert list(store.candles("BTC", "1m", 2998, 5000)["t"]) == [2998, 2999]
+
+
+def test_views_stay_valid_after_the_series_grows(tmp_path):
+    store = CandleStore(str(tmp_path))
+    series = store.series("BTC", "1m")
+    series.write(CandleStore.to_columns([candle(t) for t in range(1000)]))
+    view = store.candles("BTC", "1m", 0, 10)["t"]
+    series.write(CandleStore.to_columns([candle(t) for t in range(1000, 5000)]))
+    assert series.capacity == 8192
+    assert list(view) == list(range(11))
+    assert not [name for name in os.listdir(series.path) if name.endswith(".tmp")]
+    series.write_index()
+    reopened = CandleStore(str(tmp_path)).series("BTC", "1m")
+    assert reopened.length == 5000 and reopened.capacity == 8192
@@ -0,0 +1,34 @@
+import pytest
+
+from hyperliquid.utils.codec import CODECS, DEFAULT_CODEC, get_codec
+
+
+def available_codecs():
+    names = []
+    for name in CODECS:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codec_round_trip(name):
+    codec = get_codec(name)
+    payload = {"type": "l2Book", "coin": "BTC", "levels": [[{"px": "1.5", "sz": "2", "n": 1}], []], "big": 2**70}
+    encoded = codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == payload
+    assert codec.loads(encoded.decode("utf-8")) == payload
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codec_raises_value_error(name):
+    with pytest.raises(ValueError):
+        get_codec(name).loads(b"<html>bad gateway</html>")
+
+
+def test_default_codec_is_the_first_installed():
+    assert DEFAULT_CODEC.name == available_codecs()[0]
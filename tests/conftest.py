@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import websocket
+
+import hyperliquid.info
+from hyperliquid.utils.types import Any, List, Tuple, Union
+from hyperliquid.websocket_manager import WebsocketManager
+
+
+class StandInServer:
+    """Local stand-in for the API that answers every POST with the next scripted behaviour.
+
+    A behaviour is an HTTP status code, or "hang" to hold the request past the client's read timeout. Once the script
+    runs out every request gets a 200 with {"ok": true}, after delay seconds.
+    """
+
+    def __init__(self, script=(), delay=0.0):
+        self.script = list(script)
+        self.delay = delay
+        self.requests: List[Tuple[str, Any]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                server.requests.append((self.path, json.loads(body)))
+                behaviour = server.script.pop(0) if server.script else 200
+                if behaviour == "hang":
+                    time.sleep(0.5)
+                    behaviour = 200
+                time.sleep(server.delay)
+                response = json.dumps({"ok": True} if behaviour == 200 else {"code": behaviour}).encode()
+                self.send_response(behaviour)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, *_args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(script=(), delay=0.0):
+        servers.append(StandInServer(script, delay))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+class RecordingWebSocketApp(websocket.WebSocketApp):
+    def __init__(self, url: str):
+        super().__init__(url)
+        self.sent: List[Union[bytes, str]] = []
+
+    def send(self, data: Union[bytes, str], opcode: int = websocket.ABNF.OPCODE_TEXT) -> None:
+        self.sent.append(data)
+
+
+class FakeWebsocketManager(WebsocketManager):
+    """WebsocketManager that never connects: it is ready right away, records what it sends and stop only marks it."""
+
+    instances = 0
+
+    def __init__(self, base_url, decode_msgs=False, codec=None):
+        super().__init__(base_url, decode_msgs, codec)
+        self.ws_ready = True
+        self.ws = RecordingWebSocketApp(self.ws.url)
+        self.sent = self.ws.sent
+        self.stopped = False
+        FakeWebsocketManager.instances += 1
+
+    def start(self):
+        pass
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def fake_ws_manager(monkeypatch):
+    # Info creates FakeWebsocketManagers instead of connecting
+    monkeypatch.setattr(hyperliquid.info, "WebsocketManager", FakeWebsocketManager)
+    FakeWebsocketManager.instances = 0
+    return FakeWebsocketManager
@@ -0,0 +1,101 @@
+import socket
+
+import eth_account
+import pytest
+
+from hyperliquid.api import API
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.endpoints import EndpointPool
+from hyperliquid.utils.error import CircuitOpenError, ServerError
+from hyperliquid.utils.recovery import recover_signers
+from hyperliquid.utils.retry import CircuitBreaker
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+def unused_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+def test_probe_ranks_endpoints_by_rtt(stand_in):
+    slow = stand_in(delay=0.05)
+    fast = stand_in()
+    pool = EndpointPool([slow.url, fast.url])
+    pool.probe()
+    assert pool.best() == fast.url
+    assert slow.requests[0] == ("/info", {"type": "exchangeStatus"})
+
+
+def test_dead_endpoints_are_ranked_last(stand_in):
+    server = stand_in()
+    dead = unused_url()
+    pool = EndpointPool([dead, server.url])
+    pool.probe()
+    assert pool.candidates() == [server.url, dead]
+
+
+def test_requests_fail_over_to_the_next_endpoint(stand_in):
+    server = stand_in()
+    dead = unused_url()
+    pool = EndpointPool([dead, server.url])
+    api = API(endpoint_pool=pool)
+    assert api.base_url == dead
+    assert api.post("/info", {"type": "allMids"}) == {"ok": True}
+    assert pool.best() == server.url
+
+
+def test_an_open_circuit_only_skips_its_own_endpoint(stand_in):
+    failing = stand_in([502])
+    other = stand_in()
+    pool = EndpointPool([failing.url, other.url], cooldown=0)
+    api = API(endpoint_pool=pool, circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+    with pytest.raises(ServerError):
+        api.post("/exchange", {"action": {"type": "order", "orders": [{"a": 0}]}})
+    # the pool ranks the failing endpoint first again, but its circuit is open
+    assert pool.best() == failing.url
+    assert api.post("/info", {"type": "allMids"}) == {"ok": True}
+    assert len(failing.requests) == 1 and len(other.requests) == 1
+    api.endpoint_circuit_breakers[other.url].record_failure()
+    with pytest.raises(CircuitOpenError):
+        api.post("/info", {"type": "allMids"})
+
+
+def test_non_idempotent_actions_do_not_fail_over(stand_in):
+    server = stand_in([502])
+    other = stand_in()
+    api = API(endpoint_pool=EndpointPool([server.url, other.url]))
+    with pytest.raises(Exception):
+        api.post("/exchange", {"action": {"type": "order", "orders": [{"a": 0}]}})
+    assert other.requests == []
+    api.post("/exchange", {"action": {"type": "order", "orders": [{"a": 0}]}})
+    assert len(other.requests) == 1
+
+
+def test_unhealthy_endpoints_recover_after_cooldown():
+    first, second = "http://127.0.0.1:1", "http://127.0.0.1:2"
+    pool = EndpointPool([first, second], cooldown=0)
+    pool.record_failure(first)
+    assert pool.best() == first
+
+
+def test_exchange_signs_for_the_chain_of_base_url_not_the_best_endpoint(stand_in):
+    local_node = stand_in()
+    wallet = eth_account.Account.create()
+    pool = EndpointPool([local_node.url, MAINNET_API_URL])
+    assert pool.best() == local_node.url
+    exchange = Exchange(wallet, MAINNET_API_URL, TEST_META, spot_meta=TEST_SPOT_META, endpoint_pool=pool)
+    assert exchange.is_mainnet
+    exchange.usd_transfer(1, "0x5e9ee1089755c3435139848e47e6635505d5a13a")
+    path, signed_action = local_node.requests[-1]
+    assert path == "/exchange"
+    assert recover_signers([signed_action], is_mainnet=True) == [wallet.address]
+
+
+def test_exchange_needs_a_base_url_with_an_endpoint_pool():
+    with pytest.raises(ValueError):
+        Exchange(eth_account.Account.create(), meta=TEST_META, endpoint_pool=EndpointPool([MAINNET_API_URL]))
@@ -0,0 +1,177 @@
+import json
+import os
+import sys
+
+import eth_account
+import pytest
+
+from hyperliquid.utils.types import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "examples"))
+from evm_block_indexer import (  # noqa: E402
+    BlockIndex,
+    ColumnarTransactionSink,
+    JsonlBlockSink,
+    read_numeric_column,
+    recover_sender,
+    transaction_hash,
+)
+
+WALLET = eth_account.Account.from_key(bytes([7]) * 32)
+TO = eth_account.Account.from_key(bytes([8]) * 32).address
+TOKEN = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+RECIPIENT = "0x0d1d9635d0640821d15e323ac8adadfa9c111414"
+
+
+def signed_transaction(fields: Dict[str, Any]) -> Any:
+    return WALLET.sign_transaction({**fields, "to": TO})
+
+
+def processed_transaction(fields: Dict[str, Any], signed: Any) -> Dict[str, Any]:
+    # a transaction as EthBlockIndexer._process_transaction returns it
+    tx = {
+        "type": "Eip1559" if "maxFeePerGas" in fields else "Legacy",
+        "chainId": fields.get("chainId", 0),
+        "nonce": fields["nonce"],
+        "gas": fields["gas"],
+        "to": TO.lower(),
+        "value": fields["value"],
+        "input": "0x" + fields["data"].hex() if fields["data"] else None,
+        "signature": [hex(signed.r), hex(signed.s), hex(signed.v)],
+    }
+    if tx["type"] == "Legacy":
+        tx["gasPrice"] = fields["gasPrice"]
+    else:
+        tx["maxFeePerGas"] = fields["maxFeePerGas"]
+        tx["maxPriorityFeePerGas"] = fields["maxPriorityFeePerGas"]
+        tx["accessList"] = []
+    return tx
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"nonce": 3, "gasPrice": 10**9, "gas": 21000, "value": 5, "data": b"", "chainId": 999},
+        {"nonce": 0, "gasPrice": 10**9, "gas": 21000, "value": 5, "data": b"\x01\x02"},
+        {
+            "type": 2,
+            "nonce": 12,
+            "maxFeePerGas": 2 * 10**9,
+            "maxPriorityFeePerGas": 10**8,
+            "gas": 60000,
+            "value": 0,
+            "data": bytes.fromhex("a9059cbb") + bytes(64),
+            "chainId": 999,
+            "accessList": [],
+        },
+    ],
+    ids=["legacy", "pre-eip-155", "eip-1559"],
+)
+def test_transaction_hash_and_sender_match_the_signed_encoding(fields):
+    signed = signed_transaction(fields)
+    tx = processed_transaction(fields, signed)
+    assert transaction_hash(tx) == "0x" + signed.hash.hex().removeprefix("0x")
+    assert recover_sender(tx) == WALLET.address.lower()
+
+
+def test_recover_sender_returns_none_for_invalid_signatures():
+    fields = {"nonce": 3, "gasPrice": 10**9, "gas": 21000, "value": 5, "data": b"", "chainId": 999}
+    tx = processed_transaction(fields, signed_transaction(fields))
+    tx["signature"] = ["0x0", "0x0", "0x0"]
+    assert recover_sender(tx) is None
+
+
+def block(number: int, log_index: Optional[int] = 0) -> Dict[str, Any]:
+    transfer = {"token": TOKEN, "from": None, "to": RECIPIENT, "value": number, "txIndex": 0, "logIndex": log_index}
+    tx = {"hash": f"0x{number:064x}", "from": None, "to": TOKEN, "value": 0, "nonce": number, "gas": 21000}
+    return {
+        "number": number,
+        "hash": f"0x{number:064x}",
+        "timestamp": 1700000000 + number,
+        "gasUsed": 21000,
+        "transactions": [tx],
+        "erc20Transfers": [transfer],
+    }
+
+
+def index_blocks(filename: str, numbers: List[int], batch_size: int = 3, log_index: Optional[int] = 0) -> None:
+    index = BlockIndex(filename, batch_size)
+    for number in numbers:
+        index.write(block(number, log_index))
+    index.close()
+
+
+def test_index_resumes_around_ranges_already_committed(tmp_path):
+    filename = str(tmp_path / "index.db")
+    index_blocks(filename, list(range(20, 30)))
+    index_blocks(filename, list(range(40, 45)))
+
+    index = BlockIndex(filename)
+    assert index.indexed_ranges() == [(20, 29), (40, 44)]
+    # heights below and between the ranges already indexed are not skipped
+    assert index.missing_ranges(10, 50) == [(10, 19), (30, 39), (45, 50)]
+    assert index.missing_ranges(20, 29) == []
+    assert index.missing_ranges(25, 42) == [(30, 39)]
+    index.close()
+
+    index_blocks(filename, list(range(30, 40)))
+    index = BlockIndex(filename)
+    assert index.indexed_ranges() == [(20, 44)]
+    assert index.block(35) is not None
+    assert index.transaction(f"0x{35:064x}") is not None
+    index.close()
+
+
+@pytest.mark.parametrize("log_index", [0, None], ids=["log", "calldata"])
+def test_reindexing_a_range_does_not_duplicate_transfers(tmp_path, log_index):
+    filename = str(tmp_path / "index.db")
+    index_blocks(filename, [1, 2, 3], log_index=log_index)
+    index_blocks(filename, [2, 3, 4], log_index=log_index)
+
+    index = BlockIndex(filename)
+    assert index.indexed_ranges() == [(1, 4)]
+    transfers = index.erc20_transfers_of(RECIPIENT, TOKEN)
+    assert [transfer[1] for transfer in transfers] == [4, 3, 2, 1]
+    assert len(index.transactions_of(TOKEN)) == 4
+    index.close()
+
+
+def test_uncommitted_blocks_are_not_counted_as_indexed(tmp_path):
+    filename = str(tmp_path / "index.db")
+    index = BlockIndex(filename, batch_size=10)
+    for number in range(5):
+        index.write(block(number))
+    # an interrupted run loses its last batch, which the next run indexes again
+    index.connection.close()
+
+    index = BlockIndex(filename)
+    assert index.indexed_ranges() == []
+    assert index.missing_ranges(0, 4) == [(0, 4)]
+    index.close()
+
+
+def test_jsonl_sink_appends_when_resuming(tmp_path):
+    filename = str(tmp_path / "blocks.jsonl")
+    for numbers, append in (([1, 2], False), ([3], True)):
+        sink = JsonlBlockSink(filename, append)
+        for number in numbers:
+            sink.write(block(number))
+        sink.close()
+    with open(filename) as f:
+        assert [json.loads(line)["number"] for line in f] == [1, 2, 3]
+
+
+def test_columnar_sink_appends_when_resuming(tmp_path):
+    directory = str(tmp_path / "columns")
+    for numbers, append in (([1, 2], False), ([3], True)):
+        sink = ColumnarTransactionSink(directory, row_group_size=2, append=append)
+        for number in numbers:
+            tx = {"type": "eip1559", "chainId": 999, "nonce": number, "gas": 21000, "to": TOKEN, "value": number}
+            sink.write({"number": number, "timestamp": 1700000000 + number, "transactions": [dict(tx, input=None)]})
+        sink.close()
+    assert list(read_numeric_column(directory, "block_number")) == [1, 2, 3]
+    with open(os.path.join(directory, "value.txt")) as f:
+        assert f.read().splitlines() == ["1", "2", "3"]
+    with open(os.path.join(directory, "schema.json")) as f:
+        schema = json.load(f)
+    assert (schema["rows"], schema["rowGroups"]) == (3, [2, 1])
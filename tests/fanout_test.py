@@ -0,0 +1,55 @@
+import functools
+import threading
+import time
+
+from hyperliquid.info import Info
+from hyperliquid.utils.error import ServerError
+from hyperliquid.utils.fanout import fan_out
+from hyperliquid.utils.types import List, Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+ADDRESSES = [f"0x{i:040x}" for i in range(4)]
+
+
+def test_fan_out_bounds_concurrency_and_reports_errors():
+    lock = threading.Lock()
+    in_flight: List[int] = []
+    peak: List[int] = []
+
+    def call(i: int) -> int:
+        with lock:
+            in_flight.append(i)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(i)
+        if i == 3:
+            raise ValueError(i)
+        return i * 2
+
+    results = {r.key: r for r in fan_out(((i, functools.partial(call, i)) for i in range(10)), max_workers=4)}
+    assert max(peak) <= 4
+    assert set(results) == set(range(10))
+    assert isinstance(results[3].error, ValueError) and not results[3].ok
+    assert results[5].result == 10 and results[5].ok
+
+
+def test_user_states_runs_queries_concurrently(stand_in):
+    server = stand_in(delay=0.1)
+    info = Info(server.url, skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    start = time.monotonic()
+    results = list(info.user_states(ADDRESSES, dexes=["", "test"]))
+    assert time.monotonic() - start < 0.5
+    assert len(results) == 8
+    assert {r.key for r in results} == {(a, d) for a in ADDRESSES for d in ["", "test"]}
+    assert all(r.result == {"ok": True} for r in results)
+    assert ("/info", {"type": "clearinghouseState", "user": ADDRESSES[0], "dex": "test"}) in server.requests
+
+
+def test_failed_queries_are_reported_per_item(stand_in):
+    server = stand_in([500])
+    info = Info(server.url, skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    results = list(info.spot_user_states(ADDRESSES, max_workers=1))
+    assert isinstance(results[0].error, ServerError)
+    assert [r.ok for r in results] == [False, True, True, True]
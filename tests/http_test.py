@@ -0,0 +1,75 @@
+import gc
+import socket
+import time
+
+import eth_account
+from requests.adapters import HTTPAdapter
+
+from hyperliquid.api import API
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.http import ConnectionPolicy
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+def test_connection_policy_sizes_the_pool_and_sets_socket_options():
+    policy = ConnectionPolicy(pool_maxsize=64, tcp_keepalive=False)
+    api = API("http://127.0.0.1", connection_policy=policy)
+    adapter = api.session.get_adapter("https://api.hyperliquid.xyz")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 64
+    assert adapter.poolmanager.connection_pool_kw["socket_options"] == [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+
+def test_tcp_keepalive_socket_options():
+    options = ConnectionPolicy(tcp_nodelay=False).socket_options()
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) not in options
+
+
+def test_warmup_sends_concurrent_requests(stand_in):
+    server = stand_in()
+    api = API(server.url, connection_policy=ConnectionPolicy(warmup_connections=3))
+    assert server.requests == [("/info", {"type": "exchangeStatus"})] * 3
+    assert api.warmup(2) == 2
+
+
+def test_keepalive_pings_only_when_idle(stand_in):
+    server = stand_in()
+    api = API(server.url, connection_policy=ConnectionPolicy(keepalive_interval=0.05))
+    try:
+        time.sleep(0.2)
+        assert len(server.requests) >= 2
+        api.stop_keepalive()
+        count = len(server.requests)
+        time.sleep(0.1)
+        assert len(server.requests) == count
+    finally:
+        api.stop_keepalive()
+
+
+def test_keepalive_stops_when_the_api_is_collected(stand_in):
+    server = stand_in()
+    api = API(server.url, connection_policy=ConnectionPolicy(keepalive_interval=0.05))
+    thread = api._keepalive_thread
+    assert thread is not None
+    del api
+    gc.collect()
+    thread.join(1)
+    assert not thread.is_alive()
+
+
+def test_exchange_shares_one_warmed_up_session_with_its_info(stand_in):
+    server = stand_in()
+    policy = ConnectionPolicy(warmup_connections=2, keepalive_interval=60)
+    exchange = Exchange(
+        eth_account.Account.create(), server.url, TEST_META, spot_meta=TEST_SPOT_META, connection_policy=policy
+    )
+    try:
+        assert server.requests == [("/info", {"type": "exchangeStatus"})] * 2
+        assert exchange.info.session is exchange.session
+        assert exchange.info._keepalive_thread is None
+    finally:
+        exchange.stop_keepalive()
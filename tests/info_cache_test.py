@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from hyperliquid.info import Info
+from hyperliquid.utils.cache import InfoCache
+from hyperliquid.utils.types import Any, List, Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+def test_cache_hits_within_ttl_and_reloads_after():
+    cache = InfoCache({"allMids": 0.05})
+    calls: List[int] = []
+
+    def load() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_load({"type": "allMids"}, load) == 1
+    assert cache.get_or_load({"type": "allMids"}, load) == 1
+    time.sleep(0.06)
+    assert cache.get_or_load({"type": "allMids"}, load) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_uncached_types_always_load():
+    cache = InfoCache({"allMids": 10})
+    calls = []
+    for _ in range(2):
+        cache.get_or_load({"type": "clearinghouseState", "user": "0x0"}, lambda: calls.append(1))
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+def test_concurrent_requests_share_one_load():
+    cache = InfoCache({"metaAndAssetCtxs": 10})
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait()
+        return "ctxs"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load({"type": "metaAndAssetCtxs"}, load)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["ctxs"] * 8
+    assert len(calls) == 1
+    assert cache.misses == 1
+    assert cache.coalesced + cache.hits == 7
+
+
+def test_errors_are_shared_and_not_cached():
+    cache = InfoCache({"allMids": 10})
+
+    def fail():
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_load({"type": "allMids"}, fail)
+    assert cache.get_or_load({"type": "allMids"}, lambda: "ok") == "ok"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = InfoCache({"allMids": 10}, max_entries=2)
+    for dex in ["", "a", "b"]:
+        cache.get_or_load({"type": "allMids", "dex": dex}, lambda: dex)
+    assert len(cache) == 2
+    assert cache.get_or_load({"type": "allMids", "dex": ""}, lambda: "reloaded") == "reloaded"
+
+
+def test_info_uses_cache_for_info_requests(monkeypatch):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META, cache=InfoCache())
+    posts: List[Any] = []
+
+    def post(_self, url_path, payload=None):
+        posts.append(payload)
+        return {}
+
+    monkeypatch.setattr("hyperliquid.api.API.post", post)
+    info.all_mids()
+    info.all_mids()
+    info.user_state("0x0")
+    assert len(posts) == 2
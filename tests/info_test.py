@@ -1,7 +1,7 @@
 import pytest
 
 from hyperliquid.info import Info
-from hyperliquid.utils.types import L2BookData, Meta, SpotMeta
+from hyperliquid.utils.types import Any, L2BookData, Meta, SpotMeta
 
 TEST_META: Meta = {"universe": []}
 TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
@@ -133,3 +133,20 @@ def test_user_funding_history_without_end_time():
         for key in ["coin", "fundingRate", "szi", "type", "usdc"]:
             assert key in delta, f"There must be a key '{key}' in 'delta'"
         assert delta["type"] == "funding", "The type must be 'funding'"
+
+
+def test_set_spot_meta_adds_pairs_listed_later():
+    tokens: Any = [
+        {"name": "USDC", "szDecimals": 8, "weiDecimals": 8, "index": 0},
+        {"name": "PURR", "szDecimals": 0, "weiDecimals": 5, "index": 1},
+        {"name": "HYPE", "szDecimals": 2, "weiDecimals": 8, "index": 2},
+    ]
+    purr: Any = {"name": "PURR/USDC", "tokens": [1, 0], "index": 0, "isCanonical": True}
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta={"universe": [purr], "tokens": tokens})
+    assert "HYPE/USDC" not in info.name_to_coin
+
+    hype: Any = {"name": "@107", "tokens": [2, 0], "index": 107, "isCanonical": False}
+    info.set_spot_meta({"universe": [purr, hype], "tokens": tokens})
+    assert info.name_to_asset("PURR/USDC") == 10000
+    assert info.name_to_asset("HYPE/USDC") == info.name_to_asset("@107") == 10107
+    assert info.asset_to_sz_decimals[10107] == 2
@@ -0,0 +1,85 @@
+import json
+
+from hyperliquid.utils.messages import AllMids, Bbo, L2Book, Trades, UserFills, decode_ws_msg
+from hyperliquid.utils.types import Any, List
+
+
+def ws_msg(channel: str, data: Any) -> Any:
+    # a message as parsed from the socket
+    return {"channel": channel, "data": data}
+
+
+L2_BOOK_MSG = ws_msg(
+    "l2Book",
+    {
+        "coin": "BTC",
+        "time": 1700000000000,
+        "levels": [[{"px": "100.5", "sz": "2", "n": 3}], [{"px": "101", "sz": "0.25", "n": 1}]],
+    },
+)
+FILL = {
+    "coin": "ETH",
+    "px": "2000.1",
+    "sz": "0.5",
+    "side": "B",
+    "time": 1700000000000,
+    "startPosition": "-0.5",
+    "dir": "Close Short",
+    "closedPnl": "12.5",
+    "hash": "0x00",
+    "oid": 7,
+    "crossed": True,
+    "fee": "0.35",
+    "tid": 42,
+    "feeToken": "USDC",
+}
+
+
+def test_decode_l2_book():
+    book = decode_ws_msg(L2_BOOK_MSG)
+    assert isinstance(book, L2Book)
+    assert (book.bids[0].px, book.bids[0].sz, book.bids[0].n) == (100.5, 2.0, 3)
+    assert book.asks[0].px == 101.0
+
+
+def test_decode_bbo_with_missing_side():
+    bbo = decode_ws_msg(ws_msg("bbo", {"coin": "BTC", "time": 1, "bbo": [None, {"px": "1", "sz": "2", "n": 1}]}))
+    assert isinstance(bbo, Bbo)
+    assert bbo.bid is None
+    assert bbo.ask is not None and bbo.ask.sz == 2.0
+
+
+def test_decode_trades_all_mids_and_user_fills():
+    trades = decode_ws_msg(
+        ws_msg("trades", [{"coin": "BTC", "side": "A", "px": "1.5", "sz": "3", "time": 1, "hash": "0x", "tid": 9}])
+    )
+    assert isinstance(trades, Trades)
+    assert trades.trades[0].px == 1.5
+    mids = decode_ws_msg(ws_msg("allMids", {"mids": {"BTC": "65000.5"}}))
+    assert isinstance(mids, AllMids)
+    assert mids.mids == {"BTC": 65000.5}
+    fills = decode_ws_msg(ws_msg("userFills", {"user": "0x1", "isSnapshot": True, "fills": [FILL]}))
+    assert isinstance(fills, UserFills)
+    assert fills.fills[0].closed_pnl == 12.5
+    assert fills.fills[0].start_position == -0.5
+
+
+def test_other_channels_are_passed_through():
+    order_updates = ws_msg("orderUpdates", [])
+    assert decode_ws_msg(order_updates) is order_updates
+
+
+def test_manager_decodes_once_for_all_callbacks(fake_ws_manager):
+    ws_manager = fake_ws_manager("https://api.hyperliquid.xyz", decode_msgs=True)
+    received: List[Any] = []
+    ws_manager.subscribe({"type": "l2Book", "coin": "BTC"}, received.append)
+    ws_manager.subscribe({"type": "l2Book", "coin": "BTC"}, received.append)
+    ws_manager.on_message(None, json.dumps(L2_BOOK_MSG))
+    assert isinstance(received[0], L2Book)
+    assert received[0] is received[1]
+
+
+def test_decode_empty_trades():
+    trades = decode_ws_msg(ws_msg("trades", []))
+    assert isinstance(trades, Trades)
+    assert (trades.coin, trades.trades) == ("", [])
@@ -0,0 +1,45 @@
+from hyperliquid.info import Info
+from hyperliquid.utils.pagination import DAY_MS, fetch_window, paginate
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+def fake_server(records, page_limit, time_key="time"):
+    requests = []
+
+    def fetch(start, end):
+        requests.append((start, end))
+        return [r for r in records if start <= r[time_key] <= end][:page_limit]
+
+    return fetch, requests
+
+
+def test_fetch_window_pages_through_full_pages_without_duplicates():
+    # three records share every millisecond, so pages end in the middle of one
+    records = [{"tid": i, "time": 100 + i // 3} for i in range(20)]
+    fetch, requests = fake_server(records, page_limit=4)
+    assert fetch_window(fetch, 100, 200, 4, lambda r: r["tid"]) == records
+    assert requests[1][0] == 101
+
+
+def test_fetch_window_skips_a_millisecond_with_more_records_than_a_page():
+    records = [{"tid": i, "time": 100} for i in range(5)] + [{"tid": 5, "time": 101}]
+    fetch, _ = fake_server(records, page_limit=3)
+    assert [r["tid"] for r in fetch_window(fetch, 100, 200, 3, lambda r: r["tid"])] == [0, 1, 2, 5]
+
+
+def test_paginate_yields_windows_in_order():
+    records = [{"t": t} for t in range(0, 1000, 7)]
+    fetch, requests = fake_server(records, page_limit=1000, time_key="t")
+    assert list(paginate(fetch, 0, 999, 100, 1000, lambda r: r["t"], time_key="t", max_workers=3)) == records
+    assert sorted(requests) == [(s, s + 99) for s in range(0, 1000, 100)]
+
+
+def test_iter_user_fills_by_time(monkeypatch):
+    info = Info("http://127.0.0.1", skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    fills = [{"tid": i, "time": i * 50_000 // 2} for i in range(10_000)]
+    fetch, _ = fake_server(fills, page_limit=2000)
+    monkeypatch.setattr(info, "user_fills_by_time", lambda address, start, end: fetch(start, end))
+    assert list(info.iter_user_fills_by_time("0x0", 0, 3 * DAY_MS)) == fills
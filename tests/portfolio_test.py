@@ -0,0 +1,79 @@
+from hyperliquid.info import Info
+from hyperliquid.portfolio import Portfolio
+from hyperliquid.utils.messages import decode_user_fills
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+USER = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+
+
+def fill(tid, side, px, sz, closed_pnl=0, time=None, coin="BTC"):
+    return {
+        "coin": coin,
+        "px": str(px),
+        "sz": str(sz),
+        "side": side,
+        "time": 1_000 + tid if time is None else time,
+        "startPosition": "0",
+        "dir": "",
+        "closedPnl": str(closed_pnl),
+        "hash": "0x0",
+        "oid": tid,
+        "crossed": True,
+        "fee": "0.1",
+        "tid": tid,
+        "feeToken": "USDC",
+    }
+
+
+def user_fills_msg(*fills, is_snapshot=False):
+    return {"channel": "userFills", "data": {"user": USER, "isSnapshot": is_snapshot, "fills": list(fills)}}
+
+
+def test_positions_track_entry_and_realized_pnl():
+    portfolio = Portfolio(USER)
+    portfolio.on_message(user_fills_msg(fill(1, "B", 100, 1), fill(2, "B", 110, 1)))
+    btc = portfolio.positions["BTC"]
+    assert (btc.size, btc.entry_px) == (2, 105)
+    portfolio.on_message({"channel": "user", "data": {"fills": [fill(3, "A", 120, 3, closed_pnl=30)]}})
+    assert (btc.size, btc.entry_px, btc.realized_pnl) == (-1, 120, 30)
+    assert round(btc.fees, 10) == 0.3 and btc.fills == 3
+    assert btc.unrealized_pnl(110) == 10
+    portfolio.on_message(user_fills_msg(fill(4, "B", 100, 1, closed_pnl=20)))
+    assert (btc.size, btc.entry_px) == (0, 0)
+
+
+def test_zero_size_fills_leave_a_flat_position_flat():
+    portfolio = Portfolio(USER)
+    portfolio.on_message(user_fills_msg(fill(1, "B", 100, 0)))
+    btc = portfolio.positions["BTC"]
+    assert (btc.size, btc.entry_px, btc.fills) == (0, 0, 0)
+
+
+def test_fills_are_deduplicated_by_tid():
+    portfolio = Portfolio(USER)
+    portfolio.on_message(user_fills_msg(fill(1, "B", 100, 1)))
+    portfolio.on_message(decode_user_fills(user_fills_msg(fill(1, "B", 100, 1), fill(2, "B", 100, 1))["data"]))
+    assert portfolio.positions["BTC"].size == 2
+
+
+def test_fills_older_than_the_dedup_window_are_skipped():
+    portfolio = Portfolio(USER, dedup_window_ms=100)
+    assert portfolio.apply_raw_fill(fill(1, "B", 100, 1, time=1_000))
+    assert portfolio.apply_raw_fill(fill(2, "B", 100, 1, time=2_000))
+    assert not portfolio.apply_raw_fill(fill(3, "B", 100, 1, time=1_500))
+    assert len(portfolio._seen) == 1
+
+
+def test_seed_snapshot_and_restore(tmp_path, monkeypatch):
+    info = Info("http://127.0.0.1", skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    fills = [fill(1, "B", 100, 1, coin="ETH"), fill(2, "B", 200, 1, coin="ETH")]
+    monkeypatch.setattr(info, "iter_user_fills_by_time", lambda user, start, end: iter(fills))
+    portfolio = Portfolio(USER)
+    assert portfolio.seed(info, 0) == 2
+    path = str(tmp_path / "portfolio.json")
+    portfolio.snapshot(path)
+    restored = Portfolio.restore(path)
+    assert restored.positions["ETH"].entry_px == 150
+    assert restored.seed(info, restored.last_time) == 0
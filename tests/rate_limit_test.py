@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from hyperliquid.utils.error import RateLimitExceeded
+from hyperliquid.utils.rate_limit import (
+    PRIORITY_CANCEL,
+    PRIORITY_INFO,
+    RateLimiter,
+    request_priority,
+    request_weight,
+)
+
+
+def test_request_weights():
+    assert request_weight("/info", {"type": "l2Book", "coin": "BTC"}) == 2
+    assert request_weight("/info", {"type": "userFills", "user": "0x0"}) == 20
+    assert request_weight("/info", {"type": "userRole", "user": "0x0"}) == 60
+    assert request_weight("/exchange", {"action": {"type": "order", "orders": [{}] * 79}}) == 2
+    assert request_weight("/exchange", {"action": {"type": "cancel", "cancels": [{}]}}) == 1
+    assert request_weight("/info", b'{"type":"l2Book","coin":"BTC"}') == 2
+    assert request_weight("/exchange", b'{"action":{"type":"order","orders":[' + b",".join([b"{}"] * 40) + b"]}}") == 2
+
+
+def test_request_priorities():
+    assert request_priority("/exchange", {"action": {"type": "cancelByCloid"}}) == PRIORITY_CANCEL
+    assert request_priority("/exchange", {"action": {"type": "order"}}) < request_priority("/info", {"type": "meta"})
+    assert request_priority("/exchange", b'{"action":{"type":"cancel","cancels":[]}}') == PRIORITY_CANCEL
+
+
+def test_blocking_acquire_waits_for_refill():
+    limiter = RateLimiter(capacity=10, refill_per_second=100)
+    limiter.acquire(10)
+    start = time.monotonic()
+    limiter.acquire(5)
+    assert time.monotonic() - start >= 0.04
+
+
+def test_fail_fast_raises_with_retry_after():
+    limiter = RateLimiter(capacity=10, refill_per_second=1, mode="fail_fast")
+    limiter.acquire(8)
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.acquire(5)
+    assert exc_info.value.retry_after == pytest.approx(3, abs=0.1)
+
+
+def test_fail_fast_acquire_async_raises():
+    limiter = RateLimiter(capacity=10, refill_per_second=1, mode="fail_fast")
+    asyncio.run(limiter.acquire_async(8))
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(limiter.acquire_async(5))
+
+
+def test_cancels_jump_ahead_of_queued_info_requests():
+    limiter = RateLimiter(capacity=20, refill_per_second=200)
+    limiter.acquire(20)
+    served = []
+
+    def acquire(name, weight, priority):
+        limiter.acquire(weight, priority)
+        served.append(name)
+
+    info = threading.Thread(target=acquire, args=("info", 20, PRIORITY_INFO))
+    info.start()
+    time.sleep(0.01)
+    cancel = threading.Thread(target=acquire, args=("cancel", 1, PRIORITY_CANCEL))
+    cancel.start()
+    info.join()
+    cancel.join()
+    assert served == ["cancel", "info"]
+
+
+def test_acquire_async():
+    limiter = RateLimiter(capacity=4, refill_per_second=100)
+
+    async def acquire_all():
+        await asyncio.gather(*(limiter.acquire_async(2) for _ in range(4)))
+
+    start = time.monotonic()
+    asyncio.run(acquire_all())
+    assert time.monotonic() - start >= 0.03
+
+
+def test_shared_limiters_are_per_key():
+    assert RateLimiter.shared("https://api.hyperliquid.xyz") is RateLimiter.shared("https://api.hyperliquid.xyz")
+    assert RateLimiter.shared("https://api.hyperliquid.xyz") is not RateLimiter.shared("http://localhost:3001")
+
+
+def test_shared_limiters_reject_conflicting_settings():
+    limiter = RateLimiter.shared("http://localhost:3002", capacity=100, mode="fail_fast")
+    assert RateLimiter.shared("http://localhost:3002") is limiter
+    assert RateLimiter.shared("http://localhost:3002", mode="fail_fast") is limiter
+    with pytest.raises(ValueError):
+        RateLimiter.shared("http://localhost:3002", capacity=200)
@@ -0,0 +1,107 @@
+import eth_account
+import pytest
+from eth_account.messages import _hash_eip191_message, encode_typed_data
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.recovery import (
+    SignerCache,
+    l1_action_digest,
+    recover_signers,
+    recover_users_from_user_signed_actions,
+    user_signed_action_digest,
+)
+from hyperliquid.utils.signing import (
+    USER_SIGNED_ACTION_TYPES,
+    action_hash,
+    construct_phantom_agent,
+    l1_payload,
+    recover_agent_or_user_from_l1_action,
+    sign_agent,
+    sign_approve_builder_fee,
+    sign_l1_action,
+    sign_token_delegate_action,
+    sign_usd_class_transfer_action,
+    sign_usd_transfer_action,
+    user_signed_payload,
+)
+from hyperliquid.utils.types import Any, List, Meta, SpotMeta
+
+WALLETS = [eth_account.Account.from_key(bytes([i + 1]) * 32) for i in range(3)]
+DESTINATION = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+
+
+def user_signed_actions(nonce):
+    return [
+        ({"type": "usdSend", "destination": DESTINATION, "amount": "1.5", "time": nonce}, sign_usd_transfer_action),
+        (
+            {"type": "tokenDelegate", "validator": DESTINATION, "wei": 10**8, "isUndelegate": True, "nonce": nonce},
+            sign_token_delegate_action,
+        ),
+        ({"type": "approveAgent", "agentAddress": DESTINATION, "agentName": "bot", "nonce": nonce}, sign_agent),
+        (
+            {"type": "approveBuilderFee", "maxFeeRate": "0.001%", "builder": DESTINATION, "nonce": nonce},
+            sign_approve_builder_fee,
+        ),
+        ({"type": "usdClassTransfer", "amount": "2", "toPerp": True, "nonce": nonce}, sign_usd_class_transfer_action),
+    ]
+
+
+@pytest.mark.parametrize("is_mainnet", [True, False])
+def test_user_signed_action_digest_matches_typed_data(is_mainnet):
+    for action, sign in user_signed_actions(1700000000000):
+        sign(WALLETS[0], action, is_mainnet)
+        payload_types, primary_type = USER_SIGNED_ACTION_TYPES[action["type"]]
+        expected = _hash_eip191_message(
+            encode_typed_data(full_message=user_signed_payload(primary_type, payload_types, action))
+        )
+        assert user_signed_action_digest(action, payload_types, primary_type, is_mainnet) == expected
+
+
+def test_l1_action_digest_matches_typed_data():
+    action = {"type": "cancel", "cancels": [{"a": 0, "o": 123}]}
+    phantom_agent = construct_phantom_agent(action_hash(action, DESTINATION, 7, 99), False)
+    expected = _hash_eip191_message(encode_typed_data(full_message=l1_payload(phantom_agent)))
+    assert l1_action_digest(action, DESTINATION, 7, 99, False) == expected
+
+
+def test_recover_signers_matches_single_recovery():
+    signed_actions = []
+    expected = []
+    for nonce, wallet in enumerate(WALLETS):
+        for action, sign in user_signed_actions(nonce):
+            signed_actions.append({"action": action, "signature": sign(wallet, action, True)})
+            expected.append(wallet.address)
+        action = {"type": "order", "orders": [], "grouping": "na"}
+        signature = sign_l1_action(wallet, action, None, nonce, None, True)
+        signed_actions.append({"action": action, "signature": signature, "nonce": nonce})
+        expected.append(recover_agent_or_user_from_l1_action(action, signature, None, nonce, None, True))
+    assert recover_signers(signed_actions) == expected
+    assert recover_signers(signed_actions, max_workers=2, chunk_size=4) == expected
+
+
+def test_recover_signers_recovers_duplicates_once():
+    action = {"type": "usdSend", "destination": DESTINATION, "amount": "1", "time": 1}
+    signature = sign_usd_transfer_action(WALLETS[1], action, True)
+    cache = SignerCache()
+    pairs = [(action, signature)] * 3
+    assert recover_users_from_user_signed_actions(pairs, cache=cache) == [WALLETS[1].address] * 3
+    assert len(cache) == 1
+    assert cache.misses == 1
+    assert recover_users_from_user_signed_actions(pairs, cache=cache) == [WALLETS[1].address] * 3
+    assert cache.hits == 1
+
+
+def test_recover_signers_of_an_unnamed_approve_agent(monkeypatch):
+    meta: Meta = {"universe": []}
+    spot_meta: SpotMeta = {"universe": [], "tokens": []}
+    exchange = Exchange(WALLETS[0], meta=meta, spot_meta=spot_meta)
+    posted: List[Any] = []
+
+    def post(url_path, payload=None):
+        posted.append(payload)
+        return {}
+
+    monkeypatch.setattr(exchange, "post", post)
+    exchange.approve_agent(name=None)
+    assert "agentName" not in posted[0]["action"]
+    assert recover_signers(posted) == [WALLETS[0].address]
@@ -0,0 +1,148 @@
+import json
+import os
+import sys
+
+import eth_account
+import lz4.frame
+import pytest
+
+from hyperliquid.utils.signing import sign_l1_action, sign_token_delegate_action, sign_usd_transfer_action
+from hyperliquid.utils.types import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "examples"))
+from index_replica_actions import scan_actions  # noqa: E402
+from parse_token_delegate_from_replica_cmds import scan_token_delegates  # noqa: E402
+from replica_cmds import ActionIndexer, IndexedAction, batch_filenames, iter_blocks, scan_parallel  # noqa: E402
+
+USER = eth_account.Account.from_key(bytes([1]) * 32)
+AGENT = eth_account.Account.from_key(bytes([2]) * 32)
+VALIDATOR = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+NONCE = 1700000000000
+
+
+def replica_block(height: int, signed_actions: List[Any]) -> Dict[str, Any]:
+    return {"abci_block": {"round": height, "signed_action_bundles": [["0xhash", {"signed_actions": signed_actions}]]}}
+
+
+def write_replica_cmds(filename: str, blocks: List[Any]) -> None:
+    opener = lz4.frame.open if filename.endswith(".lz4") else open
+    with opener(filename, "wb") as f:
+        for block in blocks:
+            f.write(json.dumps(block).encode() + b"\n")
+
+
+def count_blocks(filename: str) -> Dict[str, int]:
+    # module level so worker processes can unpickle it
+    return {os.path.basename(filename): sum(1 for _ in iter_blocks(filename))}
+
+
+def merge_counts(total: Dict[str, int], part: Dict[str, int]) -> Dict[str, int]:
+    total.update(part)
+    return total
+
+
+@pytest.mark.parametrize("name", ["10001.lz4", "10001"])
+def test_iter_blocks_only_parses_lines_with_a_needle(tmp_path, name):
+    filename = str(tmp_path / name)
+    blocks = [
+        replica_block(1, [{"action": {"type": "order"}}]),
+        replica_block(2, [{"action": {"type": "tokenDelegate"}}]),
+        replica_block(3, [{"action": {"type": "cancel"}}, {"action": {"type": "usdSend"}}]),
+    ]
+    write_replica_cmds(filename, blocks)
+    assert list(iter_blocks(filename)) == blocks
+    assert list(iter_blocks(filename, [b'"tokenDelegate"', b'"usdSend"'])) == blocks[1:]
+    assert list(iter_blocks(filename, [b'"withdraw3"'])) == []
+
+
+def test_batch_filenames_lists_one_file_per_batch(tmp_path):
+    for height in (10001, 20001, 30001):
+        write_replica_cmds(str(tmp_path / f"{height}.lz4"), [])
+    assert batch_filenames(str(tmp_path), 10001, 30001) == [f"{tmp_path}/10001.lz4", f"{tmp_path}/20001.lz4"]
+    with pytest.raises(Exception, match="replica cmds file at 40001 not found"):
+        batch_filenames(str(tmp_path), 10001, 50001)
+    with pytest.raises(Exception, match="not aligned"):
+        batch_filenames(str(tmp_path), 10000, 30001)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_scan_parallel_merges_file_results_in_order(tmp_path, workers):
+    filenames = []
+    for i, height in enumerate((10001, 20001, 30001)):
+        filenames.append(str(tmp_path / f"{height}.lz4"))
+        write_replica_cmds(filenames[-1], [replica_block(height + j, []) for j in range(i + 1)])
+    counts = scan_parallel(filenames, count_blocks, merge_counts, dict, workers)
+    assert list(counts.items()) == [("10001.lz4", 1), ("20001.lz4", 2), ("30001.lz4", 3)]
+    assert scan_parallel([], count_blocks, merge_counts, dict, workers) == {}
+
+
+def signed_actions() -> List[Any]:
+    # signed actions in the format of replica cmds: a user signed usdSend and tokenDelegate by USER, and an L1 order
+    # signed by its agent AGENT
+    usd_send = {"type": "usdSend", "destination": VALIDATOR, "amount": "2.5", "time": NONCE}
+    usd_send_signature = sign_usd_transfer_action(USER, usd_send, True)
+    delegate = {
+        "type": "tokenDelegate",
+        "validator": VALIDATOR,
+        "wei": 3 * 10**8,
+        "isUndelegate": False,
+        "nonce": NONCE,
+    }
+    delegate_signature = sign_token_delegate_action(USER, delegate, True)
+    order = {"a": 0, "b": True, "p": "100", "s": "1", "r": False, "t": {"limit": {"tif": "Gtc"}}}
+    order_action = {"type": "order", "orders": [order], "grouping": "na"}
+    order_signature = sign_l1_action(AGENT, order_action, None, NONCE, None, True)
+    return [
+        {"signature": usd_send_signature, "action": usd_send, "nonce": NONCE, "vaultAddress": None},
+        {"signature": delegate_signature, "action": delegate, "nonce": NONCE, "vaultAddress": None},
+        {"signature": order_signature, "action": order_action, "nonce": NONCE, "vaultAddress": None},
+    ]
+
+
+def test_action_indexer_dispatches_by_type_and_recovers_signers(tmp_path):
+    usd_send, delegate, order = signed_actions()
+    filename = str(tmp_path / "10001.lz4")
+    blocks = [replica_block(1, [usd_send, order]), replica_block(2, [delegate])]
+    write_replica_cmds(filename, blocks)
+
+    indexed: List[IndexedAction] = []
+    signers: List[str] = []
+
+    def on_signer(action: IndexedAction) -> None:
+        signers.append(action.signer)
+
+    indexer = ActionIndexer()
+    indexer.register("usdSend", indexed.append)
+    indexer.register("order", indexed.append)
+    indexer.register("usdSend", on_signer)
+    indexer.index_file(filename)
+
+    assert [(action.block["abci_block"]["round"], action.action["type"]) for action in indexed] == [
+        (1, "usdSend"),
+        (1, "order"),
+    ]
+    assert indexed[0].signed_action == usd_send and indexed[0].is_mainnet
+    assert signers == [USER.address]
+    # the usdSend was recovered by on_signer, both handlers got the same IndexedAction
+    assert indexed[0]._signer == USER.address
+    assert indexed[1].signer == AGENT.address
+
+
+def test_action_indexer_only_parses_blocks_with_registered_types(tmp_path):
+    usd_send, delegate, order = signed_actions()
+    filename = str(tmp_path / "10001.lz4")
+    write_replica_cmds(filename, [replica_block(1, [order]), replica_block(2, [delegate])])
+    indexer = ActionIndexer()
+    indexer.register("tokenDelegate", lambda action: None)
+    assert indexer.needles() == [b'"tokenDelegate"']
+    assert [block["abci_block"]["round"] for block in iter_blocks(filename, indexer.needles())] == [2]
+
+
+def test_example_scans_index_signed_actions(tmp_path):
+    usd_send, delegate, order = signed_actions()
+    filename = str(tmp_path / "10001.lz4")
+    write_replica_cmds(filename, [replica_block(1, [usd_send, order, order]), replica_block(2, [delegate])])
+    counts, usd_sent = scan_actions(filename)
+    assert counts == {USER.address: {"usdSend": 1}, AGENT.address: {"order": 2}}
+    assert usd_sent == {USER.address: 2.5}
+    assert scan_token_delegates(filename) == {USER.address: {VALIDATOR: 3.0}}
@@ -10,6 +10,8 @@ from hyperliquid.utils.signing import (
     float_to_int_for_hashing,
     order_request_to_order_wire,
     order_wires_to_order_action,
+    sign_agent,
+    sign_approve_builder_fee,
     sign_l1_action,
     sign_usd_transfer_action,
     sign_withdraw_from_bridge_action,
@@ -211,6 +213,32 @@ def test_sign_withdraw_from_bridge_action():
     assert signature["v"] == 28
 
 
+def test_sign_agent_action():
+    wallet = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
+    message = {
+        "agentAddress": "0x5e9ee1089755c3435139848e47e6635505d5a13a",
+        "agentName": "bot",
+        "nonce": 1687816341423,
+    }
+    signature = sign_agent(wallet, message, False)
+    assert signature["r"] == "0x620a039a43073d3a4a4a964153f1902ad0d206ffd433fd6f4d726152c24ed4f5"
+    assert signature["s"] == "0x5e71fc08f31ae1b7f12d9fcc2163a62442cb9249c27e61a339c02cf822af34b2"
+    assert signature["v"] == 28
+
+
+def test_sign_approve_builder_fee_action():
+    wallet = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
+    message = {
+        "maxFeeRate": "0.001%",
+        "builder": "0x5e9ee1089755c3435139848e47e6635505d5a13a",
+        "nonce": 1687816341423,
+    }
+    signature = sign_approve_builder_fee(wallet, message, False)
+    assert signature["r"] == "0xb6e55b83439b7a74dffccba04e2ee91e38ded2f155b7e2f062518ffbe0b279a5"
+    assert signature["s"] == "0x111d822d9d41817e44384c756641dfd7e5511a22392d89d71007d410142cfb4f"
+    assert signature["v"] == 27
+
+
 def test_create_sub_account_action():
     wallet = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
     action = {
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from hyperliquid.info import Info
+from hyperliquid.stream import Stream
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": [{"name": "BTC", "szDecimals": 5}]}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+def test_stream_iterates_in_arrival_order():
+    stream = Stream()
+    for i in range(3):
+        stream.put("allMids", i)
+    stream.close()
+    assert list(stream) == [0, 1, 2]
+
+
+def test_conflated_stream_keeps_latest_per_key():
+    stream = Stream(conflate=True)
+    stream.put("l2Book:btc", "btc-1")
+    stream.put("l2Book:eth", "eth-1")
+    stream.put("l2Book:btc", "btc-2")
+    assert stream.next_batch(10, 0) == ["btc-2", "eth-1"]
+
+
+def test_next_batch_times_out_when_empty():
+    stream = Stream()
+    start = time.monotonic()
+    assert stream.next_batch(10, 0.05) == []
+    assert time.monotonic() - start >= 0.05
+
+
+def test_full_stream_drops_the_oldest_messages_without_blocking():
+    stream = Stream(maxsize=2)
+    for i in range(5):
+        stream.put(0, i)
+    assert stream.dropped == 3
+    assert stream.next_batch(5) == [3, 4]
+
+
+def test_timed_out_async_waiters_are_removed():
+    stream = Stream()
+    assert asyncio.run(stream.next_batch_async(1, 0.01)) == []
+    assert stream._async_waiters == []
+
+
+def test_async_iteration():
+    stream = Stream()
+
+    async def consume():
+        threading.Timer(0.01, stream.put, ("trades", "a")).start()
+        threading.Timer(0.02, stream.close).start()
+        return [msg async for msg in stream]
+
+    assert asyncio.run(consume()) == ["a"]
+
+
+def test_info_stream_selects_across_subscriptions(fake_ws_manager):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    info.ws_manager = fake_ws_manager(info.base_url)
+    with info.stream({"type": "allMids"}, {"type": "bbo", "coin": "BTC"}) as stream:
+        info.ws_manager.on_message(None, json.dumps({"channel": "allMids", "data": {"mids": {}}}))
+        info.ws_manager.on_message(None, json.dumps({"channel": "bbo", "data": {"coin": "BTC"}}))
+        assert [msg["channel"] for msg in stream.next_batch(10, 0)] == ["allMids", "bbo"]
+    assert info.ws_manager.active_subscriptions == {}
+    with pytest.raises(StopIteration):
+        next(stream)
+
+
+def test_closing_a_stream_before_the_websocket_connects(fake_ws_manager):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    ws_manager = info.ws_manager = fake_ws_manager(info.base_url)
+    ws_manager.ws_ready = False
+    with info.stream({"type": "allMids"}, {"type": "userEvents", "user": "0x01"}):
+        assert len(ws_manager.queued_subscriptions) == 2
+    assert ws_manager.queued_subscriptions == []
+    assert ws_manager.user_channel_owner is None
+    assert ws_manager.sent == []
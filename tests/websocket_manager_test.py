@@ -0,0 +1,115 @@
+import json
+import threading
+
+import pytest
+
+from hyperliquid.info import Info
+from hyperliquid.utils.types import Any, List, Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+USER_A = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+USER_B = "0xb7b6f3cea3f66bf525f5d8f965f6dbf6d9b017b2"
+
+
+@pytest.fixture
+def info(fake_ws_manager):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    info.ws_manager = fake_ws_manager(info.base_url)
+    return info
+
+
+def test_user_channels_are_limited_to_one_user_per_connection(fake_ws_manager):
+    ws_manager = fake_ws_manager("https://api.hyperliquid.xyz")
+    ws_manager.subscribe({"type": "userEvents", "user": USER_A}, print)
+    ws_manager.subscribe({"type": "orderUpdates", "user": USER_A}, print)
+    with pytest.raises(NotImplementedError):
+        ws_manager.subscribe({"type": "userEvents", "user": USER_B}, print)
+
+
+def test_user_channel_owner_is_released_after_unsubscribe(fake_ws_manager):
+    ws_manager = fake_ws_manager("https://api.hyperliquid.xyz")
+    subscription_id = ws_manager.subscribe({"type": "userEvents", "user": USER_A}, print)
+    assert ws_manager.unsubscribe({"type": "userEvents", "user": USER_A}, subscription_id)
+    assert ws_manager.user_channel_owner is None
+    ws_manager.subscribe({"type": "userEvents", "user": USER_B}, print)
+    assert ws_manager.user_channel_owner == USER_B.lower()
+
+
+def test_info_routes_user_events_per_user(info, fake_ws_manager):
+    received_a: List[Any] = []
+    received_b: List[Any] = []
+    info.subscribe({"type": "userEvents", "user": USER_A}, received_a.append)
+    info.subscribe({"type": "userEvents", "user": USER_B}, received_b.append)
+    info.subscribe({"type": "orderUpdates", "user": USER_B}, received_b.append)
+    assert fake_ws_manager.instances == 2
+    assert list(info.user_ws_managers) == [USER_B]
+
+    info.ws_manager.on_message(None, json.dumps({"channel": "user", "data": {"fills": []}}))
+    info.user_ws_managers[USER_B].on_message(None, json.dumps({"channel": "orderUpdates", "data": []}))
+    assert len(received_a) == 1
+    assert received_b == [{"channel": "orderUpdates", "data": []}]
+
+
+def test_info_unsubscribe_uses_the_same_connection(info):
+    info.subscribe({"type": "userEvents", "user": USER_A}, print)
+    subscription_id = info.subscribe({"type": "userEvents", "user": USER_B}, print)
+    assert info.unsubscribe({"type": "userEvents", "user": USER_B}, subscription_id)
+    assert info.ws_manager.user_channel_owner == USER_A
+
+
+def test_info_stops_user_connections_without_subscriptions(info):
+    info.subscribe({"type": "userEvents", "user": USER_A}, print)
+    events_id = info.subscribe({"type": "userEvents", "user": USER_B}, print)
+    updates_id = info.subscribe({"type": "orderUpdates", "user": USER_B}, print)
+    ws_manager = info.user_ws_managers[USER_B]
+
+    assert info.unsubscribe({"type": "userEvents", "user": USER_B}, events_id)
+    assert not ws_manager.stopped
+    assert info.unsubscribe({"type": "orderUpdates", "user": USER_B}, updates_id)
+    assert ws_manager.stopped
+    assert info.user_ws_managers == {}
+
+    # subscribing again opens a new connection
+    info.subscribe({"type": "userEvents", "user": USER_B}, print)
+    assert info.user_ws_managers[USER_B] is not ws_manager
+
+
+def test_concurrent_subscriptions_share_one_connection_per_user(info, fake_ws_manager):
+    info.subscribe({"type": "userEvents", "user": USER_A}, print)
+    start = threading.Barrier(8)
+
+    def subscribe():
+        start.wait()
+        info.subscribe({"type": "orderUpdates", "user": USER_B}, print)
+
+    threads = [threading.Thread(target=subscribe) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fake_ws_manager.instances == 2
+    assert len(info.user_ws_managers[USER_B].active_subscriptions["orderUpdates"]) == 8
+
+
+def test_unexpected_messages_do_not_grow_the_registry(fake_ws_manager):
+    ws_manager = fake_ws_manager("https://api.hyperliquid.xyz")
+    ws_manager.subscribe({"type": "allMids"}, print)
+    for coin in ["BTC", "ETH", "SOL"]:
+        ws_manager.on_message(None, json.dumps({"channel": "bbo", "data": {"coin": coin}}))
+    assert list(ws_manager.active_subscriptions) == ["allMids"]
+
+
+def test_callbacks_removed_during_dispatch_keep_the_current_snapshot(fake_ws_manager):
+    ws_manager = fake_ws_manager("https://api.hyperliquid.xyz")
+    received: List[Any] = []
+
+    def unsubscribe_self(ws_msg):
+        received.append(ws_msg)
+        ws_manager.unsubscribe({"type": "allMids"}, first_id)
+
+    first_id = ws_manager.subscribe({"type": "allMids"}, unsubscribe_self)
+    ws_manager.subscribe({"type": "allMids"}, received.append)
+    ws_manager.on_message(None, json.dumps({"channel": "allMids", "data": {"mids": {}}}))
+    assert len(received) == 2
+    assert len(ws_manager.active_subscriptions["allMids"]) == 1